@@ -0,0 +1,165 @@
+"""Process-wide tool catalog cache.
+
+Every chat session creates its own ``ArcadeGateway``, but the Gateway's
+tool list is the same for every user (authorization happens per call).
+The catalog keeps one copy per gateway URL, shared by all sessions:
+
+- a fresh entry (younger than ``ttl``) is returned as is
+- a stale entry is returned immediately while a background task re-fetches it
+- with no entry, the on-disk snapshot (if configured) is used the same way;
+  only a cold start with no snapshot waits for discovery
+
+Refreshes compare a hash of the tool list. An unchanged list keeps the same
+entry, including its memoized Anthropic-format tools, so sessions keep
+sending byte-identical tool definitions (and hitting the prompt cache).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from mcp.types import Tool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 600.0
+
+
+@dataclass
+class CatalogEntry:
+    """One gateway's tool list, its hash, and its Anthropic-format conversion."""
+    tools: list[Tool]
+    digest: str
+    fetched_at: float
+    anthropic_tools: list[dict] = field(default_factory=list)
+
+
+_entries: dict[str, CatalogEntry] = {}
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+def tools_digest(tools: list[Tool]) -> str:
+    """Stable hash of a tool list (names, descriptions and schemas)."""
+    payload = [tool.model_dump(mode="json", exclude_none=True) for tool in tools]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def to_anthropic_format(mcp_tools: list) -> list[dict]:
+    """Convert MCP tool definitions to Anthropic API tool format.
+
+    MCP uses `inputSchema`, Anthropic uses `input_schema`.
+    """
+    anthropic_tools = []
+    for tool in mcp_tools:
+        schema = tool.inputSchema if hasattr(tool, "inputSchema") else {}
+        anthropic_tools.append({
+            "name": tool.name,
+            "description": tool.description or "",
+            "input_schema": schema,
+        })
+    return anthropic_tools
+
+
+async def get_catalog(
+    gateway_url: str,
+    fetch: Callable[[], Awaitable[list[Tool]]],
+    ttl: float = DEFAULT_TTL_SECONDS,
+    snapshot_path: str | Path | None = None,
+) -> CatalogEntry:
+    """Return the catalog for ``gateway_url``, fetching or refreshing it as needed."""
+    entry = _entries.get(gateway_url)
+    if entry is None and snapshot_path:
+        entry = _load_snapshot(gateway_url, Path(snapshot_path))
+        if entry is not None:
+            _entries[gateway_url] = entry
+
+    if entry is None:
+        # Cold start: concurrent sessions share one discovery request
+        task = _refreshing.get(gateway_url) or _start_refresh(gateway_url, fetch, snapshot_path)
+        return await asyncio.shield(task)
+
+    if time.time() - entry.fetched_at >= ttl and gateway_url not in _refreshing:
+        _start_refresh(gateway_url, fetch, snapshot_path)
+    return entry
+
+
+def invalidate(gateway_url: str) -> None:
+    """Forget the cached catalog for ``gateway_url``; the next call re-fetches."""
+    _entries.pop(gateway_url, None)
+
+
+def _start_refresh(
+    gateway_url: str,
+    fetch: Callable[[], Awaitable[list[Tool]]],
+    snapshot_path: str | Path | None,
+) -> asyncio.Task:
+    task = asyncio.create_task(_refresh(gateway_url, fetch, snapshot_path), name="tool-catalog-refresh")
+    _refreshing[gateway_url] = task
+    return task
+
+
+async def _refresh(
+    gateway_url: str,
+    fetch: Callable[[], Awaitable[list[Tool]]],
+    snapshot_path: str | Path | None,
+) -> CatalogEntry:
+    try:
+        tools = await fetch()
+    except Exception as e:
+        # Background refresh failure: keep serving the stale entry
+        if gateway_url in _entries:
+            logger.warning(f"Tool catalog refresh failed for {gateway_url}: {e}")
+            return _entries[gateway_url]
+        raise
+    finally:
+        if _refreshing.get(gateway_url) is asyncio.current_task():
+            del _refreshing[gateway_url]
+
+    digest = tools_digest(tools)
+    entry = _entries.get(gateway_url)
+    if entry is not None and entry.digest == digest:
+        entry.fetched_at = time.time()
+    else:
+        if entry is not None:
+            logger.info(f"Tool catalog changed for {gateway_url}: {len(entry.tools)} -> {len(tools)} tools")
+        entry = CatalogEntry(tools, digest, time.time(), to_anthropic_format(tools))
+        _entries[gateway_url] = entry
+        if snapshot_path:
+            _save_snapshot(gateway_url, Path(snapshot_path), entry)
+    return entry
+
+
+def _load_snapshot(gateway_url: str, path: Path) -> CatalogEntry | None:
+    try:
+        saved = json.loads(path.read_text())[gateway_url]
+        tools = [Tool.model_validate(t) for t in saved["tools"]]
+        fetched_at = float(saved["fetched_at"])
+    except (OSError, ValueError, KeyError) as e:
+        if path.exists():
+            logger.warning(f"Ignoring tool catalog snapshot {path}: {e!r}")
+        return None
+    return CatalogEntry(tools, tools_digest(tools), fetched_at, to_anthropic_format(tools))
+
+
+def _save_snapshot(gateway_url: str, path: Path, entry: CatalogEntry) -> None:
+    try:
+        snapshot = json.loads(path.read_text()) if path.exists() else {}
+    except ValueError:
+        snapshot = {}
+    snapshot[gateway_url] = {
+        "fetched_at": entry.fetched_at,
+        "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in entry.tools],
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(snapshot, indent=2))
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Could not write tool catalog snapshot {path}: {e}")
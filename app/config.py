@@ -10,6 +10,25 @@ MODEL = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-5-20250929")
 # Arcade Gateway (pre-configured with AllPoints tools + Gmail/Slack/Slides)
 GATEWAY_URL = os.environ.get("ARCADE_GATEWAY_URL", "https://api.arcade.dev/mcp/allpoints-demo")
 ARCADE_API_KEY = os.environ.get("ARCADE_API_KEY", "")
+# Seconds a user's Gateway session may sit unused before it is closed
+GATEWAY_SESSION_IDLE_TIMEOUT = float(os.environ.get("ARCADE_SESSION_IDLE_TIMEOUT", "300"))
+# The tool list is shared by all sessions and re-fetched in the background after this many seconds
+TOOL_CATALOG_TTL = float(os.environ.get("ARCADE_TOOL_CATALOG_TTL", "600"))
+# Optional file that keeps the tool list across restarts (empty = memory only)
+TOOL_CATALOG_SNAPSHOT = os.environ.get("ARCADE_TOOL_CATALOG_SNAPSHOT", "")
+
+# Run AllPoints tools in-process when the database is on this host (0 = always use the Gateway)
+LOCAL_TOOLS = os.environ.get("ALLPOINTS_LOCAL_TOOLS", "1") == "1"
+
+# Tool calls from one assistant turn run concurrently, up to this many at once
+TOOL_CONCURRENCY = int(os.environ.get("TOOL_CONCURRENCY", "4"))
+# Per-call limit; a call that exceeds it returns an error result to Claude
+TOOL_TIMEOUT_SECONDS = float(os.environ.get("TOOL_TIMEOUT_SECONDS", "60"))
+
+# History compaction: tool results from the last N finished turns are trimmed
+# to the token budget; older ones are replaced by a reference to the call
+HISTORY_KEEP_TURNS = int(os.environ.get("HISTORY_KEEP_TURNS", "3"))
+TOOL_RESULT_TOKEN_BUDGET = int(os.environ.get("TOOL_RESULT_TOKEN_BUDGET", "2000"))
 
 # Load system prompt from file
 _prompt_path = Path(__file__).resolve().parent.parent / "claude_project_prompt.md"
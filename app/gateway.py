@@ -4,52 +4,251 @@ Connects to the Arcade Gateway via Streamable HTTP (MCP protocol),
 discovers available tools, and executes tool calls.
 Auth is per-user: the API key authenticates the app, the User-ID
 isolates OAuth tokens per prospect.
+
+Each gateway keeps one MCP session open and reuses it for every call,
+instead of paying for a new connection and ``initialize`` handshake per
+tool call. The session reconnects on demand after transport errors and
+closes itself after ``idle_timeout`` seconds without calls. All gateways
+share one HTTP connection pool, so TCP/TLS connections stay alive across
+sessions and users.
 """
 
+import asyncio
 import logging
 import re
+import time
 from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
 
+import anyio
 import httpx
 from mcp import ClientSession
 from mcp.client.streamable_http import streamable_http_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+import catalog
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT_SECONDS = 60.0
+DEFAULT_IDLE_TIMEOUT_SECONDS = 300.0
+
+# Keep-alive pool shared by every gateway (all users talk to the same host)
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120.0)
+
+# Raised when writing to a session whose streams are already closed: the
+# request never left the process, so it is safe to reconnect and resend.
+_NOT_SENT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+
+_shared_transport: httpx.AsyncHTTPTransport | None = None
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Delegates to the shared pool; closing a per-user client leaves the pool open."""
+
+    def __init__(self, pool: httpx.AsyncHTTPTransport):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _get_shared_transport() -> httpx.AsyncHTTPTransport:
+    global _shared_transport
+    if _shared_transport is None:
+        # retries= only retries failed connects, never a request that was sent
+        _shared_transport = httpx.AsyncHTTPTransport(limits=POOL_LIMITS, retries=1)
+    return _shared_transport
+
+
+async def close_shared_pool() -> None:
+    """Close the shared HTTP connection pool (on app shutdown)."""
+    global _shared_transport
+    if _shared_transport is not None:
+        await _shared_transport.aclose()
+        _shared_transport = None
+
+
+class _LiveSession:
+    """An MCP session held open by a background task.
+
+    The transport's task group must be entered and exited by the same task,
+    so one owner task opens the session, parks until it is closed or goes
+    idle, and then exits the contexts. Calls from any task use ``session``.
+    """
+
+    def __init__(self, gateway_url: str, http_client: httpx.AsyncClient, idle_timeout: float):
+        self.session: ClientSession | None = None
+        self.last_used = time.monotonic()
+        self._url = gateway_url
+        self._http_client = http_client
+        self._idle_timeout = idle_timeout
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def open(self) -> ClientSession:
+        self._task = asyncio.create_task(self._run(), name="arcade-gateway-session")
+        await self._ready.wait()
+        if self.session is None:
+            raise self._error or ConnectionError("Gateway session closed during startup")
+        return self.session
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        try:
+            async with streamable_http_client(self._url, http_client=self._http_client) as (read, write, _):
+                async with ClientSession(
+                    read, write, read_timeout_seconds=timedelta(seconds=REQUEST_TIMEOUT_SECONDS)
+                ) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._park()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"Gateway session ended: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def _park(self) -> None:
+        """Wait until close() is called or no call has been made for idle_timeout."""
+        while not self._closing.is_set():
+            idle_for = time.monotonic() - self.last_used
+            if idle_for >= self._idle_timeout:
+                logger.info("Closing idle gateway session")
+                return
+            try:
+                await asyncio.wait_for(self._closing.wait(), self._idle_timeout - idle_for)
+            except asyncio.TimeoutError:
+                pass
+
 
 class ArcadeGateway:
     """Thin MCP client wrapper for the Arcade Gateway."""
 
-    def __init__(self, gateway_url: str, api_key: str, user_id: str):
+    def __init__(
+        self,
+        gateway_url: str,
+        api_key: str,
+        user_id: str,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+        catalog_ttl: float = catalog.DEFAULT_TTL_SECONDS,
+        catalog_snapshot: str | Path | None = None,
+    ):
         self.gateway_url = gateway_url
         self.api_key = api_key
         self.user_id = user_id
-        self._tools_cache = None
+        self.idle_timeout = idle_timeout
+        self.catalog_ttl = catalog_ttl
+        self.catalog_snapshot = catalog_snapshot
+        self._http_client: httpx.AsyncClient | None = None
+        self._live: _LiveSession | None = None
+        self._session_lock = asyncio.Lock()
 
     def _make_http_client(self) -> httpx.AsyncClient:
-        """Create an httpx client with Arcade auth headers."""
+        """Create an httpx client with Arcade auth headers on the shared pool."""
         return httpx.AsyncClient(
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Arcade-User-ID": self.user_id,
             },
-            timeout=60.0,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            transport=_SharedTransport(_get_shared_transport()),
+        )
+
+    async def _session(self) -> ClientSession:
+        """Return the live session, opening a new one if there is none."""
+        live = self._live
+        if live is not None and live.alive:
+            live.last_used = time.monotonic()
+            return live.session
+
+        async with self._session_lock:
+            if self._live is not None and self._live.alive:
+                return self._live.session
+            if self._live is not None:
+                await self._live.close()
+            if self._http_client is None:
+                self._http_client = self._make_http_client()
+            self._live = _LiveSession(self.gateway_url, self._http_client, self.idle_timeout)
+            return await self._live.open()
+
+    async def _reset_session(self, session: ClientSession | None = None) -> None:
+        """Drop the current session; the next call reconnects.
+
+        With ``session``, only drop it if it is still the current one: a
+        concurrent call may already have replaced the failed session, and
+        that new one must stay open.
+        """
+        async with self._session_lock:
+            live = self._live
+            if live is None or (session is not None and live.session is not session):
+                return
+            self._live = None
+        await live.close()
+
+    async def _request(self, send):
+        """Run ``send(session)`` on the live session, reconnecting when it is broken.
+
+        Requests that failed before being written are resent once on a
+        fresh session. A connection lost after the write is not resent (the
+        tool may already have run); the session is dropped and the error
+        raised, so the next call reconnects.
+        """
+        for attempt in range(2):
+            session = await self._session()
+            try:
+                return await send(session)
+            except _NOT_SENT_ERRORS as e:
+                await self._reset_session(session)
+                if attempt:
+                    raise ConnectionError(f"Gateway connection lost: {e!r}") from e
+                logger.info("Gateway session was closed; reconnecting")
+            except McpError as e:
+                if e.error.code in (CONNECTION_CLOSED, httpx.codes.REQUEST_TIMEOUT):
+                    await self._reset_session(session)
+                raise
+
+    async def aclose(self) -> None:
+        """Close the session (call when the user's chat ends)."""
+        await self._reset_session()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def discover_tools(self) -> list:
+        """Fetch the tool list from the Gateway, bypassing the catalog cache."""
+        result = await self._request(lambda session: session.list_tools())
+        return result.tools
+
+    async def _catalog(self) -> catalog.CatalogEntry:
+        return await catalog.get_catalog(
+            self.gateway_url, self.discover_tools, self.catalog_ttl, self.catalog_snapshot
         )
 
     async def list_tools(self) -> list:
-        """Discover available tools from the Gateway. Caches on first call."""
-        if self._tools_cache is not None:
-            return self._tools_cache
-
-        async with self._make_http_client() as http_client:
-            async with streamable_http_client(
-                self.gateway_url, http_client=http_client
-            ) as (read, write, _):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.list_tools()
-                    self._tools_cache = result.tools
-                    return self._tools_cache
+        """Available tools, from the process-wide catalog shared by all sessions."""
+        return (await self._catalog()).tools
+
+    async def list_anthropic_tools(self) -> list[dict]:
+        """Available tools in Anthropic API format (memoized with the catalog)."""
+        return (await self._catalog()).anthropic_tools
 
     async def call_tool(self, name: str, arguments: dict) -> "ToolCallResult":
         """Execute a tool call through the Gateway.
@@ -57,58 +256,41 @@ class ArcadeGateway:
         Returns a ToolCallResult with the text output and metadata about
         whether authorization is required.
         """
-        async with self._make_http_client() as http_client:
-            async with streamable_http_client(
-                self.gateway_url, http_client=http_client
-            ) as (read, write, _):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.call_tool(name, arguments)
-
-                    # Check for authorization elicitation in the result
-                    auth_url = _extract_auth_url(result)
-                    if auth_url:
-                        return ToolCallResult(
-                            text=f"Authorization required for {name}.",
-                            needs_auth=True,
-                            auth_url=auth_url,
-                        )
-
-                    if not result.content:
-                        return ToolCallResult(text="")
-
-                    parts = []
-                    for block in result.content:
-                        if hasattr(block, "text"):
-                            parts.append(block.text)
-                        else:
-                            parts.append(str(block))
-
-                    is_error = getattr(result, "isError", False)
-                    return ToolCallResult(
-                        text="\n".join(parts),
-                        is_error=is_error,
-                    )
+        result = await self._request(lambda session: session.call_tool(name, arguments))
+
+        # Check for authorization elicitation in the result
+        auth_url = _extract_auth_url(result)
+        if auth_url:
+            return ToolCallResult(
+                text=f"Authorization required for {name}.",
+                needs_auth=True,
+                auth_url=auth_url,
+            )
+
+        if not result.content:
+            return ToolCallResult(text="")
+
+        parts = []
+        for block in result.content:
+            if hasattr(block, "text"):
+                parts.append(block.text)
+            else:
+                parts.append(str(block))
+
+        is_error = getattr(result, "isError", False)
+        return ToolCallResult(
+            text="\n".join(parts),
+            is_error=is_error,
+        )
 
     def clear_tools_cache(self):
         """Force re-discovery of tools on next list_tools() call."""
-        self._tools_cache = None
+        catalog.invalidate(self.gateway_url)
 
     @staticmethod
     def to_anthropic_format(mcp_tools: list) -> list[dict]:
-        """Convert MCP tool definitions to Anthropic API tool format.
-
-        MCP uses `inputSchema`, Anthropic uses `input_schema`.
-        """
-        anthropic_tools = []
-        for tool in mcp_tools:
-            schema = tool.inputSchema if hasattr(tool, "inputSchema") else {}
-            anthropic_tools.append({
-                "name": tool.name,
-                "description": tool.description or "",
-                "input_schema": schema,
-            })
-        return anthropic_tools
+        """Convert MCP tool definitions to Anthropic API tool format."""
+        return catalog.to_anthropic_format(mcp_tools)
 
 
 @dataclass
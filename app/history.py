@@ -0,0 +1,135 @@
+"""Conversation history compaction.
+
+The chat session keeps every message, and every request resends all of it.
+Tool results dominate that history (a 50-row JSON result is thousands of
+tokens), so before each new user message:
+
+- results from the last ``keep_turns`` finished turns are trimmed to
+  ``budget_tokens``: JSON is re-serialized compactly and long arrays keep
+  their leading rows; anything else keeps its head
+- older results are replaced by a short reference naming the tool call,
+  which Claude can re-run if it needs the data again
+
+The current turn is never touched, and compaction is deterministic and
+idempotent, so an already-compacted prefix stays byte-identical and keeps
+hitting the prompt cache.
+"""
+
+import json
+
+# Rough tokens-per-character ratio for English text and JSON
+CHARS_PER_TOKEN = 4
+
+_REFERENCE_PREFIX = "[Result of "
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Approximate token count of a message list."""
+    chars = 0
+    for message in messages:
+        content = message["content"]
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for block in content:
+            for field in ("text", "content", "input"):
+                value = _get(block, field)
+                if isinstance(value, str):
+                    chars += len(value)
+                elif value is not None:
+                    chars += len(json.dumps(value, default=str))
+    return chars // CHARS_PER_TOKEN
+
+
+def compact_history(messages: list[dict], keep_turns: int, budget_tokens: int) -> int:
+    """Compact tool results in place; return the number of results changed.
+
+    A turn starts at each user message typed by the user (as opposed to a
+    message carrying tool results). Call between turns, before appending the
+    new user message.
+    """
+    tool_calls = {}
+    turn_of = []
+    turn = 0
+    for message in messages:
+        if message["role"] == "user" and not _has_tool_results(message):
+            turn += 1
+        turn_of.append(turn)
+        if message["role"] == "assistant" and not isinstance(message["content"], str):
+            for block in message["content"]:
+                if _get(block, "type") == "tool_use":
+                    tool_calls[_get(block, "id")] = (_get(block, "name"), _get(block, "input"))
+
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    changed = 0
+    for message, message_turn in zip(messages, turn_of):
+        if not _has_tool_results(message):
+            continue
+        age = turn - message_turn
+        blocks = []
+        for block in message["content"]:
+            text = block.get("content") if isinstance(block, dict) else None
+            if isinstance(text, str) and not text.startswith(_REFERENCE_PREFIX):
+                if age >= keep_turns:
+                    name, tool_input = tool_calls.get(block.get("tool_use_id"), ("tool", {}))
+                    new_text = _reference(name, tool_input)
+                else:
+                    new_text = _trim(text, budget_chars)
+                if new_text != text:
+                    block = {**block, "content": new_text}
+                    changed += 1
+            blocks.append(block)
+        message["content"] = blocks
+    return changed
+
+
+def _get(block, field: str):
+    if isinstance(block, dict):
+        return block.get(field)
+    return getattr(block, field, None)
+
+
+def _has_tool_results(message: dict) -> bool:
+    content = message["content"]
+    return (
+        message["role"] == "user"
+        and not isinstance(content, str)
+        and any(_get(block, "type") == "tool_result" for block in content)
+    )
+
+
+def _reference(name: str, tool_input) -> str:
+    args = json.dumps(tool_input or {}, separators=(",", ":"), default=str)
+    return f"{_REFERENCE_PREFIX}{name}({args}) removed from history. Call the tool again if you need it.]"
+
+
+def _trim(text: str, budget_chars: int) -> str:
+    """Shorten ``text`` to at most ``budget_chars`` characters."""
+    if len(text) <= budget_chars:
+        return text
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if data is not None:
+        compact = json.dumps(data, separators=(",", ":"), default=str)
+        if len(compact) <= budget_chars:
+            return compact
+        if isinstance(data, list):
+            return _trim_rows(data, budget_chars)
+    note = f"\n[... {len(text):,} chars, truncated. Call the tool again for the full result.]"
+    return text[:max(budget_chars - len(note), 0)] + note
+
+
+def _trim_rows(rows: list, budget_chars: int) -> str:
+    """Leading rows of a JSON array that fit the budget, plus a row count."""
+    note = f"\n[{len(rows):,} rows total, first {{kept}} shown. Call the tool again for the rest.]"
+    used = len(note) + 2
+    kept = []
+    for row in rows:
+        item = json.dumps(row, separators=(",", ":"), default=str)
+        if used + len(item) + 1 > budget_chars:
+            break
+        kept.append(item)
+        used += len(item) + 1
+    return "[" + ",".join(kept) + "]" + note.format(kept=len(kept))
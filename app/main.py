@@ -5,22 +5,47 @@ The Gateway is pre-configured with AllPoints MCP tools + Gmail/Slack/Slides.
 Each prospect authenticates via email for per-user OAuth on personal tools.
 """
 
+import asyncio
 import logging
 
 import chainlit as cl
 from anthropic import AsyncAnthropic
 
-from config import ANTHROPIC_API_KEY, ARCADE_API_KEY, GATEWAY_URL, MODEL, SYSTEM_PROMPT
+from config import (
+    ANTHROPIC_API_KEY,
+    ARCADE_API_KEY,
+    GATEWAY_SESSION_IDLE_TIMEOUT,
+    GATEWAY_URL,
+    HISTORY_KEEP_TURNS,
+    LOCAL_TOOLS,
+    MODEL,
+    SYSTEM_PROMPT,
+    TOOL_CATALOG_SNAPSHOT,
+    TOOL_CATALOG_TTL,
+    TOOL_CONCURRENCY,
+    TOOL_RESULT_TOKEN_BUDGET,
+    TOOL_TIMEOUT_SECONDS,
+)
 from gateway import ArcadeGateway, ToolCallResult
+from history import compact_history, estimate_tokens
+from router import ToolRouter, load_local_tools
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 anthropic = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
 
+# AllPoints tools that run in-process instead of through the Gateway
+local_tools = load_local_tools() if LOCAL_TOOLS else {}
+
 # Maximum tool-call rounds per message to prevent infinite loops
 MAX_TOOL_ROUNDS = 10
 
+# Prompt-cache breakpoint. Requests cache the tool list, the system prompt and
+# the conversation so far, so each round only pays full price for new turns.
+CACHE_CONTROL = {"type": "ephemeral"}
+USAGE_FIELDS = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
 
 @cl.on_chat_start
 async def on_chat_start():
@@ -41,19 +66,24 @@ async def on_chat_start():
 
     user_email = res["output"].strip()
 
-    # Connect to the pre-configured Arcade Gateway
-    gateway = ArcadeGateway(
-        gateway_url=GATEWAY_URL,
-        api_key=ARCADE_API_KEY,
-        user_id=user_email,
+    # Connect to the pre-configured Arcade Gateway; AllPoints tools run locally when possible
+    gateway = ToolRouter(
+        ArcadeGateway(
+            gateway_url=GATEWAY_URL,
+            api_key=ARCADE_API_KEY,
+            user_id=user_email,
+            idle_timeout=GATEWAY_SESSION_IDLE_TIMEOUT,
+            catalog_ttl=TOOL_CATALOG_TTL,
+            catalog_snapshot=TOOL_CATALOG_SNAPSHOT or None,
+        ),
+        local_tools,
     )
 
     status_msg = cl.Message(content="Connecting to All Points systems...")
     await status_msg.send()
 
     try:
-        mcp_tools = await gateway.list_tools()
-        anthropic_tools = gateway.to_anthropic_format(mcp_tools)
+        anthropic_tools = await gateway.list_anthropic_tools()
     except Exception as e:
         logger.error(f"Failed to connect to Gateway: {e}")
         await cl.Message(
@@ -66,16 +96,29 @@ async def on_chat_start():
     cl.user_session.set("tools", anthropic_tools)
     cl.user_session.set("messages", [])
     cl.user_session.set("user_email", user_email)
+    cl.user_session.set("usage", dict.fromkeys((*USAGE_FIELDS, "context_tokens"), 0))
 
     tool_count = len(anthropic_tools)
     status_msg.content = f"Connected — **{tool_count} tools** available across shipping, billing, compliance, and more.\n\nHow can I help?"
     await status_msg.update()
 
 
+@cl.on_chat_end
+async def on_chat_end():
+    """Close the user's Gateway session and log its token usage."""
+    usage = cl.user_session.get("usage")
+    if usage:
+        logger.info(f"Session usage for {cl.user_session.get('user_email')}: {usage}")
+
+    gateway: ToolRouter = cl.user_session.get("gateway")
+    if gateway:
+        await gateway.aclose()
+
+
 @cl.on_message
 async def on_message(message: cl.Message):
-    """Handle a user message: call Claude, execute tool calls, stream response."""
-    gateway: ArcadeGateway = cl.user_session.get("gateway")
+    """Handle a user message: stream Claude's response, execute tool calls as they arrive."""
+    gateway: ToolRouter = cl.user_session.get("gateway")
     tools: list[dict] = cl.user_session.get("tools")
     messages: list[dict] = cl.user_session.get("messages")
 
@@ -83,102 +126,185 @@ async def on_message(message: cl.Message):
         await cl.Message(content="Session not initialized. Please refresh and enter your email.").send()
         return
 
+    # Trim or drop tool results from earlier turns before they are resent
+    before = estimate_tokens(messages)
+    compacted = compact_history(messages, HISTORY_KEEP_TURNS, TOOL_RESULT_TOKEN_BUDGET)
+    if compacted:
+        logger.info(f"Compacted {compacted} tool result(s): ~{before} -> ~{estimate_tokens(messages)} tokens")
+
     # Append user message
     messages.append({"role": "user", "content": message.content})
 
     # Tool-calling loop: Claude may call tools multiple times before responding
     for _round in range(MAX_TOOL_ROUNDS):
-        response = await anthropic.messages.create(
-            model=MODEL,
-            max_tokens=4096,
-            system=SYSTEM_PROMPT,
-            tools=tools,
-            messages=messages,
-        )
-
-        assistant_content = response.content
-        messages.append({"role": "assistant", "content": assistant_content})
-
-        # Separate text blocks and tool-use blocks
-        text_parts = [block.text for block in assistant_content if block.type == "text"]
-        tool_uses = [block for block in assistant_content if block.type == "tool_use"]
+        response, tool_calls = await _stream_round(gateway, tools, messages)
+        messages.append({"role": "assistant", "content": response.content})
 
-        # If there are no tool calls, we're done — send the final text
-        if not tool_uses:
-            if text_parts:
-                await cl.Message(content="\n\n".join(text_parts)).send()
+        # If there are no tool calls, we're done
+        if not tool_calls:
             break
 
-        # Show any text that came before tool calls
-        if text_parts:
-            await cl.Message(content="\n\n".join(text_parts)).send()
-
-        # Execute each tool call
-        tool_results = []
-        for tool_use in tool_uses:
-            async with cl.Step(name=tool_use.name, type="tool") as step:
-                step.input = tool_use.input
-
-                try:
-                    result: ToolCallResult = await gateway.call_tool(
-                        tool_use.name, tool_use.input
-                    )
-
-                    if result.needs_auth:
-                        # OAuth authorization needed — show link to prospect
-                        step.output = "Authorization required"
-                        auth_msg = (
-                            f"**{tool_use.name}** needs access to your account.\n\n"
-                            f"[Click here to authorize]({result.auth_url})\n\n"
-                            f"Once authorized, try your request again."
-                        )
-                        await cl.Message(content=auth_msg).send()
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use.id,
-                            "content": f"Authorization required. The user has been shown an authorization link.",
-                            "is_error": True,
-                        })
-                    elif result.is_error:
-                        step.output = f"Error: {result.text}"
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use.id,
-                            "content": f"Error: {result.text}",
-                            "is_error": True,
-                        })
-                    else:
-                        step.output = _truncate(result.text, 2000)
-                        tool_results.append({
-                            "type": "tool_result",
-                            "tool_use_id": tool_use.id,
-                            "content": result.text,
-                        })
-
-                except Exception as e:
-                    error_msg = str(e)
-                    step.output = f"Error: {error_msg}"
-                    logger.warning(f"Tool call {tool_use.name} failed: {error_msg}")
-
-                    # Check if the exception itself contains an auth URL
-                    if _is_auth_error(error_msg):
-                        await cl.Message(
-                            content=_format_auth_message(error_msg)
-                        ).send()
-
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_use.id,
-                        "content": f"Error: {error_msg}",
-                        "is_error": True,
-                    })
+        # Tool calls started while the response streamed; results keep tool_use order
+        tool_results = await asyncio.gather(*tool_calls)
 
         # Feed tool results back to Claude
-        messages.append({"role": "user", "content": tool_results})
+        messages.append({"role": "user", "content": list(tool_results)})
 
     cl.user_session.set("messages", messages)
 
 
+async def _stream_round(gateway: ToolRouter, tools: list[dict], messages: list[dict]):
+    """Stream one model response to the UI, starting each tool call as soon as its input is complete.
+
+    Returns the final message and the started tool-call tasks, in tool_use order.
+    """
+    limit = asyncio.Semaphore(TOOL_CONCURRENCY)
+    tool_calls: list[asyncio.Task] = []
+    reply: cl.Message | None = None
+
+    try:
+        async with anthropic.messages.stream(
+            model=MODEL,
+            max_tokens=4096,
+            system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": CACHE_CONTROL}],
+            tools=_cached_tools(tools),
+            messages=_cached_messages(messages),
+        ) as stream:
+            async for event in stream:
+                if event.type == "content_block_start" and event.content_block.type == "text":
+                    if reply is not None and reply.content:
+                        await reply.stream_token("\n\n")
+                elif event.type == "text":
+                    if reply is None:
+                        reply = cl.Message(content="")
+                    await reply.stream_token(event.text)
+                elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                    tool_calls.append(asyncio.create_task(_run_tool(gateway, event.content_block, limit)))
+            response = await stream.get_final_message()
+        _record_usage(response.usage)
+    except BaseException:
+        for task in tool_calls:
+            task.cancel()
+        raise
+
+    if reply is not None:
+        await reply.send()
+    return response, tool_calls
+
+
+def _cached_tools(tools: list[dict]) -> list[dict]:
+    """Tool list with a cache breakpoint after the last tool."""
+    if not tools:
+        return tools
+    return [*tools[:-1], {**tools[-1], "cache_control": CACHE_CONTROL}]
+
+
+def _cached_messages(messages: list[dict]) -> list[dict]:
+    """Messages with a cache breakpoint on the newest block.
+
+    The session history is left untouched; only the request copy is marked,
+    so at most one conversation breakpoint is ever sent.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    elif content and isinstance(content[-1], dict):
+        blocks = [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}]
+    else:
+        return messages
+    return [*messages[:-1], {**last, "content": blocks}]
+
+
+def _record_usage(usage) -> None:
+    """Add one response's token counts, including cache reads/writes, to the session totals."""
+    totals = cl.user_session.get("usage")
+    if totals is None:
+        return
+    for field in USAGE_FIELDS:
+        totals[field] += getattr(usage, field, None) or 0
+    # Size of the last request's context: the session's current token footprint
+    totals["context_tokens"] = sum(
+        getattr(usage, field, None) or 0
+        for field in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+    )
+    logger.info(
+        f"Tokens: input={usage.input_tokens} cache_read={usage.cache_read_input_tokens or 0} "
+        f"cache_write={usage.cache_creation_input_tokens or 0} output={usage.output_tokens}"
+    )
+
+
+async def _run_tool(gateway: ToolRouter, tool_use, limit: asyncio.Semaphore) -> dict:
+    """Execute one tool call in its own step and return its tool_result block."""
+    async with limit, cl.Step(name=tool_use.name, type="tool") as step:
+        step.input = tool_use.input
+
+        try:
+            result: ToolCallResult = await asyncio.wait_for(
+                gateway.call_tool(tool_use.name, tool_use.input), TOOL_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            error_msg = f"Tool call timed out after {TOOL_TIMEOUT_SECONDS:.0f}s"
+            step.output = f"Error: {error_msg}"
+            logger.warning(f"Tool call {tool_use.name} timed out")
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_use.id,
+                "content": f"Error: {error_msg}",
+                "is_error": True,
+            }
+        except Exception as e:
+            error_msg = str(e)
+            step.output = f"Error: {error_msg}"
+            logger.warning(f"Tool call {tool_use.name} failed: {error_msg}")
+
+            # Check if the exception itself contains an auth URL
+            if _is_auth_error(error_msg):
+                await cl.Message(
+                    content=_format_auth_message(error_msg)
+                ).send()
+
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_use.id,
+                "content": f"Error: {error_msg}",
+                "is_error": True,
+            }
+
+        if result.needs_auth:
+            # OAuth authorization needed — show link to prospect
+            step.output = "Authorization required"
+            auth_msg = (
+                f"**{tool_use.name}** needs access to your account.\n\n"
+                f"[Click here to authorize]({result.auth_url})\n\n"
+                f"Once authorized, try your request again."
+            )
+            await cl.Message(content=auth_msg).send()
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_use.id,
+                "content": f"Authorization required. The user has been shown an authorization link.",
+                "is_error": True,
+            }
+        if result.is_error:
+            step.output = f"Error: {result.text}"
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_use.id,
+                "content": f"Error: {result.text}",
+                "is_error": True,
+            }
+
+        step.output = _truncate(result.text, 2000)
+        return {
+            "type": "tool_result",
+            "tool_use_id": tool_use.id,
+            "content": result.text,
+        }
+
+
 def _truncate(text: str, max_len: int) -> str:
     """Truncate text for display in the Chainlit step panel."""
     if len(text) <= max_len:
@@ -0,0 +1,149 @@
+"""Local tool router.
+
+When the chatbot runs on the same host as the AllPoints database, calling
+its tools through the Arcade Gateway costs a network round-trip (and an MCP
+request) per call for work that is a local SQLite query. ``ToolRouter``
+calls the ``@app.tool()`` functions of ``mcp_servers/allpoints_server.py``
+in-process instead, and sends everything else (Gmail, Slack, Slides: the
+tools that need per-user OAuth) through ``ArcadeGateway``.
+
+Tool discovery still goes through the Gateway, so Claude sees the same tool
+names and schemas either way; a call is routed locally when its name is an
+AllPoints tool (``Allpoints_GetOpenOrders``) that needs no authorization.
+
+Each local call runs on its own event loop in a worker thread, so tool
+work (JSON serialization, rating) never blocks the chat UI's event loop.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from gateway import ArcadeGateway, ToolCallResult
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Toolkit name of the AllPoints MCPApp, as it prefixes tool names on the Gateway
+LOCAL_TOOLKIT = "allpoints"
+
+LocalTool = Callable[..., Awaitable[Any]]
+
+# Worker threads shared by every chat session's local tool calls
+LOCAL_TOOL_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=LOCAL_TOOL_WORKERS, thread_name_prefix="allpoints-tool")
+
+
+def load_local_tools() -> dict[str, LocalTool]:
+    """Find the AllPoints tool functions that can run in this process, keyed by tool name.
+
+    Returns an empty dict (everything goes through the Gateway) when the
+    server module can't be imported or the database isn't on this host.
+    """
+    sys.path.insert(0, str(PROJECT_ROOT))
+    try:
+        from shared.database.connection import get_db_path
+
+        if not get_db_path().exists():
+            logger.info(f"AllPoints database not found at {get_db_path()}; using the Gateway for all tools")
+            return {}
+        from mcp_servers import allpoints_server
+    except ImportError as e:
+        logger.warning(f"AllPoints tools unavailable in-process ({e}); using the Gateway for all tools")
+        return {}
+
+    tools = {}
+    for fn in vars(allpoints_server).values():
+        if callable(fn) and hasattr(fn, "__tool_name__") and fn.__tool_requires_auth__ is None:
+            tools[fn.__tool_name__] = fn
+    logger.info(f"Routing {len(tools)} AllPoints tools in-process")
+    return tools
+
+
+class _LocalCall:
+    """One tool coroutine running on a private event loop in a worker thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._cancelled = False
+
+    def run(self, fn: LocalTool, arguments: dict) -> Any:
+        return asyncio.run(self._main(fn, arguments))
+
+    async def _main(self, fn: LocalTool, arguments: dict) -> Any:
+        with self._lock:
+            if self._cancelled:
+                raise asyncio.CancelledError
+            self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+        try:
+            return await fn(**arguments)
+        finally:
+            with self._lock:
+                self._loop = self._task = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._task is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+class ToolRouter:
+    """Calls AllPoints tools in-process and every other tool through the Gateway.
+
+    Exposes the ``ArcadeGateway`` interface the chat loop uses.
+    """
+
+    def __init__(self, gateway: ArcadeGateway, local_tools: dict[str, LocalTool]):
+        self.gateway = gateway
+        self._local_tools = local_tools
+
+    def local_tool(self, name: str) -> LocalTool | None:
+        """The in-process function for a Gateway tool name, or None."""
+        toolkit, _, tool_name = name.rpartition("_")
+        if toolkit.lower() != LOCAL_TOOLKIT:
+            return None
+        return self._local_tools.get(tool_name)
+
+    async def list_tools(self) -> list:
+        return await self.gateway.list_tools()
+
+    async def list_anthropic_tools(self) -> list[dict]:
+        return await self.gateway.list_anthropic_tools()
+
+    async def call_tool(self, name: str, arguments: dict) -> ToolCallResult:
+        """Execute a tool call, in-process if possible."""
+        fn = self.local_tool(name)
+        if fn is None:
+            return await self.gateway.call_tool(name, arguments)
+
+        call = _LocalCall()
+        future = asyncio.get_running_loop().run_in_executor(_executor, call.run, fn, arguments)
+        try:
+            result = await future
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except Exception as e:
+            logger.warning(f"Local tool {name} failed: {e}")
+            return ToolCallResult(text=str(e), is_error=True)
+
+        if not isinstance(result, str):
+            result = json.dumps(result, indent=2, default=str)
+        return ToolCallResult(text=result)
+
+    async def aclose(self) -> None:
+        await self.gateway.aclose()
+
+    @staticmethod
+    def to_anthropic_format(mcp_tools: list) -> list[dict]:
+        return ArcadeGateway.to_anthropic_format(mcp_tools)
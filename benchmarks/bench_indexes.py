@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Before/after latency per tool for the active-record index migration (0001).
+
+Makes two copies of the database:
+
+- before: baseline indexes only (the migration's indexes dropped, the ones
+  it replaced restored from schema.sql, no planner statistics)
+- after:  migration 0001 applied
+
+then times each tool call against both, each in a fresh server process.
+
+Usage:
+    python benchmarks/bench_indexes.py                      # App database
+    python benchmarks/bench_indexes.py --db big.db --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.database import migrations
+from shared.database.connection import get_db_path, get_schema_path
+
+MIGRATION = 1
+
+# (tool, kwargs): the tools whose queries the migration targets
+CALLS = [
+    ("detect_exceptions", {}),
+    ("detect_exceptions", {"status_filter": "lost"}),
+    ("get_unread_emails", {}),
+    ("get_unread_emails", {"category": "tracking_request"}),
+    ("get_open_orders", {}),
+    ("rate_shop_batch", {}),
+    ("rate_shop_batch", {"live_rates": False}),
+    ("get_open_chargebacks", {"status": "new"}),
+    ("get_expiring_chargebacks", {"days": 30}),
+]
+
+
+def _label(tool: str, kwargs: dict) -> str:
+    args = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+    return f"{tool}({args})"
+
+
+def _copy(src: Path, dst: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(dst))
+    with sqlite3.connect(f"file:{src}?mode=ro", uri=True) as source:
+        source.backup(conn)
+    return conn
+
+
+def _make_before(src: Path, dst: Path) -> None:
+    migration = dict(migrations.available())[MIGRATION].read_text()
+    conn = _copy(src, dst)
+    for index in re.findall(r"CREATE INDEX IF NOT EXISTS (\w+)", migration):
+        conn.execute(f"DROP INDEX IF EXISTS {index}")
+    conn.executescript(get_schema_path().read_text())
+    conn.execute("DROP TABLE IF EXISTS sqlite_stat1")
+    conn.execute(f"PRAGMA user_version = {MIGRATION - 1}")
+    conn.commit()
+    conn.close()
+
+
+def _make_after(before: Path, dst: Path) -> None:
+    conn = _copy(before, dst)
+    migrations.apply(conn)
+    conn.close()
+
+
+def _run_child(db_path: Path, repeat: int) -> dict[str, float]:
+    env = dict(os.environ, ALLPOINTS_DB_PATH=str(db_path), ALLPOINTS_DB_AUTO_MIGRATE="0")
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--repeat", str(repeat)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _child(repeat: int) -> None:
+    """Time every call against ALLPOINTS_DB_PATH; print {label: median_ms}."""
+    from mcp_servers import allpoints_server as server
+
+    async def run() -> dict[str, float]:
+        timings = {}
+        for tool, kwargs in CALLS:
+            fn = getattr(server, tool)
+            await fn(**kwargs)  # warm the statement cache
+            samples = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                await fn(**kwargs)
+                samples.append((time.perf_counter() - t0) * 1000)
+            timings[_label(tool, kwargs)] = statistics.median(samples)
+        return timings
+
+    print(json.dumps(asyncio.run(run())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Before/after tool latency for migration 0001")
+    parser.add_argument("--db", type=Path, default=None, help="Source database (default: the app database)")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per tool (default 50)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.repeat)
+        return
+
+    src = args.db or get_db_path()
+    if not src.exists():
+        sys.exit(f"Database not found: {src} (run setup_database.py first)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before, after = Path(tmp) / "before.db", Path(tmp) / "after.db"
+        _make_before(src, before)
+        _make_after(before, after)
+        t_before = _run_child(before, args.repeat)
+        t_after = _run_child(after, args.repeat)
+
+    print(f"Median latency per tool call, {args.repeat} calls each ({src})")
+    print("-" * 92)
+    print(f"  {'tool call':<52} {'before ms':>10} {'after ms':>10} {'speedup':>10}")
+    print("-" * 92)
+    for label, b in t_before.items():
+        a = t_after[label]
+        print(f"  {label:<52} {b:>10.3f} {a:>10.3f} {b / a:>9.2f}x")
+    print("-" * 92)
+
+
+if __name__ == "__main__":
+    main()
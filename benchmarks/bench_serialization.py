@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Serialization time and size per JSON backend on real tool payloads.
+
+Calls a set of tools once, parses their JSON responses back into Python
+objects, and then times serializing each payload with:
+
+- old:    json.dumps(indent=2, default=str), the format before the
+          serialization layer
+- json / orjson: ``shared.serialization`` backends, compact and indented
+
+Every backend's output is checked to be byte-identical to the stdlib one
+before it is timed.
+
+Usage:
+    python benchmarks/bench_serialization.py                 # App database
+    python benchmarks/bench_serialization.py --scale 100     # 100x the rows
+    python benchmarks/bench_serialization.py --db big.db --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# (tool, kwargs): list and report tools with the largest JSON responses
+CALLS = [
+    ("detect_exceptions", {}),
+    ("get_client_shipments", {"client_name": "TurtleBox", "limit": 500}),
+    ("get_unread_emails", {"limit": 500}),
+    ("get_labor_summary", {}),
+    ("get_open_orders", {"limit": 500}),
+    ("rate_shop_batch", {"limit": 500}),
+    ("get_open_chargebacks", {"limit": 500}),
+    ("get_ltl_quotes", {"limit": 500}),
+    ("compare_ltl_carriers", {"client_name": "TurtleBox"}),
+    ("get_profitability_overview", {}),
+]
+
+
+def _label(tool: str, kwargs: dict) -> str:
+    args = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+    return f"{tool}({args})"
+
+
+def _payloads() -> dict[str, Any]:
+    from mcp_servers import allpoints_server as server
+
+    async def run() -> dict[str, Any]:
+        return {
+            _label(tool, kwargs): json.loads(await getattr(server, tool)(**kwargs))
+            for tool, kwargs in CALLS
+        }
+
+    return asyncio.run(run())
+
+
+def _scale(payload: Any, factor: int) -> Any:
+    """Repeat the rows of a ``results`` payload ``factor`` times."""
+    if factor > 1 and isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        rows = payload["results"] * factor
+        return {**payload, "results": rows, "count": len(rows)}
+    return payload
+
+
+def _median_ms(fn: Callable[[], str], repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _rows(payload: Any) -> int | str:
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        return len(payload["results"])
+    return "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON backend time and size on tool payloads")
+    parser.add_argument("--db", type=Path, default=None, help="Database (default: the app database)")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat each payload's rows N times (default 1)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per payload (default 20)")
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["ALLPOINTS_DB_PATH"] = str(args.db)
+    os.environ.setdefault("ALLPOINTS_RESULT_CACHE", "0")
+    from shared.database.connection import get_db_path
+    from shared.serialization import BACKENDS
+
+    if not get_db_path().exists():
+        sys.exit(f"Database not found: {get_db_path()} (run setup_database.py first)")
+
+    payloads = {label: _scale(p, args.scale) for label, p in _payloads().items()}
+    backends = list(BACKENDS)
+    if "orjson" not in BACKENDS:
+        print("orjson is not installed; timing the stdlib backend only\n")
+
+    header = f"  {'payload':<48} {'rows':>6} {'old ms':>8}"
+    for layout in ("compact", "indent"):
+        header += "".join(f" {f'{b} {layout}':>15}" for b in backends)
+    header += f" {'old KB':>8} {'compact KB':>11}"
+    width = len(header)
+
+    print(f"Median ms per serialization, {args.repeat} runs, rows x{args.scale} ({get_db_path()})")
+    print("-" * width)
+    print(header)
+    print("-" * width)
+    totals = dict.fromkeys(["old"] + [f"{b} {l}" for l in ("compact", "indent") for b in backends], 0.0)
+    for label, payload in payloads.items():
+        old = lambda: json.dumps(payload, indent=2, default=str)  # noqa: E731
+        line = f"  {label[:48]:<48} {_rows(payload):>6}"
+        t = _median_ms(old, args.repeat)
+        totals["old"] += t
+        line += f" {t:>8.3f}"
+        for layout, pretty in (("compact", False), ("indent", True)):
+            expected = BACKENDS["json"](payload, pretty)
+            for backend in backends:
+                dumps = BACKENDS[backend]
+                if dumps(payload, pretty) != expected:
+                    sys.exit(f"{backend} {layout} output differs from json for {label}")
+                t = _median_ms(lambda: dumps(payload, pretty), args.repeat)
+                totals[f"{backend} {layout}"] += t
+                line += f" {t:>15.3f}"
+        old_kb = len(old().encode()) / 1024
+        compact_kb = len(BACKENDS["json"](payload, False).encode()) / 1024
+        print(f"{line} {old_kb:>8.1f} {compact_kb:>11.1f}")
+    print("-" * width)
+    print("  Total ms: " + ", ".join(f"{name} {t:.2f}" for name, t in totals.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Latency, memory and response size of every MCP tool at several data scales.
+
+For each scale factor, builds a database with ``setup_database.py --scale N``
+(restored from a snapshot when one matches, see shared/database/snapshots.py)
+and then, in a fresh server process with the result cache off, calls every
+tool with representative arguments:
+
+- latency: p50/p95/p99 over ``--repeat`` timed calls, after one warm-up call
+- phases: median DB, row conversion and formatting time (shared/metrics.py)
+- peak memory: Python allocations during one extra call, via tracemalloc
+- response size in bytes, and rows returned
+
+Results are written as JSON (commit, versions, one entry per call per
+scale) so runs on different commits can be compared with ``--compare``.
+
+Usage:
+    python benchmarks/bench_tools.py                          # Scales 1, 100, 1000
+    python benchmarks/bench_tools.py --scales 1,10 --repeat 50
+    python benchmarks/bench_tools.py --compare benchmarks/results/tools-abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# Row identifiers for the lookup tools, taken from the database under test;
+# string arguments of CALLS are formatted with them
+SAMPLES = {
+    "shipment_number": "SELECT shipment_number FROM shipments ORDER BY id LIMIT 1",
+    "tracking_number": "SELECT tracking_number FROM shipments ORDER BY id LIMIT 1",
+    "email_id": "SELECT MIN(id) FROM emails",
+    "order_number": "SELECT order_number FROM orders WHERE status = 'awaiting_shipment' ORDER BY id LIMIT 1",
+    "chargeback_number": "SELECT chargeback_number FROM chargebacks ORDER BY id LIMIT 1",
+    "bol_number": "SELECT bol_number FROM ltl_bookings ORDER BY id LIMIT 1",
+}
+
+# (tool, kwargs): every tool, with the arguments a typical conversation uses
+CALLS = [
+    # Carrier exceptions
+    ("detect_exceptions", {}),
+    ("get_shipment_details", {"shipment_number": "{shipment_number}"}),
+    ("get_client_shipments", {"client_name": "TurtleBox"}),
+    ("get_exception_summary", {}),
+    ("get_tracking_info", {"tracking_number": "{tracking_number}"}),
+    # Email triage
+    ("get_unread_emails", {}),
+    ("get_email_by_id", {"email_id": "{email_id}"}),
+    ("search_emails", {"query": "delivery"}),
+    ("get_email_templates", {}),
+    ("get_inbox_summary", {}),
+    # Profitability
+    ("get_client_profitability", {}),
+    ("get_labor_summary", {}),
+    ("get_invoice_status", {}),
+    ("get_profitability_overview", {}),
+    ("get_service_breakdown", {}),
+    # Rate shopping
+    ("get_open_orders", {}),
+    ("get_rates_for_order", {"order_number": "{order_number}"}),
+    ("get_cheapest_rate", {"order_number": "{order_number}"}),
+    ("rate_shop_batch", {}),
+    ("get_savings_summary", {}),
+    # Chargeback defense
+    ("get_open_chargebacks", {}),
+    ("get_chargeback_details", {"chargeback_number": "{chargeback_number}"}),
+    ("get_evidence", {"chargeback_number": "{chargeback_number}"}),
+    ("get_expiring_chargebacks", {"days": 30}),
+    ("get_chargeback_summary", {}),
+    # LTL automation
+    ("get_ltl_quotes", {}),
+    ("compare_ltl_carriers", {"client_name": "TurtleBox"}),
+    ("get_booking_details", {"bol_number": "{bol_number}"}),
+    ("get_open_bookings", {}),
+    ("get_ltl_summary", {}),
+]
+
+
+def _label(tool: str, kwargs: dict) -> str:
+    args = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+    return f"{tool}({args})"
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (0 < q <= 1)."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _resolve(kwargs: dict, samples: dict) -> dict:
+    resolved = {}
+    for key, value in kwargs.items():
+        if isinstance(value, str) and value.startswith("{"):
+            value = samples[value.strip("{}")]
+        resolved[key] = value
+    return resolved
+
+
+# ── Child: time the calls against ALLPOINTS_DB_PATH ─────────────
+
+def _child(repeat: int) -> None:
+    """Benchmark every call; print the results as one JSON line."""
+    from mcp_servers import allpoints_server as server
+    from shared import metrics
+    from shared.database.connection import get_db_path
+
+    with sqlite3.connect(f"file:{get_db_path()}?mode=ro", uri=True) as conn:
+        samples = {name: conn.execute(sql).fetchone()[0] for name, sql in SAMPLES.items()}
+        db_rows = sum(
+            conn.execute(f"SELECT count(*) FROM [{name}]").fetchone()[0]
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND sql NOT LIKE '%VIRTUAL%'")
+            if not name.startswith("sqlite_")
+        )
+
+    async def run() -> list[dict]:
+        results = []
+        for tool, kwargs in CALLS:
+            fn = getattr(server, tool)
+            args = _resolve(kwargs, samples)
+            response = await fn(**args)  # warm the statement cache
+            metrics.reset()
+            timings = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                await fn(**args)
+                timings.append((time.perf_counter() - t0) * 1000)
+            phases = metrics.snapshot(tool)["tools"].get(tool, {})
+
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            await fn(**args)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results.append({
+                "call": _label(tool, kwargs),
+                "tool": tool,
+                "args": args,
+                "p50_ms": round(_percentile(timings, 0.50), 3),
+                "p95_ms": round(_percentile(timings, 0.95), 3),
+                "p99_ms": round(_percentile(timings, 0.99), 3),
+                "mean_ms": round(statistics.fmean(timings), 3),
+                "db_ms": phases.get("db_ms", {}).get("p50"),
+                "convert_ms": phases.get("convert_ms", {}).get("p50"),
+                "format_ms": phases.get("format_ms", {}).get("p50"),
+                "rows": phases.get("rows", {}).get("p50"),
+                "response_bytes": len(response.encode()),
+                "peak_alloc_kb": round(peak / 1024, 1),
+            })
+        return results
+
+    calls = asyncio.run(run())
+    print(json.dumps({
+        "db_rows": db_rows,
+        "calls": calls,
+        # ru_maxrss is KB on Linux, bytes on macOS
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1),
+    }))
+
+
+# ── Parent: build each scale, run the child, save and compare ───
+
+def _build_db(db_path: Path, scale: int, seed: int) -> float:
+    """Seed (or restore) the database for ``scale``; returns the seconds taken."""
+    env = dict(os.environ, ALLPOINTS_DB_PATH=str(db_path))
+    t0 = time.time()
+    subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / "setup_database.py"), "--reset", "--scale", str(scale), "--seed", str(seed)],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return time.time() - t0
+
+
+def _run_child(db_path: Path, repeat: int, cache: bool) -> dict:
+    env = dict(
+        os.environ,
+        ALLPOINTS_DB_PATH=str(db_path),
+        ALLPOINTS_RESULT_CACHE="1" if cache else "0",
+        ALLPOINTS_METRICS="1",
+    )
+    env.pop("ALLPOINTS_METRICS_FILE", None)
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--repeat", str(repeat)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_scale(scale: dict, baseline: dict | None) -> None:
+    compare = {c["call"]: c for c in baseline["calls"]} if baseline else {}
+    header = (
+        f"  {'tool call':<46} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        f" {'db ms':>7} {'fmt ms':>7} {'rows':>6} {'resp KB':>8} {'peak KB':>8}"
+    )
+    if compare:
+        header += f" {'p50 vs base':>12}"
+    width = len(header)
+    print(f"\nScale {scale['scale']}x: {scale['db_rows']:,} rows, max RSS {scale['max_rss_kb'] / 1024:.0f} MB")
+    print("-" * width)
+    print(header)
+    print("-" * width)
+    for c in scale["calls"]:
+        line = (
+            f"  {c['call'][:46]:<46} {c['p50_ms']:>8.3f} {c['p95_ms']:>8.3f} {c['p99_ms']:>8.3f}"
+            f" {c['db_ms'] or 0:>7.3f} {c['format_ms'] or 0:>7.3f} {c['rows'] or 0:>6.0f}"
+            f" {c['response_bytes'] / 1024:>8.1f} {c['peak_alloc_kb']:>8.1f}"
+        )
+        if c["call"] in compare:
+            line += f" {(c['p50_ms'] / compare[c['call']]['p50_ms'] - 1) * 100:>+11.1f}%"
+        print(line)
+    print("-" * width)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Every MCP tool's latency, memory and response size per data scale")
+    parser.add_argument("--scales", default="1,100,1000", help="Comma-separated scale factors (default 1,100,1000)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated data (default 42)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per tool (default 20)")
+    parser.add_argument("--cache", action="store_true", help="Leave the result cache on (measures cache hits)")
+    parser.add_argument(
+        "--db-dir", type=Path, default=Path(tempfile.gettempdir()) / "allpoints-bench",
+        help="Where the per-scale databases are built (default: <tmp>/allpoints-bench)",
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Results file (default: benchmarks/results/tools-<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to compare p50 latency against")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.repeat)
+        return
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    baseline_scales = {s["scale"]: s for s in baseline["scales"]} if baseline else {}
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "result_cache": args.cache,
+        "seed": args.seed,
+        "scales": [],
+    }
+
+    args.db_dir.mkdir(parents=True, exist_ok=True)
+    for factor in (int(s) for s in args.scales.split(",")):
+        db_path = args.db_dir / f"allpoints_x{factor}.db"
+        print(f"Building {factor}x database at {db_path}...", flush=True)
+        build_seconds = _build_db(db_path, factor, args.seed)
+        scale = {"scale": factor, "build_seconds": round(build_seconds, 1), **_run_child(db_path, args.repeat, args.cache)}
+        report["scales"].append(scale)
+        _print_scale(scale, baseline_scales.get(factor))
+
+    out = args.out or RESULTS_DIR / f"tools-{commit or 'unknown'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
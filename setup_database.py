@@ -2,11 +2,20 @@
 """One-command database setup: create schema + seed data.
 
 Usage:
-    python setup_database.py          # Create schema + seed
-    python setup_database.py --reset  # Drop and recreate
+    python setup_database.py                    # Create schema + seed
+    python setup_database.py --reset            # Drop and recreate
+    python setup_database.py --rebuild-rollups  # Check + fully rebuild summary rollups
+    python setup_database.py --reset --scale 100  # 100x the transactional rows, for load tests
+    python setup_database.py --restore          # Replace the database with a matching snapshot
+    python setup_database.py --snapshot         # Snapshot the existing database
+
+A fresh seed is saved as a compressed snapshot keyed on the schema hash,
+--scale and --seed (see shared/database/snapshots.py); later setups with the
+same schema and parameters on the same day restore it instead of reseeding.
 """
 
 import argparse
+import re
 import sqlite3
 import sys
 import time
@@ -17,21 +26,68 @@ PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from shared.database.connection import get_connection, get_db_path, get_schema_path
-from shared.database.seed_data import seed_all
+from shared.database import migrations, rollups, search, snapshots, versions
+from shared.database.seed_data import bulk_load, seed_all
+
+# CREATE INDEX statements in schema.sql; they run after the data is loaded
+INDEX_SQL = re.compile(r"^CREATE (?:UNIQUE )?INDEX\b[^;]*;", re.MULTILINE)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="All Points Agents — Database Setup")
     parser.add_argument("--reset", action="store_true", help="Drop and recreate the database")
+    parser.add_argument(
+        "--rebuild-rollups", action="store_true",
+        help="Report rollup drift, then rebuild every rollup table from the base tables",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1,
+        help="Multiply shipments, orders, emails and other transactional rows by N (default 1)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated data (default 42)")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes generating --scale shards in parallel (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--no-snapshot", action="store_true",
+        help="Seed from scratch instead of restoring a snapshot, and don't save one",
+    )
+    parser.add_argument(
+        "--restore", action="store_true",
+        help="Replace the database with the snapshot matching --scale/--seed",
+    )
+    parser.add_argument(
+        "--snapshot", action="store_true",
+        help="Save the existing database as the snapshot for --scale/--seed",
+    )
     args = parser.parse_args()
 
     db_path = get_db_path()
     schema_path = get_schema_path()
 
+    if args.restore:
+        snapshot = snapshots.find(args.scale, args.seed)
+        if snapshot is None:
+            sys.exit(f"No snapshot for scale {args.scale}, seed {args.seed} under the current schema")
+        _restore(snapshot, db_path)
+        return
+
+    if args.snapshot:
+        if not db_path.exists():
+            sys.exit(f"Database not found: {db_path}")
+        _save_snapshot(db_path, args.scale, args.seed)
+        return
+
     if args.reset and db_path.exists():
         print(f"Removing existing database: {db_path}")
         db_path.unlink()
 
+    if args.rebuild_rollups and db_path.exists() and not args.reset:
+        conn = get_connection(db_path)
+        _rebuild_rollups(conn)
+        return
+
     if db_path.exists() and not args.reset:
         print(f"Database already exists at {db_path}")
         print("Use --reset to drop and recreate.")
@@ -40,28 +96,50 @@ def main() -> None:
         _print_counts(conn)
         return
 
+    if not args.no_snapshot:
+        snapshot = snapshots.find(args.scale, args.seed)
+        if snapshot is not None:
+            _restore(snapshot, db_path)
+            return
+
     print(f"Creating database at {db_path}")
 
-    # Read and execute schema
+    # Read and execute schema; indexes are built once the tables are full,
+    # which is much faster than maintaining them row by row
     schema_sql = schema_path.read_text()
+    index_sql = "\n".join(INDEX_SQL.findall(schema_sql))
     conn = sqlite3.connect(str(db_path))
-    conn.executescript(schema_sql)
+    conn.executescript(INDEX_SQL.sub("", schema_sql))
     conn.close()
 
     # Seed data
-    print("Seeding data...")
+    print(f"Seeding data (scale {args.scale}, seed {args.seed})...")
     t0 = time.time()
     conn = get_connection(db_path)
-    counts = seed_all(conn)
+    with bulk_load(conn):
+        counts = seed_all(conn, scale=args.scale, seed=args.seed, workers=args.workers)
+        conn.executescript(index_sql)
     elapsed = time.time() - t0
 
     print(f"\nSeeding complete in {elapsed:.1f}s")
     print("-" * 40)
     for table, count in sorted(counts.items()):
-        print(f"  {table:<25} {count:>6}")
+        print(f"  {table:<25} {count:>9}")
     print("-" * 40)
     total = sum(counts.values())
-    print(f"  {'TOTAL':<25} {total:>6}")
+    print(f"  {'TOTAL':<25} {total:>9}")
+
+    # Summary rollups are built once from the seeded rows; triggers keep them current
+    print("\nBuilding summary rollups...")
+    rollups.install(conn)
+    # Change counters that invalidate cached tool results on writes
+    versions.install(conn)
+
+    print("Building email search index...")
+    search.install(conn)
+
+    applied = migrations.apply(conn)
+    print(f"Applied {len(applied)} schema migration(s)")
 
     # Verify foreign key integrity
     print("\nVerifying foreign key integrity...")
@@ -73,9 +151,53 @@ def main() -> None:
     else:
         print("  All foreign key constraints satisfied.")
 
+    if not args.no_snapshot:
+        _save_snapshot(db_path, args.scale, args.seed)
+
     print(f"\nDatabase ready: {db_path}")
 
 
+def _restore(snapshot: Path, db_path: Path) -> None:
+    """Restore ``snapshot`` over the database and show its counts."""
+    print(f"Restoring snapshot {snapshot.name}")
+    t0 = time.time()
+    snapshots.restore(snapshot, db_path)
+    print(f"Restored {db_path} in {time.time() - t0:.1f}s")
+    _print_counts(get_connection(db_path))
+
+
+def _save_snapshot(db_path: Path, scale: int, seed: int) -> None:
+    """Save the database as the snapshot for ``scale``/``seed`` and drop stale ones."""
+    print("\nSaving snapshot...")
+    t0 = time.time()
+    path = snapshots.save(db_path, scale, seed)
+    stale = snapshots.prune(keep=path)
+    size_mb = path.stat().st_size / (1024 * 1024)
+    print(f"  {path.name} ({size_mb:.1f} MB, {time.time() - t0:.1f}s)")
+    if stale:
+        print(f"  Removed {len(stale)} stale snapshot(s)")
+
+
+def _rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """Report rollups that drifted from the base tables, then rebuild them all."""
+    if not rollups.is_installed(conn):
+        print("Rollup tables missing; installing...")
+        rollups.install(conn)
+        return
+
+    drift = rollups.check(conn)
+    if drift:
+        print(f"  {len(drift)} rollup(s) out of date:")
+        for table, rows in sorted(drift.items()):
+            print(f"    {table:<25} {rows:>6} row(s) differ")
+    else:
+        print("  All rollups consistent.")
+
+    t0 = time.time()
+    rollups.rebuild(conn)
+    print(f"Rebuilt {len(rollups.REBUILD_QUERIES)} rollup tables in {time.time() - t0:.2f}s")
+
+
 def _print_counts(conn: sqlite3.Connection) -> None:
     """Print row counts for all tables."""
     tables = conn.execute(
@@ -84,6 +84,37 @@ PARCEL_SERVICE_CODES = {
     "usps_priority": "USPS Priority Mail",
 }
 
+# Service code -> carrier code whose contract prices it (carriers.code)
+PARCEL_SERVICE_CARRIERS = {
+    "ups_ground": "UPS",
+    "ups_ground_legacy": "UPS",
+    "ups_ground_new": "UPS2",
+    "fedex_ground": "FEDEX",
+    "fedex_home": "FEDEX",
+    "usps_priority": "USPS",
+}
+
+# Services that only deliver to residential addresses
+RESIDENTIAL_ONLY_SERVICES = {"fedex_home"}
+
+# Services live rating quotes by default: one per carrier account, like the
+# stored quotes. ups_ground_legacy and fedex_home are priced by the same
+# contracts as ups_ground and fedex_ground, so they would only add duplicates.
+RATED_PARCEL_SERVICES = ["ups_ground", "ups_ground_new", "fedex_ground", "usps_priority"]
+
+# ---------- Parcel rating ----------
+# Weight tiers: (upper bound lbs, rate at lower bound, per-lb above lower bound)
+PARCEL_RATE_TIERS = [
+    (1, 4.50, 0.00),
+    (5, 6.00, 0.80),
+    (20, 9.20, 0.55),
+    (50, 17.45, 0.45),
+    (float("inf"), 31.00, 0.40),
+]
+DIM_WEIGHT_DIVISOR = 139.0
+FUEL_SURCHARGE_PCT = 0.095
+RESIDENTIAL_SURCHARGE = 4.35
+
 # ---------- Zone multipliers (from Atlanta hub) ----------
 ZONE_MULTIPLIER_BASE = 0.08  # Each zone above 2 adds 8%
 
@@ -1,3 +1,27 @@
-from .connection import get_connection
+from .aio import QueryTimeout, fetch_all, fetch_one, fetch_value, run_query
+from .connection import (
+    ConnectionPool,
+    PoolTimeout,
+    add_connect_hook,
+    get_connection,
+    get_pool,
+    pool_stats,
+    read_connection,
+    write_connection,
+)
 
-__all__ = ["get_connection"]
+__all__ = [
+    "ConnectionPool",
+    "PoolTimeout",
+    "QueryTimeout",
+    "add_connect_hook",
+    "fetch_all",
+    "fetch_one",
+    "fetch_value",
+    "get_connection",
+    "get_pool",
+    "pool_stats",
+    "read_connection",
+    "run_query",
+    "write_connection",
+]
@@ -0,0 +1,121 @@
+"""Async query API over the pooled SQLite connections.
+
+Queries run on a dedicated thread pool sized to the connection pools, so an
+async MCP transport never blocks its event loop on sqlite3. Each call checks
+a connection out for just that query. Timeouts and task cancellation call
+``Connection.interrupt()``, which aborts the statement that is still running.
+Jobs run in a copy of the caller's context, so their time counts toward the
+calling tool's ``db`` phase (see ``shared/metrics.py``).
+"""
+
+import asyncio
+import contextvars
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Sequence, TypeVar
+
+from .. import metrics
+from .connection import POOL_MAX_SIZE, get_pool
+
+T = TypeVar("T")
+
+QUERY_TIMEOUT_SECONDS = float(os.environ.get("ALLPOINTS_DB_QUERY_TIMEOUT", "30"))
+
+# One thread per reader connection plus one for the writer.
+_executor = ThreadPoolExecutor(max_workers=POOL_MAX_SIZE + 1, thread_name_prefix="allpoints-db")
+
+
+class QueryTimeout(Exception):
+    """Raised when an async query exceeds its timeout and is interrupted."""
+
+
+class _Job:
+    """Tracks the connection a queued/running query uses so it can be interrupted."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._cancelled = False
+
+    def run(self, db_path: str | Path | None, readonly: bool, fn: Callable[[sqlite3.Connection], T]) -> T:
+        with get_pool(db_path, readonly=readonly).connection() as conn:
+            with self._lock:
+                if self._cancelled:
+                    raise sqlite3.OperationalError("interrupted")
+                self._conn = conn
+            try:
+                with metrics.phase("db"):
+                    return fn(conn)
+            finally:
+                with self._lock:
+                    self._conn = None
+
+    def interrupt(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+async def run_query(
+    fn: Callable[[sqlite3.Connection], T],
+    *,
+    db_path: str | Path | None = None,
+    readonly: bool = True,
+    timeout: float | None = QUERY_TIMEOUT_SECONDS,
+) -> T:
+    """Run ``fn(conn)`` on the DB executor with a pooled connection.
+
+    Use this when several statements must share one connection (e.g. a
+    read-modify-write with ``readonly=False``). For single statements prefer
+    ``fetch_all`` / ``fetch_one`` / ``fetch_value``.
+    """
+    job = _Job()
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(_executor, context.run, job.run, db_path, readonly, fn)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        job.interrupt()
+        raise QueryTimeout(f"Query exceeded {timeout:.1f}s and was interrupted") from None
+    except asyncio.CancelledError:
+        job.interrupt()
+        raise
+
+
+async def fetch_all(
+    sql: str,
+    params: Sequence[Any] = (),
+    *,
+    db_path: str | Path | None = None,
+    timeout: float | None = QUERY_TIMEOUT_SECONDS,
+) -> list[sqlite3.Row]:
+    """Execute a read query and return every row."""
+    return await run_query(lambda conn: conn.execute(sql, params).fetchall(), db_path=db_path, timeout=timeout)
+
+
+async def fetch_one(
+    sql: str,
+    params: Sequence[Any] = (),
+    *,
+    db_path: str | Path | None = None,
+    timeout: float | None = QUERY_TIMEOUT_SECONDS,
+) -> sqlite3.Row | None:
+    """Execute a read query and return the first row, or None."""
+    return await run_query(lambda conn: conn.execute(sql, params).fetchone(), db_path=db_path, timeout=timeout)
+
+
+async def fetch_value(
+    sql: str,
+    params: Sequence[Any] = (),
+    *,
+    db_path: str | Path | None = None,
+    timeout: float | None = QUERY_TIMEOUT_SECONDS,
+) -> Any:
+    """Execute a read query and return the first column of the first row."""
+    row = await fetch_one(sql, params, db_path=db_path, timeout=timeout)
+    return row[0] if row is not None else None
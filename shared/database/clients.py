@@ -0,0 +1,122 @@
+"""Partial client-name resolution.
+
+Tools accept a partial client name. Filtering with ``c.name LIKE '%x%'``
+can't use an index and drags a clients scan into every join against the
+fact tables. ``ClientResolver`` instead keeps the clients table in memory
+with a trigram index over ``clients.name``, resolves a partial name to a
+tuple of client IDs once, and the registry queries filter on the indexed
+``client_id`` columns (``client_id IN (SELECT value FROM json_each(?))``).
+
+Matching follows the old LIKE: a case-insensitive substring of the name.
+An exact (case-insensitive) client ``code`` such as ``"TB"`` also matches.
+
+The in-memory copy is reloaded when ``rollup_versions['clients']`` changes;
+triggers bump it on every insert/delete and on name/code updates. Resolved
+names are memoized in an LRU of ``ALLPOINTS_CLIENT_MATCH_CACHE_SIZE`` keys.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .aio import run_query
+from .connection import get_db_path
+
+_VERSION_SQL = "SELECT version FROM rollup_versions WHERE table_name = 'clients'"
+_CLIENTS_SQL = "SELECT id, name, code FROM clients"
+
+MATCH_CACHE_SIZE = int(os.environ.get("ALLPOINTS_CLIENT_MATCH_CACHE_SIZE", "4096"))
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ClientResolver:
+    """In-memory name/code index over the clients table of one database."""
+
+    def __init__(self, match_cache_size: int = MATCH_CACHE_SIZE):
+        self.version: int | None = None
+        self.match_cache_size = match_cache_size
+        self._names: dict[int, str] = {}
+        self._codes: dict[str, int] = {}
+        self._grams: dict[str, set[int]] = {}
+        self._matches: OrderedDict[str, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, rows, version: int | None) -> None:
+        """Replace the index with ``rows`` of ``(id, name, code)``."""
+        names, codes, grams = {}, {}, {}
+        for client_id, name, code in rows:
+            names[client_id] = name.casefold()
+            codes[code.casefold()] = client_id
+            for gram in _trigrams(names[client_id]):
+                grams.setdefault(gram, set()).add(client_id)
+        with self._lock:
+            self._names, self._codes, self._grams = names, codes, grams
+            self._matches = OrderedDict()
+            self.version = version
+
+    def match(self, text: str) -> tuple[int, ...]:
+        """Sorted IDs of clients whose name contains ``text`` or whose code equals it."""
+        key = text.casefold()
+        with self._lock:
+            cached = self._matches.get(key)
+            if cached is not None:
+                self._matches.move_to_end(key)
+                return cached
+
+            grams = _trigrams(key)
+            if grams:
+                # Only names that contain every trigram of the text can contain the text
+                candidates = set.intersection(*(self._grams.get(g, set()) for g in grams))
+            else:
+                candidates = self._names.keys()
+            ids = {cid for cid in candidates if key in self._names[cid]}
+            if key in self._codes:
+                ids.add(self._codes[key])
+
+            result = tuple(sorted(ids))
+            self._matches[key] = result
+            if len(self._matches) > self.match_cache_size:
+                self._matches.popitem(last=False)
+            return result
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        """Reload from ``conn`` if the clients table changed since the last load."""
+        try:
+            version = conn.execute(_VERSION_SQL).fetchone()[0]
+        except (sqlite3.OperationalError, TypeError):
+            version = None  # no rollup_versions yet: reload every time
+        if version is None or version != self.version:
+            self.load(conn.execute(_CLIENTS_SQL).fetchall(), version)
+
+
+_resolvers: dict[Path, ClientResolver] = {}
+
+
+def get_resolver(db_path: str | Path | None = None) -> ClientResolver:
+    """Return the shared resolver for ``db_path``."""
+    path = Path(db_path or get_db_path()).resolve()
+    resolver = _resolvers.get(path)
+    if resolver is None:
+        resolver = _resolvers[path] = ClientResolver()
+    return resolver
+
+
+async def resolve_client_ids(
+    client_name: str | None,
+    db_path: str | Path | None = None,
+) -> tuple[int, ...] | None:
+    """Resolve a partial client name to client IDs.
+
+    Returns ``None`` for an empty name (no filter) and ``()`` when nothing
+    matches, so the query filters everything out instead of nothing.
+    """
+    if not client_name:
+        return None
+    resolver = get_resolver(db_path)
+    await run_query(resolver.refresh, db_path=db_path)
+    return resolver.match(client_name)
@@ -1,39 +1,358 @@
-"""Thread-safe SQLite connection helper with WAL mode and foreign key enforcement."""
+"""Bounded SQLite connection pools with WAL mode and foreign key enforcement.
 
+Two pools exist per database file:
+
+- A reader pool (``query_only``) sized by ``ALLPOINTS_DB_POOL_MIN`` /
+  ``ALLPOINTS_DB_POOL_MAX`` so WAL readers can run concurrently.
+- A writer pool capped at one connection, because SQLite serializes writers
+  anyway and queueing in-process beats spinning on ``SQLITE_BUSY``.
+
+Connections are only probed for liveness after they have sat idle for
+``ALLPOINTS_DB_IDLE_CHECK`` seconds, instead of on every checkout. Opening
+and probing happen outside the pool's lock, on a slot reserved first, so
+other checkouts and returns never wait on that I/O.
+
+``get_connection()`` is the scripts' thread-local connection. It is opened
+outside the pools, so a long-lived one (``setup_database.py``) never holds
+the single writer slot.
+
+The database file defaults to ``shared/database/allpoints.db``; set
+``ALLPOINTS_DB_PATH`` to point the server and scripts at another file.
+
+Each connection keeps ``ALLPOINTS_DB_STATEMENT_CACHE`` compiled statements
+(sqlite3's default is 128). Callables registered with ``add_connect_hook``
+run on every new connection, e.g. to prepare the query registry.
+"""
+
+import os
 import sqlite3
 import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Callable, Iterator
 
-_DB_PATH = Path(__file__).resolve().parent / "allpoints.db"
+_DB_PATH = Path(os.environ.get("ALLPOINTS_DB_PATH") or Path(__file__).resolve().parent / "allpoints.db")
 _lock = threading.Lock()
 _local = threading.local()
 
+POOL_MIN_SIZE = int(os.environ.get("ALLPOINTS_DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.environ.get("ALLPOINTS_DB_POOL_MAX", "8"))
+POOL_TIMEOUT_SECONDS = float(os.environ.get("ALLPOINTS_DB_POOL_TIMEOUT", "10"))
+IDLE_CHECK_SECONDS = float(os.environ.get("ALLPOINTS_DB_IDLE_CHECK", "30"))
+STATEMENT_CACHE_SIZE = int(os.environ.get("ALLPOINTS_DB_STATEMENT_CACHE", "256"))
+BUSY_TIMEOUT_MS = 5000
 
-def get_connection(db_path: str | Path | None = None) -> sqlite3.Connection:
-    """Return a thread-local SQLite connection.
+_connect_hooks: list[Callable[[sqlite3.Connection], object]] = []
 
-    - Enables WAL journal mode for concurrent reads.
-    - Enforces foreign key constraints.
-    - Returns rows as sqlite3.Row (dict-like access).
+
+def add_connect_hook(hook: Callable[[sqlite3.Connection], object]) -> None:
+    """Run ``hook(conn)`` on every connection a pool opens from now on."""
+    if hook not in _connect_hooks:
+        _connect_hooks.append(hook)
+
+
+def _open_connection(db_path: str, *, readonly: bool, cached_statements: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=cached_statements)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON;")
+    for hook in _connect_hooks:
+        hook(conn)
+    return conn
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available within the timeout."""
+
+
+@dataclass
+class PoolStats:
+    """Counters for one pool. Wait times are in milliseconds."""
+    checkouts: int = 0
+    waits: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    timeouts: int = 0
+    health_checks: int = 0
+    discarded: int = 0
+    saturated_checkouts: int = 0
+    peak_in_use: int = 0
+
+
+class ConnectionPool:
+    """A bounded pool of SQLite connections for a single database file.
+
+    Checkout with ``with pool.connection() as conn:``. Connections are
+    created lazily up to ``max_size``; once the pool is saturated, callers
+    block for up to ``timeout`` seconds and then get ``PoolTimeout``.
     """
-    path = str(db_path or _DB_PATH)
 
-    conn = getattr(_local, "conn", None)
-    if conn is not None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        min_size: int = POOL_MIN_SIZE,
+        max_size: int = POOL_MAX_SIZE,
+        readonly: bool = False,
+        timeout: float = POOL_TIMEOUT_SECONDS,
+        idle_check_seconds: float = IDLE_CHECK_SECONDS,
+        cached_statements: int = STATEMENT_CACHE_SIZE,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.db_path = str(db_path)
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.readonly = readonly
+        self.timeout = timeout
+        self.idle_check_seconds = idle_check_seconds
+        self.cached_statements = cached_statements
+        self._idle: deque[tuple[sqlite3.Connection, float]] = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = PoolStats()
+
+        for _ in range(self.min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        return _open_connection(self.db_path, readonly=self.readonly, cached_statements=self.cached_statements)
+
+    def _is_alive(self, conn: sqlite3.Connection) -> bool:
         try:
             conn.execute("SELECT 1")
-            return conn
-        except sqlite3.ProgrammingError:
-            _local.conn = None
+            return True
+        except sqlite3.Error:
+            return False
 
-    with _lock:
-        conn = sqlite3.connect(path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode = WAL;")
-        conn.execute("PRAGMA foreign_keys = ON;")
-        _local.conn = conn
+    def acquire(self, timeout: float | None = None) -> sqlite3.Connection:
+        """Check out a connection, blocking while the pool is saturated."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        while True:
+            # Reserve a slot under the lock: an idle connection or room for a new one
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout(f"Pool for {self.db_path} is closed")
+
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        probe = time.monotonic() - last_used >= self.idle_check_seconds
+                        if probe:
+                            self._stats.health_checks += 1
+                        break
+
+                    if self._size < self.max_size:
+                        conn, probe = None, False
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats.timeouts += 1
+                        raise PoolTimeout(
+                            f"No connection available for {self.db_path} within {timeout:.1f}s "
+                            f"({self._in_use}/{self.max_size} in use)"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                self._in_use += 1
+
+            # Open or probe outside the lock
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    with self._cond:
+                        self._size -= 1
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+            elif probe and not self._is_alive(conn):
+                with self._cond:
+                    self._in_use -= 1
+                    self._discard(conn)
+                    self._cond.notify()
+                continue
+            break
+
+        with self._cond:
+            stats = self._stats
+            stats.checkouts += 1
+            stats.peak_in_use = max(stats.peak_in_use, self._in_use)
+            if self._in_use == self.max_size:
+                stats.saturated_checkouts += 1
+            if waited:
+                wait_ms = (time.monotonic() - start) * 1000
+                stats.waits += 1
+                stats.wait_ms_total += wait_ms
+                stats.wait_ms_max = max(stats.wait_ms_max, wait_ms)
         return conn
 
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            with self._cond:
+                self._in_use -= 1
+                self._discard(conn)
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        # Caller holds self._cond.
+        self._size -= 1
+        self._stats.discarded += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[sqlite3.Connection]:
+        """Context manager that checks a connection out and always returns it."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self) -> dict:
+        """Snapshot of pool size, utilisation, and wait/saturation counters."""
+        with self._cond:
+            snapshot = asdict(self._stats)
+            snapshot.update({
+                "db_path": self.db_path,
+                "readonly": self.readonly,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "max_size": self.max_size,
+                "saturation": round(self._in_use / self.max_size, 3),
+                "wait_ms_avg": round(snapshot["wait_ms_total"] / snapshot["waits"], 3) if snapshot["waits"] else 0.0,
+            })
+            return snapshot
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+
+_pools: dict[tuple[str, bool], ConnectionPool] = {}
+
+
+def get_pool(db_path: str | Path | None = None, *, readonly: bool = True) -> ConnectionPool:
+    """Return the shared reader (default) or writer pool for a database file."""
+    path = str(db_path or _DB_PATH)
+    key = (path, readonly)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if readonly:
+                pool = ConnectionPool(path, readonly=True)
+            else:
+                pool = ConnectionPool(path, min_size=0, max_size=1)
+            _pools[key] = pool
+        return pool
+
+
+@contextmanager
+def read_connection(db_path: str | Path | None = None) -> Iterator[sqlite3.Connection]:
+    """Check out a read-only connection for the duration of the block."""
+    with get_pool(db_path, readonly=True).connection() as conn:
+        yield conn
+
+
+@contextmanager
+def write_connection(db_path: str | Path | None = None) -> Iterator[sqlite3.Connection]:
+    """Check out the writer connection; commits on success, rolls back on error."""
+    with get_pool(db_path, readonly=False).connection() as conn:
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def pool_stats() -> dict[str, dict]:
+    """Stats for every pool opened in this process, keyed by '<path>:<role>'."""
+    return {
+        f"{path}:{'reader' if readonly else 'writer'}": pool.stats()
+        for (path, readonly), pool in list(_pools.items())
+    }
+
+
+class _ThreadConnection:
+    """A thread's own connection; closed when the thread exits."""
+
+    def __init__(self, path: str, readonly: bool, conn: sqlite3.Connection):
+        self.path = path
+        self.readonly = readonly
+        self.conn = conn
+        self._finalizer = weakref.finalize(self, conn.close)
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+def get_connection(db_path: str | Path | None = None, readonly: bool = False) -> sqlite3.Connection:
+    """Return a connection owned by the calling thread.
+
+    - Enables WAL journal mode for concurrent reads.
+    - Enforces foreign key constraints.
+    - Returns rows as sqlite3.Row (dict-like access).
+
+    The connection is opened outside the pools (it never takes the writer
+    slot) and is closed by ``close_connection()`` or when the thread exits.
+    Each thread gets its own, as before pooling. Prefer ``read_connection()``
+    / ``write_connection()`` for short per-call checkouts.
+    """
+    path = str(db_path or _DB_PATH)
+    current: _ThreadConnection | None = getattr(_local, "conn", None)
+    if current is not None:
+        if current.path == path and current.readonly == readonly:
+            return current.conn
+        current.close()
+        _local.conn = None
+
+    conn = _open_connection(path, readonly=readonly, cached_statements=STATEMENT_CACHE_SIZE)
+    _local.conn = _ThreadConnection(path, readonly, conn)
+    return conn
+
 
 def get_schema_path() -> Path:
     """Return the path to schema.sql."""
@@ -46,8 +365,8 @@ def get_db_path() -> Path:
 
 
 def close_connection() -> None:
-    """Close the thread-local connection if open."""
-    conn = getattr(_local, "conn", None)
-    if conn is not None:
-        conn.close()
+    """Close the calling thread's connection, if open."""
+    current: _ThreadConnection | None = getattr(_local, "conn", None)
+    if current is not None:
+        current.close()
         _local.conn = None
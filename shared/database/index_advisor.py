@@ -0,0 +1,145 @@
+"""Index advisor: EXPLAIN QUERY PLAN for every registered tool query.
+
+Flags the two plan steps that grow with table size:
+
+- ``full_scan``: a base table read start to finish (``SCAN t`` without a
+  covering index). Scans of rollup tables, FTS tables and ``json_each``
+  are expected and skipped, as are ordered scans of partial indexes, which
+  only hold the active rows.
+- ``temp_btree``: rows sorted/grouped in a temporary B-tree because no
+  index delivers them in order.
+
+Usage:
+    python -m shared.database.index_advisor                 # Report findings
+    python -m shared.database.index_advisor --with-pending  # ...and what pending migrations fix
+    python -m shared.database.index_advisor --db path/to/other.db
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import migrations, queries
+from .connection import get_db_path
+
+_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_SCAN = re.compile(r"^SCAN (\w+)(?: USING (COVERING )?INDEX (\w+))?")
+_EXPECTED_SCANS = ("rollup_", "json_each", "emails_fts")
+_SQL_KEYWORDS = {"on", "where", "left", "join", "group", "order", "limit", "inner", "cross"}
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One plan step worth looking at."""
+    query: str
+    kind: str       # "full_scan" | "temp_btree"
+    table: str      # base table (alias resolved), or "" for temp_btree
+    detail: str     # the EXPLAIN QUERY PLAN line
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """Plan lines for ``sql``; every placeholder is bound to NULL."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?"))]
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    aliases = {}
+    for table, alias in _ALIAS.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def advise(conn: sqlite3.Connection) -> list[Finding]:
+    """Findings for every registered query variant, in registry order."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    partial = {
+        row[0] for row in conn.execute(
+            "SELECT il.name FROM sqlite_master m, pragma_index_list(m.name) il "
+            "WHERE m.type = 'table' AND il.partial = 1"
+        )
+    }
+    findings = []
+    for name, sql in queries.all_variants():
+        try:
+            plan = explain(conn, sql)
+        except sqlite3.OperationalError:
+            continue  # references objects this database does not have
+        aliases = _aliases(sql)
+        for line in plan:
+            if "TEMP B-TREE" in line:
+                findings.append(Finding(name, "temp_btree", "", line))
+                continue
+            match = _SCAN.match(line)
+            if not match or match.group(2) or match.group(3) in partial:
+                continue
+            table = aliases.get(match.group(1), match.group(1))
+            if table in tables and not table.startswith(_EXPECTED_SCANS):
+                findings.append(Finding(name, "full_scan", table, line))
+    return findings
+
+
+def _print_findings(findings: list[Finding], row_counts: dict[str, int]) -> None:
+    by_query: dict[str, list[Finding]] = {}
+    for f in findings:
+        by_query.setdefault(f.query, []).append(f)
+    for query, items in by_query.items():
+        print(f"\n{query}")
+        for f in items:
+            rows = f"  ({row_counts.get(f.table, 0):,} rows)" if f.table else ""
+            print(f"  {f.kind:<11} {f.detail}{rows}")
+
+    scans = Counter(f.table for f in findings if f.kind == "full_scan")
+    print("\nFull scans by table:")
+    for table, count in sorted(scans.items(), key=lambda kv: (-row_counts.get(kv[0], 0), kv[0])):
+        print(f"  {table:<25} {count:>3} variant(s)  {row_counts.get(table, 0):>10,} rows")
+    print(f"\n{len(by_query)} of {sum(1 for _ in queries.all_variants())} query variants have findings")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report full scans and temp sorts in tool query plans")
+    parser.add_argument("--db", type=Path, default=None, help="Database file (default: the app database)")
+    parser.add_argument(
+        "--with-pending", action="store_true",
+        help="Also plan against an in-memory copy with pending migrations applied",
+    )
+    args = parser.parse_args(argv)
+
+    db_path = args.db or get_db_path()
+    if not db_path.exists():
+        print(f"Database not found: {db_path}", file=sys.stderr)
+        return 1
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    row_counts = {
+        table: conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+        for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND sql NOT LIKE 'CREATE VIRTUAL%'")
+    }
+    findings = advise(conn)
+    print(f"Index advisor: {db_path} (schema migration {migrations.current_version(conn)})")
+    _print_findings(findings, row_counts)
+
+    if args.with_pending:
+        todo = migrations.pending(conn)
+        if not todo:
+            print("\nNo pending migrations.")
+            return 0
+        copy = sqlite3.connect(":memory:")
+        conn.backup(copy)
+        applied = migrations.apply(copy)
+        after = set(advise(copy))
+        fixed, introduced = set(findings) - after, after - set(findings)
+        print(f"\nAfter {', '.join(applied)}: {len(fixed)} finding(s) resolved, {len(introduced)} new")
+        for mark, items in (("-", fixed), ("+", introduced)):
+            for f in sorted(items, key=lambda f: (f.query, f.detail)):
+                print(f"  {mark} {f.query:<45} {f.detail}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+-- 0001: Partial and covering indexes for the hot "active record" predicates
+-- Found by shared/database/index_advisor.py: these tool queries filtered on
+-- columns with no index (resolved_at, is_read) or on a low-selectivity
+-- status column, then sorted the result in a temp B-tree.
+
+-- detect_exceptions: active exceptions in display order
+CREATE INDEX IF NOT EXISTS idx_exceptions_active
+    ON exceptions(is_critical DESC, days_overdue DESC)
+    WHERE resolved_at IS NULL;
+
+-- get_unread_emails: newest unread first, with or without a category
+CREATE INDEX IF NOT EXISTS idx_emails_unread
+    ON emails(received_at)
+    WHERE is_read = 0;
+CREATE INDEX IF NOT EXISTS idx_emails_unread_category
+    ON emails(category, received_at)
+    WHERE is_read = 0;
+
+-- get_open_orders / rate_shop_batch: the awaiting queue in keyset order.
+-- Covers every column the live rating path reads, so a page never touches
+-- the orders table itself.
+CREATE INDEX IF NOT EXISTS idx_orders_awaiting
+    ON orders(order_date, id, client_id, order_number, total_weight_oz,
+              length_in, width_in, height_in, zone, is_residential)
+    WHERE status = 'awaiting_shipment';
+
+-- get_expiring_chargebacks: open chargebacks by deadline
+CREATE INDEX IF NOT EXISTS idx_chargebacks_open_deadline
+    ON chargebacks(dispute_deadline)
+    WHERE status IN ('new', 'reviewing');
+
+-- get_open_chargebacks: sorted by deadline, optionally for one status.
+-- Supersedes idx_chargebacks_status (a prefix of this index).
+CREATE INDEX IF NOT EXISTS idx_chargebacks_status_deadline
+    ON chargebacks(status, dispute_deadline);
+DROP INDEX IF EXISTS idx_chargebacks_status;
+
+-- Partial indexes only win over the single-column status indexes once the
+-- planner has statistics
+ANALYZE;
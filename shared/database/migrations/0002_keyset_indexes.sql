@@ -0,0 +1,29 @@
+-- 0002: Indexes in keyset order for the paginated list tools
+-- Each page resumes with (sort key, id) > (?, ?) and LIMIT ?. Without an
+-- index in that order, every page still sorts all matching rows in a temp
+-- B-tree; with one, a page reads only its own rows wherever it starts.
+-- The rowid is the implicit last index column, so (sort key) covers the id
+-- tie-breaker.
+
+-- get_client_shipments: one client's shipments, newest first
+CREATE INDEX IF NOT EXISTS idx_shipments_client_ship_date
+    ON shipments(client_id, ship_date);
+
+-- get_invoice_status: newest invoices first
+CREATE INDEX IF NOT EXISTS idx_invoices_date
+    ON invoices(invoice_date);
+
+-- get_open_chargebacks: all chargebacks by deadline (the open-only
+-- idx_chargebacks_open_deadline cannot serve an unfiltered status)
+CREATE INDEX IF NOT EXISTS idx_chargebacks_deadline
+    ON chargebacks(dispute_deadline);
+
+-- get_ltl_quotes: cheapest first
+CREATE INDEX IF NOT EXISTS idx_ltl_quotes_cost
+    ON ltl_quotes(total_cost);
+
+-- get_open_bookings: latest pickup first
+CREATE INDEX IF NOT EXISTS idx_ltl_bookings_pickup
+    ON ltl_bookings(pickup_date);
+
+ANALYZE;
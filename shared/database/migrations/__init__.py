@@ -0,0 +1,70 @@
+"""Numbered schema migrations for existing databases.
+
+``schema.sql`` is the baseline. Each ``NNNN_description.sql`` file in this
+directory is applied once, in order, inside a transaction, and
+``PRAGMA user_version`` records the number of the last one applied. New
+databases get every migration right after seeding (see setup_database.py);
+the MCP server applies pending ones on start unless
+``ALLPOINTS_DB_AUTO_MIGRATE=0``.
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+from ..connection import get_db_path, write_connection
+
+AUTO_MIGRATE = os.environ.get("ALLPOINTS_DB_AUTO_MIGRATE", "1") != "0"
+
+_FILENAME = re.compile(r"^(\d{4})_\w+\.sql$")
+
+
+def get_migrations_dir() -> Path:
+    """Return the directory holding the migration files."""
+    return Path(__file__).resolve().parent
+
+
+def available() -> list[tuple[int, Path]]:
+    """Every migration file as ``(number, path)``, in order."""
+    found = []
+    for path in get_migrations_dir().iterdir():
+        match = _FILENAME.match(path.name)
+        if match:
+            found.append((int(match.group(1)), path))
+    return sorted(found)
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Number of the last migration applied to ``conn``'s database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending(conn: sqlite3.Connection) -> list[tuple[int, Path]]:
+    """Migrations not yet applied to ``conn``'s database."""
+    version = current_version(conn)
+    return [(number, path) for number, path in available() if number > version]
+
+
+def apply(conn: sqlite3.Connection) -> list[str]:
+    """Apply every pending migration; returns the file names applied."""
+    applied = []
+    for number, path in pending(conn):
+        try:
+            conn.executescript(
+                f"BEGIN;\n{path.read_text()}\nPRAGMA user_version = {number};\nCOMMIT;"
+            )
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        applied.append(path.name)
+    return applied
+
+
+def ensure_applied(db_path: str | Path | None = None) -> list[str]:
+    """Apply pending migrations to an existing database (no-op if it is missing)."""
+    if not Path(db_path or get_db_path()).exists():
+        return []
+    with write_connection(db_path) as conn:
+        return apply(conn)
@@ -0,0 +1,827 @@
+"""Registry of every MCP tool query as named, fully parameterized variants.
+
+Tools used to grow SQL with ``query += " AND ..."``, so each combination of
+optional filters produced a different SQL text at call time. Here each query
+declares its optional filters up front and every filter combination is
+rendered once at import. A tool call always executes one of a fixed set of
+SQL strings, which keeps sqlite3's per-connection statement cache hot.
+
+``warm_up(conn)`` prepares every variant on a connection without running it,
+so the parse/plan cost is paid when a connection is created instead of on
+the first tool call after a deploy.
+"""
+
+import itertools
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+from .connection import add_connect_hook, get_db_path, get_pool
+from .search import BM25_WEIGHTS
+
+
+def _like(value: str) -> tuple:
+    return (f"%{value}%",)
+
+
+def _one(value: Any) -> tuple:
+    return (value,)
+
+
+def _json_array(values: Sequence[Any]) -> tuple:
+    return (json.dumps(list(values)),)
+
+
+@dataclass(frozen=True)
+class Filter:
+    """An optional (or required) clause appended between a query's base and tail."""
+    name: str
+    clause: str
+    params: Callable[[Any], Sequence[Any]] = _one
+    required: bool = False
+
+
+@dataclass(frozen=True)
+class Query:
+    """A named statement: ``base`` + active filter clauses + ``tail``."""
+    name: str
+    base: str
+    filters: tuple[Filter, ...] = ()
+    tail: str = ""
+    _variants: dict[tuple[str, ...], str] = field(default_factory=dict, compare=False, repr=False)
+
+    def __post_init__(self):
+        optional = [f.name for f in self.filters if not f.required]
+        for n in range(len(optional) + 1):
+            for combo in itertools.combinations(optional, n):
+                active = set(combo)
+                clauses = "".join(
+                    f.clause for f in self.filters if f.required or f.name in active
+                )
+                self._variants[combo] = self.base + clauses + self.tail
+
+    def bind(self, *tail_params: Any, **values: Any) -> tuple[str, list[Any]]:
+        """Pick the variant for the given filter values and build its params.
+
+        Filters whose value is ``""`` or ``None`` are left out (unless
+        required). Positional arguments bind the placeholders in ``tail``.
+        """
+        unknown = set(values) - {f.name for f in self.filters}
+        if unknown:
+            raise KeyError(f"{self.name}: unknown filter(s) {sorted(unknown)}")
+
+        active: list[str] = []
+        params: list[Any] = []
+        for f in self.filters:
+            value = values.get(f.name)
+            if f.required or value not in ("", None):
+                if not f.required:
+                    active.append(f.name)
+                params.extend(f.params(value))
+        params.extend(tail_params)
+        return self._variants[tuple(active)], params
+
+    @property
+    def sql(self) -> str:
+        """SQL text of the variant with no optional filters."""
+        return self._variants[()]
+
+    def variants(self) -> Iterator[tuple[str, str]]:
+        """Yield ``(variant_name, sql)`` for every filter combination."""
+        for combo, sql in self._variants.items():
+            yield (f"{self.name}[{','.join(combo)}]" if combo else self.name), sql
+
+
+REGISTRY: dict[str, Query] = {}
+
+
+def register(query: Query) -> Query:
+    if query.name in REGISTRY:
+        raise ValueError(f"Query {query.name!r} is already registered")
+    REGISTRY[query.name] = query
+    return query
+
+
+def get(name: str) -> Query:
+    return REGISTRY[name]
+
+
+def bind(name: str, *tail_params: Any, **values: Any) -> tuple[str, list[Any]]:
+    """Shorthand for ``get(name).bind(...)``."""
+    return REGISTRY[name].bind(*tail_params, **values)
+
+
+def sql(name: str) -> str:
+    """SQL text of a query that has no optional filters."""
+    return REGISTRY[name].sql
+
+
+def all_variants() -> Iterator[tuple[str, str]]:
+    """Yield ``(variant_name, sql)`` for every registered query variant."""
+    for query in REGISTRY.values():
+        yield from query.variants()
+
+
+def warm_up(conn: sqlite3.Connection) -> int:
+    """Prepare every variant on ``conn`` without executing it.
+
+    sqlite3 has no prepare-only call, so each statement is executed with a
+    progress handler that aborts before the first VM step. The compiled
+    statement stays in the connection's statement cache. Statements that
+    fail to compile (e.g. schema not created yet) are skipped. Returns the
+    number of statements prepared.
+    """
+    prepared = 0
+    conn.set_progress_handler(lambda: 1, 1)
+    try:
+        for _, text in all_variants():
+            try:
+                conn.execute(text, [None] * text.count("?"))
+            except sqlite3.OperationalError as e:
+                if "interrupted" not in str(e):
+                    continue
+            prepared += 1
+    finally:
+        conn.set_progress_handler(None, 0)
+    return prepared
+
+
+def install_warm_up(db_path: str | Path | None = None) -> int:
+    """Warm every pooled connection: call once at server start.
+
+    Registers ``warm_up`` as a connect hook so connections the pools open
+    later arrive prepared, then warms the reader pool's current connection.
+    Returns the number of statements prepared, or 0 if the database is missing.
+    """
+    add_connect_hook(warm_up)
+    if not Path(db_path or get_db_path()).exists():
+        return 0
+    with get_pool(db_path, readonly=True).connection() as conn:
+        return warm_up(conn)
+
+
+def _client_ids(column: str, required: bool = False, keyword: str = "AND") -> Filter:
+    """Filter ``column`` on client IDs from ``clients.resolve_client_ids``.
+
+    The IDs bind as one JSON array, so every ID count shares one SQL text.
+    """
+    return Filter(
+        "client_ids", f" {keyword} {column} IN (SELECT value FROM json_each(?))", _json_array, required,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CARRIER EXCEPTIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+register(Query(
+    "detect_exceptions",
+    """
+    SELECT s.shipment_number, s.order_number, c.name as client_name,
+           ct.first_name || ' ' || ct.last_name as customer_name, ct.email as customer_email,
+           cr.name as carrier, s.service, s.tracking_number, s.status as shipment_status,
+           s.ship_date, s.expected_delivery, s.weight_lbs, s.zone,
+           e.exception_type, e.exception_message, e.is_critical, e.days_overdue,
+           e.detected_at
+    FROM exceptions e
+    JOIN shipments s ON e.shipment_id = s.id
+    JOIN clients c ON s.client_id = c.id
+    JOIN carriers cr ON s.carrier_id = cr.id
+    LEFT JOIN contacts ct ON s.contact_id = ct.id
+    WHERE e.resolved_at IS NULL
+    """,
+    filters=(
+        Filter("status_filter", " AND e.exception_type = ?"),
+        _client_ids("s.client_id"),
+    ),
+    tail=" ORDER BY e.is_critical DESC, e.days_overdue DESC",
+))
+
+register(Query("get_shipment_details.shipment", """
+    SELECT s.*, c.name as client_name, cr.name as carrier_name,
+           ct.first_name || ' ' || ct.last_name as customer_name, ct.email as customer_email,
+           oa.city as origin_city, oa.state as origin_state,
+           da.city as dest_city, da.state as dest_state, da.zip_code as dest_zip
+    FROM shipments s
+    JOIN clients c ON s.client_id = c.id
+    JOIN carriers cr ON s.carrier_id = cr.id
+    LEFT JOIN contacts ct ON s.contact_id = ct.id
+    LEFT JOIN addresses oa ON s.origin_address_id = oa.id
+    LEFT JOIN addresses da ON s.dest_address_id = da.id
+    WHERE s.shipment_number = ?
+"""))
+
+register(Query("get_shipment_details.items", """
+    SELECT p.sku, p.name, si.quantity
+    FROM shipment_items si JOIN products p ON si.product_id = p.id
+    WHERE si.shipment_id = ?
+"""))
+
+register(Query("get_shipment_details.exceptions", """
+    SELECT exception_type, exception_message, is_critical, days_overdue, detected_at, resolved_at
+    FROM exceptions WHERE shipment_id = ?
+"""))
+
+register(Query(
+    "get_client_shipments",
+    """
+    SELECT s.shipment_number, s.order_number, s.tracking_number, cr.name as carrier,
+           s.service, s.status, s.ship_date, s.expected_delivery, s.actual_delivery,
+           s.weight_lbs, s.zone, s.id as _id
+    FROM shipments s
+    JOIN clients c ON s.client_id = c.id
+    JOIN carriers cr ON s.carrier_id = cr.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("s.client_id", required=True),
+        Filter("status", " AND s.status = ?"),
+        Filter("after", " AND (s.ship_date, s.id) < (?, ?)", tuple),
+    ),
+    tail=" ORDER BY s.ship_date DESC, s.id DESC LIMIT ?",
+))
+
+register(Query("get_exception_summary.by_type", """
+    SELECT exception_type, sum(exception_count) as count,
+           sum(critical_count) as critical_count
+    FROM rollup_exceptions
+    GROUP BY exception_type ORDER BY count DESC
+"""))
+
+register(Query("get_exception_summary.by_client", """
+    SELECT c.name as client_name, sum(r.exception_count) as exception_count,
+           sum(r.critical_count) as critical_count
+    FROM rollup_exceptions r
+    JOIN clients c ON r.client_id = c.id
+    GROUP BY c.name ORDER BY exception_count DESC
+"""))
+
+register(Query("get_exception_summary.by_carrier", """
+    SELECT cr.name as carrier, sum(r.exception_count) as exception_count
+    FROM rollup_exceptions r
+    JOIN carriers cr ON r.carrier_id = cr.id
+    GROUP BY cr.name ORDER BY exception_count DESC
+"""))
+
+register(Query("get_exception_summary.total",
+               "SELECT COALESCE(sum(exception_count), 0) FROM rollup_exceptions"))
+
+register(Query("get_exception_summary.critical",
+               "SELECT COALESCE(sum(critical_count), 0) FROM rollup_exceptions"))
+
+register(Query("get_tracking_info.shipment", """
+    SELECT s.shipment_number, s.order_number, cr.name as carrier, s.service,
+           s.tracking_number, s.status, s.ship_date, s.expected_delivery, s.actual_delivery,
+           c.name as client_name, s.weight_lbs, s.zone
+    FROM shipments s
+    JOIN clients c ON s.client_id = c.id
+    JOIN carriers cr ON s.carrier_id = cr.id
+    WHERE s.tracking_number = ?
+"""))
+
+register(Query("get_tracking_info.exceptions", """
+    SELECT exception_type, exception_message, is_critical, days_overdue
+    FROM exceptions WHERE shipment_id = (
+        SELECT id FROM shipments WHERE tracking_number = ?
+    ) AND resolved_at IS NULL
+"""))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EMAIL TRIAGE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+register(Query(
+    "get_unread_emails",
+    """
+    SELECT e.id, e.message_id, e.sender_name, e.sender_email, e.subject,
+           e.body_preview, e.received_at, e.category, e.confidence, e.action_taken,
+           c.name as client_name
+    FROM emails e
+    LEFT JOIN clients c ON e.client_id = c.id
+    WHERE e.is_read = 0
+    """,
+    filters=(
+        Filter("category", " AND e.category = ?"),
+        Filter("after", " AND (e.received_at, e.id) < (?, ?)", tuple),
+    ),
+    tail=" ORDER BY e.received_at DESC, e.id DESC LIMIT ?",
+))
+
+register(Query("get_email_by_id", """
+    SELECT e.*, c.name as client_name
+    FROM emails e
+    LEFT JOIN clients c ON e.client_id = c.id
+    WHERE e.id = ?
+"""))
+
+register(Query(
+    "get_email_templates",
+    "SELECT * FROM email_templates WHERE is_active = 1",
+    filters=(Filter("category", " AND category = ?"),),
+))
+
+_BM25 = f"bm25(emails_fts, {', '.join(map(str, BM25_WEIGHTS))})"
+
+register(Query(
+    "search_emails",
+    f"""
+    SELECT e.id, e.message_id, e.sender_name, e.sender_email, e.subject,
+           snippet(emails_fts, -1, '[', ']', '...', 16) as snippet,
+           e.received_at, e.is_read, e.category, e.action_taken,
+           c.name as client_name, round({_BM25}, 4) as score
+    FROM emails_fts
+    JOIN emails e ON e.id = emails_fts.rowid
+    LEFT JOIN clients c ON e.client_id = c.id
+    """,
+    filters=(
+        Filter("match", " WHERE emails_fts MATCH ?", required=True),
+        _client_ids("e.client_id"),
+        Filter("category", " AND e.category = ?"),
+        Filter("date_from", " AND e.received_at >= ?"),
+        Filter("date_to", " AND e.received_at < date(?, '+1 day')"),
+    ),
+    tail=f" ORDER BY {_BM25}, e.received_at DESC LIMIT ?",
+))
+
+register(Query("get_inbox_summary.total_unread",
+               "SELECT COALESCE(sum(email_count), 0) FROM rollup_emails WHERE is_read = 0"))
+
+register(Query("get_inbox_summary.by_category", """
+    SELECT NULLIF(r.category, '') as category, sum(r.email_count) as count,
+           sum(CASE WHEN r.is_read = 0 THEN r.email_count ELSE 0 END) as unread
+    FROM rollup_emails r
+    GROUP BY r.category ORDER BY count DESC
+"""))
+
+register(Query("get_inbox_summary.by_action", """
+    SELECT NULLIF(r.action_taken, '') as action_taken, sum(r.email_count) as count
+    FROM rollup_emails r
+    GROUP BY r.action_taken ORDER BY count DESC
+"""))
+
+register(Query("get_inbox_summary.needs_attention", """
+    SELECT COALESCE(sum(email_count), 0) FROM rollup_emails
+    WHERE is_read = 0 AND action_taken IN ('', 'pending')
+"""))
+
+register(Query("get_inbox_summary.auto_resolved",
+               "SELECT COALESCE(sum(email_count), 0) FROM rollup_emails WHERE action_taken = 'auto_resolved'"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROFITABILITY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+register(Query(
+    "get_client_profitability",
+    """
+    SELECT c.name as client_name,
+           COALESCE(inv.total_revenue, 0) as revenue,
+           COALESCE(inv.paid_amount, 0) as paid,
+           COALESCE(inv.pending_amount, 0) as pending,
+           COALESCE(inv.overdue_amount, 0) as overdue,
+           COALESCE(lab.total_cost, 0) as labor_cost,
+           COALESCE(lab.total_hours, 0) as labor_hours,
+           COALESCE(inv.total_revenue, 0) - COALESCE(lab.total_cost, 0) as profit
+    FROM clients c
+    LEFT JOIN (
+        SELECT client_id,
+               SUM(total_amount) as total_revenue,
+               SUM(CASE WHEN status = 'paid' THEN total_amount ELSE 0 END) as paid_amount,
+               SUM(CASE WHEN status = 'pending' THEN total_amount ELSE 0 END) as pending_amount,
+               SUM(CASE WHEN status = 'overdue' THEN total_amount ELSE 0 END) as overdue_amount
+        FROM invoices GROUP BY client_id
+    ) inv ON c.id = inv.client_id
+    LEFT JOIN (
+        SELECT le.client_id,
+               SUM(le.hours * e.hourly_rate) as total_cost,
+               SUM(le.hours) as total_hours
+        FROM labor_entries le JOIN employees e ON le.employee_id = e.id
+        GROUP BY le.client_id
+    ) lab ON c.id = lab.client_id
+    WHERE 1=1
+    """,
+    filters=(_client_ids("c.id"),),
+    tail=" ORDER BY profit DESC",
+))
+
+register(Query(
+    "get_labor_summary",
+    """
+    SELECT c.name as client_name, le.service_type,
+           round(SUM(le.hours), 1) as hours,
+           round(SUM(le.hours * e.hourly_rate), 2) as cost
+    FROM labor_entries le
+    JOIN employees e ON le.employee_id = e.id
+    JOIN clients c ON le.client_id = c.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("le.client_id"),
+        Filter("date_from", " AND le.work_date >= ?"),
+        Filter("date_to", " AND le.work_date <= ?"),
+    ),
+    tail=" GROUP BY c.name, le.service_type ORDER BY c.name, cost DESC",
+))
+
+register(Query(
+    "get_invoice_status",
+    """
+    SELECT c.name as client_name, i.invoice_number, i.invoice_date, i.due_date,
+           i.total_amount, i.status, i.payment_date, i.id as _id
+    FROM invoices i
+    JOIN clients c ON i.client_id = c.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("i.client_id"),
+        Filter("status", " AND i.status = ?"),
+        Filter("after", " AND (i.invoice_date, i.id) < (?, ?)", tuple),
+    ),
+    tail=" ORDER BY i.invoice_date DESC, i.id DESC LIMIT ?",
+))
+
+register(Query("get_profitability_overview.total_revenue",
+               "SELECT COALESCE(sum(amount_cents) / 100.0, 0) FROM rollup_invoices"))
+register(Query("get_profitability_overview.total_paid",
+               "SELECT COALESCE(sum(amount_cents) / 100.0, 0) FROM rollup_invoices WHERE status = 'paid'"))
+register(Query("get_profitability_overview.total_pending",
+               "SELECT COALESCE(sum(amount_cents) / 100.0, 0) FROM rollup_invoices WHERE status = 'pending'"))
+register(Query("get_profitability_overview.total_overdue",
+               "SELECT COALESCE(sum(amount_cents) / 100.0, 0) FROM rollup_invoices WHERE status = 'overdue'"))
+register(Query("get_profitability_overview.total_labor",
+               "SELECT COALESCE(SUM(r.hours * e.hourly_rate), 0) "
+               "FROM rollup_labor r JOIN employees e ON r.employee_id = e.id"))
+register(Query("get_profitability_overview.total_hours",
+               "SELECT COALESCE(SUM(hours), 0) FROM rollup_labor"))
+register(Query("get_profitability_overview.invoice_count",
+               "SELECT COALESCE(sum(invoice_count), 0) FROM rollup_invoices"))
+register(Query("get_profitability_overview.client_count",
+               "SELECT count(*) FROM clients"))
+
+register(Query(
+    "get_service_breakdown",
+    """
+    SELECT le.service_type,
+           round(SUM(le.hours), 1) as total_hours,
+           round(SUM(le.hours * e.hourly_rate), 2) as total_cost,
+           count(DISTINCT le.client_id) as client_count,
+           count(DISTINCT le.employee_id) as employee_count
+    FROM labor_entries le
+    JOIN employees e ON le.employee_id = e.id
+    """,
+    filters=(_client_ids("le.client_id", keyword="WHERE"),),
+    tail=" GROUP BY le.service_type ORDER BY total_cost DESC",
+))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RATE SHOPPING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+register(Query(
+    "get_open_orders",
+    """
+    SELECT o.order_number, c.name as client_name, o.order_date, o.status,
+           o.total_weight_oz, round(o.total_weight_oz / 16.0, 2) as weight_lbs,
+           o.zone, o.is_residential, o.declared_value,
+           p.sku, p.name as product_name, oi.quantity,
+           a.city as dest_city, a.state as dest_state, a.zip_code as dest_zip,
+           o.id as _id, oi.id as _item_id
+    FROM orders o
+    JOIN clients c ON o.client_id = c.id
+    JOIN order_items oi ON o.id = oi.order_id
+    JOIN products p ON oi.product_id = p.id
+    LEFT JOIN addresses a ON o.ship_to_address_id = a.id
+    WHERE o.status = 'awaiting_shipment'
+    """,
+    filters=(
+        _client_ids("o.client_id"),
+        Filter("after", " AND (o.order_date, o.id, oi.id) > (?, ?, ?)", tuple),
+    ),
+    tail=" ORDER BY o.order_date ASC, o.id ASC, oi.id ASC LIMIT ?",
+))
+
+register(Query("get_rates_for_order", """
+    SELECT r.service_name, cr.name as carrier, r.base_rate, r.fuel_surcharge,
+           r.residential_surcharge, r.total_amount, r.billable_weight_lbs,
+           r.delivery_days, r.delivery_date, r.zone, r.is_cheapest
+    FROM rates r
+    JOIN carriers cr ON r.carrier_id = cr.id
+    JOIN orders o ON r.order_id = o.id
+    WHERE o.order_number = ?
+    ORDER BY r.total_amount ASC
+"""))
+
+register(Query("parcel_carriers", """
+    SELECT code, name, pricing_factor
+    FROM carriers WHERE carrier_type IN ('parcel', 'both')
+"""))
+
+register(Query("get_rates_for_order.order", """
+    SELECT total_weight_oz, length_in, width_in, height_in, zone, is_residential
+    FROM orders WHERE order_number = ?
+"""))
+
+register(Query("get_cheapest_rate", """
+    SELECT r.service_name, cr.name as carrier, r.total_amount, r.delivery_days,
+           r.delivery_date, r.billable_weight_lbs, r.zone
+    FROM rates r
+    JOIN carriers cr ON r.carrier_id = cr.id
+    JOIN orders o ON r.order_id = o.id
+    WHERE o.order_number = ? AND r.is_cheapest = 1
+"""))
+
+# One pass per page: the CTE picks the page of open orders (keyset on
+# order_date, id), the window ranks each order's rates, and the join keeps
+# only the cheapest. Orders without rates come back with NULL rate columns.
+register(Query(
+    "rate_shop_batch",
+    """
+    WITH batch AS (
+        SELECT o.id, o.order_number, o.order_date, c.name as client_name,
+               round(o.total_weight_oz / 16.0, 2) as weight_lbs, o.zone
+        FROM orders o
+        JOIN clients c ON o.client_id = c.id
+        WHERE o.status = 'awaiting_shipment'
+    """,
+    filters=(
+        _client_ids("o.client_id"),
+        Filter("after", " AND (o.order_date, o.id) > (?, ?)", tuple),
+    ),
+    tail="""
+        ORDER BY o.order_date ASC, o.id ASC LIMIT ?
+    ),
+    ranked AS (
+        SELECT r.order_id, cr.name as carrier, r.service_name, r.total_amount,
+               row_number() OVER (PARTITION BY r.order_id ORDER BY r.total_amount ASC, r.id ASC) as rn,
+               max(r.total_amount) OVER (PARTITION BY r.order_id) as max_amount
+        FROM rates r
+        JOIN carriers cr ON r.carrier_id = cr.id
+        WHERE r.order_id IN (SELECT id FROM batch)
+    )
+    SELECT b.id, b.order_date, b.order_number, b.client_name, b.weight_lbs, b.zone,
+           k.carrier, k.service_name, k.total_amount, k.max_amount
+    FROM batch b
+    LEFT JOIN ranked k ON k.order_id = b.id AND k.rn = 1
+    ORDER BY b.order_date ASC, b.id ASC
+    """,
+))
+
+# Same page of open orders as above, with the inputs the rating engine needs.
+register(Query(
+    "rate_shop_batch.live",
+    """
+    SELECT o.id, o.order_date, o.order_number, c.name as client_name,
+           round(o.total_weight_oz / 16.0, 2) as weight_lbs, o.zone,
+           o.total_weight_oz, o.length_in, o.width_in, o.height_in, o.is_residential
+    FROM orders o
+    JOIN clients c ON o.client_id = c.id
+    WHERE o.status = 'awaiting_shipment'
+    """,
+    filters=(
+        _client_ids("o.client_id"),
+        Filter("after", " AND (o.order_date, o.id) > (?, ?)", tuple),
+    ),
+    tail=" ORDER BY o.order_date ASC, o.id ASC LIMIT ?",
+))
+
+register(Query("get_savings_summary.open_count",
+               "SELECT COALESCE(sum(order_count), 0) FROM rollup_orders WHERE status = 'awaiting_shipment'"))
+register(Query("get_savings_summary.shipped_count",
+               "SELECT COALESCE(sum(order_count), 0) FROM rollup_orders WHERE status = 'shipped'"))
+register(Query("get_savings_summary.label_count",
+               "SELECT COALESCE(sum(row_count), 0) FROM rollup_counts WHERE table_name = 'labels'"))
+
+register(Query("get_savings_summary.savings", """
+    SELECT COALESCE(sum(rated_count), 0) as rated_orders,
+           COALESCE(sum(spread_cents) / 100.0, 0) as total_savings
+    FROM rollup_orders WHERE status = 'awaiting_shipment'
+"""))
+
+register(Query("get_savings_summary.live_orders", """
+    SELECT total_weight_oz, length_in, width_in, height_in, zone, is_residential
+    FROM orders WHERE status = 'awaiting_shipment'
+"""))
+
+register(Query("get_savings_summary.carrier_wins", """
+    SELECT cr.name as carrier, sum(r.cheapest_wins) as cheapest_wins
+    FROM rollup_rate_carriers r
+    JOIN carriers cr ON r.carrier_id = cr.id
+    GROUP BY cr.name ORDER BY cheapest_wins DESC
+"""))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CHARGEBACK DEFENSE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+register(Query(
+    "get_open_chargebacks",
+    """
+    SELECT cb.chargeback_number, cb.po_number, cb.violation_code,
+           cb.chargeback_amount, cb.chargeback_date, cb.dispute_deadline,
+           cb.status, cb.ship_date, cb.delivery_date, cb.tracking_number,
+           cb.units_shipped, cb.cartons, cb.pallets,
+           c.name as client_name, r.name as retailer_name, r.portal_name,
+           cr.name as carrier_name,
+           julianday(cb.dispute_deadline) - julianday('now') as days_until_deadline,
+           cb.id as _id
+    FROM chargebacks cb
+    JOIN clients c ON cb.client_id = c.id
+    JOIN retailers r ON cb.retailer_id = r.id
+    LEFT JOIN carriers cr ON cb.carrier_id = cr.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("cb.client_id"),
+        Filter("retailer", " AND r.name LIKE ?", _like),
+        Filter("status", " AND cb.status = ?"),
+        Filter("after", " AND (cb.dispute_deadline, cb.id) > (?, ?)", tuple),
+    ),
+    tail=" ORDER BY cb.dispute_deadline ASC, cb.id ASC LIMIT ?",
+))
+
+register(Query("get_chargeback_details.chargeback", """
+    SELECT cb.*, c.name as client_name, r.name as retailer_name, r.portal_name,
+           r.dispute_window_days, cr.name as carrier_name,
+           julianday(cb.dispute_deadline) - julianday('now') as days_until_deadline
+    FROM chargebacks cb
+    JOIN clients c ON cb.client_id = c.id
+    JOIN retailers r ON cb.retailer_id = r.id
+    LEFT JOIN carriers cr ON cb.carrier_id = cr.id
+    WHERE cb.chargeback_number = ?
+"""))
+
+register(Query("get_chargeback_details.evidence", """
+    SELECT evidence_type, file_name, description, source, is_auto_compiled, url
+    FROM evidence_files WHERE chargeback_id = ?
+    ORDER BY evidence_type
+"""))
+
+register(Query("get_chargeback_details.disputes", """
+    SELECT dispute_reference, letter_subject, status, evidence_count, submitted_at
+    FROM disputes WHERE chargeback_id = ?
+    ORDER BY created_at DESC
+"""))
+
+register(Query("get_evidence", """
+    SELECT ef.evidence_type, ef.file_name, ef.description, ef.source,
+           ef.is_auto_compiled, ef.url, cb.chargeback_number
+    FROM evidence_files ef
+    JOIN chargebacks cb ON ef.chargeback_id = cb.id
+    WHERE cb.chargeback_number = ?
+    ORDER BY ef.evidence_type
+"""))
+
+# The plain date range lets idx_chargebacks_open_deadline serve the lookup;
+# the julianday terms keep the exact (time-of-day aware) window.
+register(Query("get_expiring_chargebacks", """
+    SELECT cb.chargeback_number, cb.po_number, cb.violation_code,
+           cb.chargeback_amount, cb.dispute_deadline, cb.status,
+           c.name as client_name, r.name as retailer_name,
+           round(julianday(cb.dispute_deadline) - julianday('now'), 0) as days_remaining
+    FROM chargebacks cb
+    JOIN clients c ON cb.client_id = c.id
+    JOIN retailers r ON cb.retailer_id = r.id
+    WHERE cb.status IN ('new', 'reviewing')
+      AND cb.dispute_deadline >= date('now')
+      AND cb.dispute_deadline < date('now', (? + 1) || ' days')
+      AND julianday(cb.dispute_deadline) - julianday('now') <= ?
+      AND julianday(cb.dispute_deadline) - julianday('now') >= 0
+    ORDER BY cb.dispute_deadline ASC
+"""))
+
+register(Query("get_chargeback_summary.by_status", """
+    SELECT status, sum(chargeback_count) as count, round(sum(amount_cents) / 100.0, 2) as total_amount
+    FROM rollup_chargebacks GROUP BY status ORDER BY count DESC
+"""))
+
+register(Query("get_chargeback_summary.by_retailer", """
+    SELECT r.name as retailer, sum(rc.chargeback_count) as count,
+           round(sum(rc.amount_cents) / 100.0, 2) as total_amount
+    FROM rollup_chargebacks rc JOIN retailers r ON rc.retailer_id = r.id
+    GROUP BY r.name ORDER BY total_amount DESC
+"""))
+
+register(Query("get_chargeback_summary.by_violation", """
+    SELECT violation_code, sum(chargeback_count) as count,
+           round(sum(amount_cents) / 100.0, 2) as total_amount
+    FROM rollup_chargebacks GROUP BY violation_code ORDER BY total_amount DESC
+"""))
+
+register(Query("get_chargeback_summary.total",
+               "SELECT COALESCE(sum(chargeback_count), 0) FROM rollup_chargebacks"))
+register(Query("get_chargeback_summary.total_amount",
+               "SELECT COALESCE(sum(amount_cents) / 100.0, 0) FROM rollup_chargebacks"))
+register(Query("get_chargeback_summary.won",
+               "SELECT COALESCE(sum(chargeback_count), 0) FROM rollup_chargebacks WHERE status = 'won'"))
+register(Query("get_chargeback_summary.disputed",
+               "SELECT COALESCE(sum(chargeback_count), 0) FROM rollup_chargebacks "
+               "WHERE status IN ('disputed', 'won', 'lost')"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LTL AUTOMATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+register(Query(
+    "get_ltl_quotes",
+    """
+    SELECT q.quote_number, c.name as client_name, cr.name as carrier,
+           q.origin_zip, q.destination_zip, q.weight_lbs, q.freight_class,
+           q.pieces, q.base_rate, q.fuel_surcharge, q.accessorials,
+           q.total_cost, q.transit_days, q.estimated_delivery,
+           q.service_level, q.valid_until, q.is_cheapest, q.id as _id
+    FROM ltl_quotes q
+    JOIN clients c ON q.client_id = c.id
+    JOIN carriers cr ON q.carrier_id = cr.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("q.client_id"),
+        Filter("destination_zip", " AND q.destination_zip = ?"),
+        Filter("after", " AND (q.total_cost, q.id) > (?, ?)", tuple),
+    ),
+    tail=" ORDER BY q.total_cost ASC, q.id ASC LIMIT ?",
+))
+
+register(Query(
+    "compare_ltl_carriers",
+    """
+    SELECT q.destination_zip, cr.name as carrier, q.quote_number,
+           q.weight_lbs, q.freight_class, q.total_cost, q.transit_days,
+           q.is_cheapest
+    FROM ltl_quotes q
+    JOIN clients c ON q.client_id = c.id
+    JOIN carriers cr ON q.carrier_id = cr.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("q.client_id", required=True),
+        Filter("destination_zip", " AND q.destination_zip = ?"),
+    ),
+    tail=" ORDER BY q.destination_zip, q.total_cost ASC",
+))
+
+register(Query("get_booking_details", """
+    SELECT b.*, q.quote_number, q.weight_lbs, q.freight_class, q.pieces,
+           q.total_cost, q.transit_days, q.origin_zip, q.destination_zip,
+           cr.name as carrier, c.name as client_name
+    FROM ltl_bookings b
+    JOIN ltl_quotes q ON b.quote_id = q.id
+    JOIN carriers cr ON q.carrier_id = cr.id
+    JOIN clients c ON q.client_id = c.id
+    WHERE b.bol_number = ?
+"""))
+
+register(Query(
+    "get_open_bookings",
+    """
+    SELECT b.bol_number, b.pro_number, b.confirmation_number, b.status,
+           b.pickup_date, b.pickup_window, b.consignee_name,
+           cr.name as carrier, c.name as client_name,
+           q.weight_lbs, q.freight_class, q.total_cost,
+           q.origin_zip, q.destination_zip, q.transit_days, b.id as _id
+    FROM ltl_bookings b
+    JOIN ltl_quotes q ON b.quote_id = q.id
+    JOIN carriers cr ON q.carrier_id = cr.id
+    JOIN clients c ON q.client_id = c.id
+    WHERE 1=1
+    """,
+    filters=(
+        _client_ids("q.client_id"),
+        Filter("status", " AND b.status = ?"),
+        Filter("after", " AND (b.pickup_date, b.id) < (?, ?)", tuple),
+    ),
+    tail=" ORDER BY b.pickup_date DESC, b.id DESC LIMIT ?",
+))
+
+register(Query("get_ltl_summary.total_quotes",
+               "SELECT COALESCE(sum(quote_count), 0) FROM rollup_ltl_carriers"))
+register(Query("get_ltl_summary.total_bookings",
+               "SELECT COALESCE(sum(booking_count), 0) FROM rollup_ltl_bookings"))
+register(Query("get_ltl_summary.total_spend",
+               "SELECT COALESCE(sum(spend_cents) / 100.0, 0) FROM rollup_ltl_bookings"))
+
+register(Query("get_ltl_summary.by_carrier", """
+    SELECT cr.name as carrier, sum(r.quote_count) as quote_count,
+           round(sum(r.cost_cents) / 100.0 / sum(r.quote_count), 2) as avg_cost,
+           sum(r.cheapest_wins) as cheapest_wins
+    FROM rollup_ltl_carriers r
+    JOIN carriers cr ON r.carrier_id = cr.id
+    GROUP BY cr.name ORDER BY cheapest_wins DESC
+"""))
+
+register(Query("get_ltl_summary.by_status", """
+    SELECT status, booking_count as count
+    FROM rollup_ltl_bookings ORDER BY count DESC
+"""))
+
+register(Query("get_ltl_summary.avg_savings", """
+    SELECT round(avg(max_cost - min_cost), 2)
+    FROM rollup_ltl_lanes WHERE quote_count > 1
+"""))
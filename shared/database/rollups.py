@@ -0,0 +1,155 @@
+"""Rollup tables behind the *_summary tools.
+
+``rollups.sql`` defines one small table per summary plus the triggers that
+keep them current on every insert/update/delete, so summary tools read
+O(groups) rows instead of re-aggregating the base tables on every poll.
+
+``rebuild()`` recomputes every rollup from the base tables. It is the
+force-refresh path, run after bulk loads that bypass triggers and for
+consistency checks. ``check()`` reports rollups that disagree with a fresh
+aggregate without changing anything.
+
+``rollup_versions`` is not an aggregate: it holds a change counter per
+table for data cached in process (see ``clients.py`` and ``versions.py``).
+Triggers bump it and ``rebuild()`` bumps it too, since bulk loads may have
+bypassed the triggers.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from .connection import get_db_path, write_connection
+
+_CENTS = "CAST(round({} * 100) AS INTEGER)"
+
+# Full-recompute query per rollup, in column order. rollup_orders is computed
+# from rates directly so it does not depend on rollup_order_rates being fresh.
+REBUILD_QUERIES: dict[str, str] = {
+    "rollup_exceptions": """
+        SELECT e.exception_type, s.client_id, s.carrier_id, count(*), sum(e.is_critical)
+        FROM exceptions e JOIN shipments s ON e.shipment_id = s.id
+        WHERE e.resolved_at IS NULL
+        GROUP BY e.exception_type, s.client_id, s.carrier_id
+    """,
+    "rollup_emails": """
+        SELECT COALESCE(category, ''), COALESCE(action_taken, ''), is_read, count(*)
+        FROM emails GROUP BY 1, 2, 3
+    """,
+    "rollup_chargebacks": f"""
+        SELECT status, retailer_id, violation_code, count(*), sum({_CENTS.format("chargeback_amount")})
+        FROM chargebacks GROUP BY status, retailer_id, violation_code
+    """,
+    "rollup_ltl_carriers": f"""
+        SELECT carrier_id, count(*), sum({_CENTS.format("total_cost")}), sum(is_cheapest)
+        FROM ltl_quotes GROUP BY carrier_id
+    """,
+    "rollup_ltl_lanes": """
+        SELECT client_id, destination_zip, count(*), min(total_cost), max(total_cost)
+        FROM ltl_quotes GROUP BY client_id, destination_zip
+    """,
+    "rollup_ltl_bookings": f"""
+        SELECT b.status, count(*), sum({_CENTS.format("q.total_cost")})
+        FROM ltl_bookings b JOIN ltl_quotes q ON b.quote_id = q.id
+        GROUP BY b.status
+    """,
+    "rollup_order_rates": """
+        SELECT order_id, count(*), min(total_amount), max(total_amount)
+        FROM rates GROUP BY order_id
+    """,
+    "rollup_orders": f"""
+        SELECT o.status, count(*), count(r.order_id),
+               COALESCE(sum({_CENTS.format("(r.max_total - r.min_total)")}), 0)
+        FROM orders o
+        LEFT JOIN (
+            SELECT order_id, min(total_amount) as min_total, max(total_amount) as max_total
+            FROM rates GROUP BY order_id
+        ) r ON r.order_id = o.id
+        GROUP BY o.status
+    """,
+    "rollup_rate_carriers": """
+        SELECT carrier_id, count(*) FROM rates WHERE is_cheapest = 1 GROUP BY carrier_id
+    """,
+    "rollup_counts": """
+        SELECT 'labels', count(*) FROM labels
+    """,
+    "rollup_invoices": f"""
+        SELECT status, count(*), sum({_CENTS.format("total_amount")})
+        FROM invoices GROUP BY status
+    """,
+    "rollup_labor": """
+        SELECT employee_id, count(*), sum(hours) FROM labor_entries GROUP BY employee_id
+    """,
+}
+
+
+# Every table rollups.sql creates
+TABLES = (*REBUILD_QUERIES, "rollup_versions")
+
+
+def get_rollups_path() -> Path:
+    """Return the path to rollups.sql."""
+    return Path(__file__).resolve().parent / "rollups.sql"
+
+
+def is_installed(conn: sqlite3.Connection) -> bool:
+    """True if every rollup table exists in the database."""
+    found = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'rollup_%'"
+        )
+    }
+    return found >= set(TABLES)
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Recompute every rollup from the base tables and commit."""
+    with conn:
+        for table, query in REBUILD_QUERIES.items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"INSERT INTO {table} {query}")
+        conn.execute("UPDATE rollup_versions SET version = version + 1")
+
+
+def install(conn: sqlite3.Connection) -> None:
+    """Create the rollup tables and triggers (idempotent), then rebuild them."""
+    conn.executescript(get_rollups_path().read_text())
+    rebuild(conn)
+
+
+def check(conn: sqlite3.Connection) -> dict[str, int]:
+    """Compare each rollup against a fresh aggregate.
+
+    Returns ``{table: mismatched_rows}`` for rollups that have drifted; an
+    empty dict means everything is consistent. REAL columns are compared to
+    6 decimal places so float noise from incremental updates is ignored.
+    """
+    drift = {}
+    for table, query in REBUILD_QUERIES.items():
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        names = ", ".join(col[1] for col in columns)
+        projection = ", ".join(
+            f"round({col[1]}, 6)" if col[2].upper() == "REAL" else col[1] for col in columns
+        )
+        mismatched = conn.execute(f"""
+            WITH fresh({names}) AS ({query})
+            SELECT (SELECT count(*) FROM (SELECT {projection} FROM fresh EXCEPT SELECT {projection} FROM {table}))
+                 + (SELECT count(*) FROM (SELECT {projection} FROM {table} EXCEPT SELECT {projection} FROM fresh))
+        """).fetchone()[0]
+        if mismatched:
+            drift[table] = mismatched
+    return drift
+
+
+def ensure_installed(db_path: str | Path | None = None) -> bool:
+    """Install rollups into an existing database that predates them.
+
+    Returns True if they were installed now, False if already present or the
+    database does not exist yet.
+    """
+    if not Path(db_path or get_db_path()).exists():
+        return False
+    with write_connection(db_path) as conn:
+        if is_installed(conn):
+            return False
+        install(conn)
+    return True
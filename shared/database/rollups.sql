@@ -0,0 +1,583 @@
+-- All Points Agents - Rollup tables for the *_summary tools
+-- Each rollup holds one row per group and is kept current by the triggers
+-- below, so the summary tools aggregate O(groups) rows instead of scanning
+-- the base tables. Money is stored in integer cents so incremental updates
+-- never drift. Nullable group keys are stored as '' (read back with NULLIF).
+--
+-- Applied by shared/database/rollups.py; the rebuild queries live there too.
+
+-- ============================================================
+-- ROLLUP TABLES
+-- ============================================================
+
+-- Active (unresolved) exceptions by type x client x carrier
+CREATE TABLE IF NOT EXISTS rollup_exceptions (
+    exception_type  TEXT    NOT NULL,
+    client_id       INTEGER NOT NULL,
+    carrier_id      INTEGER NOT NULL,
+    exception_count INTEGER NOT NULL DEFAULT 0,
+    critical_count  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (exception_type, client_id, carrier_id)
+) WITHOUT ROWID;
+
+-- Emails by category x action x read flag
+CREATE TABLE IF NOT EXISTS rollup_emails (
+    category        TEXT    NOT NULL,               -- '' = uncategorized
+    action_taken    TEXT    NOT NULL,               -- '' = no action
+    is_read         INTEGER NOT NULL,
+    email_count     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (category, action_taken, is_read)
+) WITHOUT ROWID;
+
+-- Chargebacks by status x retailer x violation
+CREATE TABLE IF NOT EXISTS rollup_chargebacks (
+    status          TEXT    NOT NULL,
+    retailer_id     INTEGER NOT NULL,
+    violation_code  TEXT    NOT NULL,
+    chargeback_count INTEGER NOT NULL DEFAULT 0,
+    amount_cents    INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (status, retailer_id, violation_code)
+) WITHOUT ROWID;
+
+-- LTL quotes by carrier
+CREATE TABLE IF NOT EXISTS rollup_ltl_carriers (
+    carrier_id      INTEGER NOT NULL PRIMARY KEY,
+    quote_count     INTEGER NOT NULL DEFAULT 0,
+    cost_cents      INTEGER NOT NULL DEFAULT 0,
+    cheapest_wins   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- LTL lanes (client x destination) with cost spread; refreshed per lane
+CREATE TABLE IF NOT EXISTS rollup_ltl_lanes (
+    client_id       INTEGER NOT NULL,
+    destination_zip TEXT    NOT NULL,
+    quote_count     INTEGER NOT NULL,
+    min_cost        REAL    NOT NULL,
+    max_cost        REAL    NOT NULL,
+    PRIMARY KEY (client_id, destination_zip)
+) WITHOUT ROWID;
+
+-- LTL bookings by status with booked spend
+CREATE TABLE IF NOT EXISTS rollup_ltl_bookings (
+    status          TEXT    NOT NULL PRIMARY KEY,
+    booking_count   INTEGER NOT NULL DEFAULT 0,
+    spend_cents     INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Rate spread per order; refreshed per order
+CREATE TABLE IF NOT EXISTS rollup_order_rates (
+    order_id        INTEGER NOT NULL PRIMARY KEY,
+    rate_count      INTEGER NOT NULL,
+    min_total       REAL    NOT NULL,
+    max_total       REAL    NOT NULL
+) WITHOUT ROWID;
+
+-- Orders by status, with the summed rate spread of those that have rates
+CREATE TABLE IF NOT EXISTS rollup_orders (
+    status          TEXT    NOT NULL PRIMARY KEY,
+    order_count     INTEGER NOT NULL DEFAULT 0,
+    rated_count     INTEGER NOT NULL DEFAULT 0,
+    spread_cents    INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Cheapest-rate wins by carrier
+CREATE TABLE IF NOT EXISTS rollup_rate_carriers (
+    carrier_id      INTEGER NOT NULL PRIMARY KEY,
+    cheapest_wins   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Plain row counts for tables that have no other rollup
+CREATE TABLE IF NOT EXISTS rollup_counts (
+    table_name      TEXT    NOT NULL PRIMARY KEY,
+    row_count       INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Invoices by status
+CREATE TABLE IF NOT EXISTS rollup_invoices (
+    status          TEXT    NOT NULL PRIMARY KEY,
+    invoice_count   INTEGER NOT NULL DEFAULT 0,
+    amount_cents    INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Labor hours by employee (cost = hours x current hourly_rate at read time)
+CREATE TABLE IF NOT EXISTS rollup_labor (
+    employee_id     INTEGER NOT NULL PRIMARY KEY,
+    entry_count     INTEGER NOT NULL DEFAULT 0,
+    hours           REAL    NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Change counters for data cached in process (the clients index, tool results).
+-- Readers compare the version to decide whether their copy is stale. Rows and
+-- triggers for the other base tables are added by versions.py.
+CREATE TABLE IF NOT EXISTS rollup_versions (
+    table_name      TEXT    NOT NULL PRIMARY KEY,
+    version         INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO rollup_versions (table_name, version) VALUES ('clients', 0);
+
+-- Supports the per-lane refresh below
+CREATE INDEX IF NOT EXISTS idx_ltl_quotes_lane ON ltl_quotes(client_id, destination_zip);
+
+
+-- ============================================================
+-- TRIGGERS: Carrier Exceptions
+-- ============================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_exceptions_ins AFTER INSERT ON exceptions
+WHEN NEW.resolved_at IS NULL
+BEGIN
+    INSERT INTO rollup_exceptions (exception_type, client_id, carrier_id, exception_count, critical_count)
+    SELECT NEW.exception_type, s.client_id, s.carrier_id, 1, NEW.is_critical
+    FROM shipments s WHERE s.id = NEW.shipment_id
+    ON CONFLICT (exception_type, client_id, carrier_id) DO UPDATE SET
+        exception_count = exception_count + excluded.exception_count,
+        critical_count = critical_count + excluded.critical_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_exceptions_del AFTER DELETE ON exceptions
+WHEN OLD.resolved_at IS NULL
+BEGIN
+    UPDATE rollup_exceptions SET
+        exception_count = exception_count - 1,
+        critical_count = critical_count - OLD.is_critical
+    WHERE exception_type = OLD.exception_type
+      AND (client_id, carrier_id) = (SELECT client_id, carrier_id FROM shipments WHERE id = OLD.shipment_id);
+    DELETE FROM rollup_exceptions
+    WHERE exception_type = OLD.exception_type AND exception_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_exceptions_upd
+AFTER UPDATE OF shipment_id, exception_type, is_critical, resolved_at ON exceptions
+BEGIN
+    UPDATE rollup_exceptions SET
+        exception_count = exception_count - 1,
+        critical_count = critical_count - OLD.is_critical
+    WHERE OLD.resolved_at IS NULL
+      AND exception_type = OLD.exception_type
+      AND (client_id, carrier_id) = (SELECT client_id, carrier_id FROM shipments WHERE id = OLD.shipment_id);
+    DELETE FROM rollup_exceptions
+    WHERE exception_type = OLD.exception_type AND exception_count = 0;
+    INSERT INTO rollup_exceptions (exception_type, client_id, carrier_id, exception_count, critical_count)
+    SELECT NEW.exception_type, s.client_id, s.carrier_id, 1, NEW.is_critical
+    FROM shipments s WHERE s.id = NEW.shipment_id AND NEW.resolved_at IS NULL
+    ON CONFLICT (exception_type, client_id, carrier_id) DO UPDATE SET
+        exception_count = exception_count + excluded.exception_count,
+        critical_count = critical_count + excluded.critical_count;
+END;
+
+-- Moving a shipment to another client/carrier moves its active exceptions
+CREATE TRIGGER IF NOT EXISTS trg_rollup_exceptions_shipment_upd
+AFTER UPDATE OF client_id, carrier_id ON shipments
+WHEN OLD.client_id IS NOT NEW.client_id OR OLD.carrier_id IS NOT NEW.carrier_id
+BEGIN
+    UPDATE rollup_exceptions SET
+        exception_count = exception_count - (
+            SELECT count(*) FROM exceptions e
+            WHERE e.shipment_id = OLD.id AND e.resolved_at IS NULL
+              AND e.exception_type = rollup_exceptions.exception_type),
+        critical_count = critical_count - (
+            SELECT COALESCE(sum(e.is_critical), 0) FROM exceptions e
+            WHERE e.shipment_id = OLD.id AND e.resolved_at IS NULL
+              AND e.exception_type = rollup_exceptions.exception_type)
+    WHERE client_id = OLD.client_id AND carrier_id = OLD.carrier_id;
+    DELETE FROM rollup_exceptions
+    WHERE client_id = OLD.client_id AND carrier_id = OLD.carrier_id AND exception_count = 0;
+    INSERT INTO rollup_exceptions (exception_type, client_id, carrier_id, exception_count, critical_count)
+    SELECT exception_type, NEW.client_id, NEW.carrier_id, count(*), sum(is_critical)
+    FROM exceptions WHERE shipment_id = NEW.id AND resolved_at IS NULL
+    GROUP BY exception_type
+    ON CONFLICT (exception_type, client_id, carrier_id) DO UPDATE SET
+        exception_count = exception_count + excluded.exception_count,
+        critical_count = critical_count + excluded.critical_count;
+END;
+
+
+-- ============================================================
+-- TRIGGERS: Email Triage
+-- ============================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_emails_ins AFTER INSERT ON emails
+BEGIN
+    INSERT INTO rollup_emails (category, action_taken, is_read, email_count)
+    VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.action_taken, ''), NEW.is_read, 1)
+    ON CONFLICT (category, action_taken, is_read) DO UPDATE SET
+        email_count = email_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_emails_del AFTER DELETE ON emails
+BEGIN
+    UPDATE rollup_emails SET email_count = email_count - 1
+    WHERE category = COALESCE(OLD.category, '') AND action_taken = COALESCE(OLD.action_taken, '')
+      AND is_read = OLD.is_read;
+    DELETE FROM rollup_emails
+    WHERE category = COALESCE(OLD.category, '') AND action_taken = COALESCE(OLD.action_taken, '')
+      AND is_read = OLD.is_read AND email_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_emails_upd AFTER UPDATE OF category, action_taken, is_read ON emails
+BEGIN
+    UPDATE rollup_emails SET email_count = email_count - 1
+    WHERE category = COALESCE(OLD.category, '') AND action_taken = COALESCE(OLD.action_taken, '')
+      AND is_read = OLD.is_read;
+    DELETE FROM rollup_emails
+    WHERE category = COALESCE(OLD.category, '') AND action_taken = COALESCE(OLD.action_taken, '')
+      AND is_read = OLD.is_read AND email_count = 0;
+    INSERT INTO rollup_emails (category, action_taken, is_read, email_count)
+    VALUES (COALESCE(NEW.category, ''), COALESCE(NEW.action_taken, ''), NEW.is_read, 1)
+    ON CONFLICT (category, action_taken, is_read) DO UPDATE SET
+        email_count = email_count + 1;
+END;
+
+
+-- ============================================================
+-- TRIGGERS: Profitability
+-- ============================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_invoices_ins AFTER INSERT ON invoices
+BEGIN
+    INSERT INTO rollup_invoices (status, invoice_count, amount_cents)
+    VALUES (NEW.status, 1, CAST(round(NEW.total_amount * 100) AS INTEGER))
+    ON CONFLICT (status) DO UPDATE SET
+        invoice_count = invoice_count + 1,
+        amount_cents = amount_cents + excluded.amount_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_invoices_del AFTER DELETE ON invoices
+BEGIN
+    UPDATE rollup_invoices SET
+        invoice_count = invoice_count - 1,
+        amount_cents = amount_cents - CAST(round(OLD.total_amount * 100) AS INTEGER)
+    WHERE status = OLD.status;
+    DELETE FROM rollup_invoices WHERE status = OLD.status AND invoice_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_invoices_upd AFTER UPDATE OF status, total_amount ON invoices
+BEGIN
+    UPDATE rollup_invoices SET
+        invoice_count = invoice_count - 1,
+        amount_cents = amount_cents - CAST(round(OLD.total_amount * 100) AS INTEGER)
+    WHERE status = OLD.status;
+    DELETE FROM rollup_invoices WHERE status = OLD.status AND invoice_count = 0;
+    INSERT INTO rollup_invoices (status, invoice_count, amount_cents)
+    VALUES (NEW.status, 1, CAST(round(NEW.total_amount * 100) AS INTEGER))
+    ON CONFLICT (status) DO UPDATE SET
+        invoice_count = invoice_count + 1,
+        amount_cents = amount_cents + excluded.amount_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_labor_ins AFTER INSERT ON labor_entries
+BEGIN
+    INSERT INTO rollup_labor (employee_id, entry_count, hours)
+    VALUES (NEW.employee_id, 1, NEW.hours)
+    ON CONFLICT (employee_id) DO UPDATE SET
+        entry_count = entry_count + 1,
+        hours = hours + excluded.hours;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_labor_del AFTER DELETE ON labor_entries
+BEGIN
+    UPDATE rollup_labor SET entry_count = entry_count - 1, hours = hours - OLD.hours
+    WHERE employee_id = OLD.employee_id;
+    DELETE FROM rollup_labor WHERE employee_id = OLD.employee_id AND entry_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_labor_upd AFTER UPDATE OF employee_id, hours ON labor_entries
+BEGIN
+    UPDATE rollup_labor SET entry_count = entry_count - 1, hours = hours - OLD.hours
+    WHERE employee_id = OLD.employee_id;
+    DELETE FROM rollup_labor WHERE employee_id = OLD.employee_id AND entry_count = 0;
+    INSERT INTO rollup_labor (employee_id, entry_count, hours)
+    VALUES (NEW.employee_id, 1, NEW.hours)
+    ON CONFLICT (employee_id) DO UPDATE SET
+        entry_count = entry_count + 1,
+        hours = hours + excluded.hours;
+END;
+
+
+-- ============================================================
+-- TRIGGERS: Rate Shopping
+-- ============================================================
+
+-- rates -> rollup_order_rates (min/max can't be decremented, so refresh the order)
+CREATE TRIGGER IF NOT EXISTS trg_rollup_rates_ins AFTER INSERT ON rates
+BEGIN
+    DELETE FROM rollup_order_rates WHERE order_id = NEW.order_id;
+    INSERT INTO rollup_order_rates (order_id, rate_count, min_total, max_total)
+    SELECT order_id, count(*), min(total_amount), max(total_amount)
+    FROM rates WHERE order_id = NEW.order_id GROUP BY order_id;
+    INSERT INTO rollup_rate_carriers (carrier_id, cheapest_wins)
+    SELECT NEW.carrier_id, 1 WHERE NEW.is_cheapest = 1
+    ON CONFLICT (carrier_id) DO UPDATE SET cheapest_wins = cheapest_wins + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_rates_del AFTER DELETE ON rates
+BEGIN
+    DELETE FROM rollup_order_rates WHERE order_id = OLD.order_id;
+    INSERT INTO rollup_order_rates (order_id, rate_count, min_total, max_total)
+    SELECT order_id, count(*), min(total_amount), max(total_amount)
+    FROM rates WHERE order_id = OLD.order_id GROUP BY order_id;
+    UPDATE rollup_rate_carriers SET cheapest_wins = cheapest_wins - 1
+    WHERE carrier_id = OLD.carrier_id AND OLD.is_cheapest = 1;
+    DELETE FROM rollup_rate_carriers WHERE carrier_id = OLD.carrier_id AND cheapest_wins = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_rates_upd AFTER UPDATE OF order_id, carrier_id, total_amount, is_cheapest ON rates
+BEGIN
+    DELETE FROM rollup_order_rates WHERE order_id IN (OLD.order_id, NEW.order_id);
+    INSERT INTO rollup_order_rates (order_id, rate_count, min_total, max_total)
+    SELECT order_id, count(*), min(total_amount), max(total_amount)
+    FROM rates WHERE order_id IN (OLD.order_id, NEW.order_id) GROUP BY order_id;
+    UPDATE rollup_rate_carriers SET cheapest_wins = cheapest_wins - 1
+    WHERE carrier_id = OLD.carrier_id AND OLD.is_cheapest = 1;
+    DELETE FROM rollup_rate_carriers WHERE carrier_id = OLD.carrier_id AND cheapest_wins = 0;
+    INSERT INTO rollup_rate_carriers (carrier_id, cheapest_wins)
+    SELECT NEW.carrier_id, 1 WHERE NEW.is_cheapest = 1
+    ON CONFLICT (carrier_id) DO UPDATE SET cheapest_wins = cheapest_wins + 1;
+END;
+
+-- rollup_order_rates -> rollup_orders (spread counted under the order's status)
+CREATE TRIGGER IF NOT EXISTS trg_rollup_order_rates_ins AFTER INSERT ON rollup_order_rates
+BEGIN
+    UPDATE rollup_orders SET
+        rated_count = rated_count + 1,
+        spread_cents = spread_cents + CAST(round((NEW.max_total - NEW.min_total) * 100) AS INTEGER)
+    WHERE status = (SELECT status FROM orders WHERE id = NEW.order_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_order_rates_del AFTER DELETE ON rollup_order_rates
+BEGIN
+    UPDATE rollup_orders SET
+        rated_count = rated_count - 1,
+        spread_cents = spread_cents - CAST(round((OLD.max_total - OLD.min_total) * 100) AS INTEGER)
+    WHERE status = (SELECT status FROM orders WHERE id = OLD.order_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_orders_ins AFTER INSERT ON orders
+BEGIN
+    INSERT INTO rollup_orders (status, order_count, rated_count, spread_cents)
+    SELECT NEW.status, 1, count(*),
+           COALESCE(sum(CAST(round((max_total - min_total) * 100) AS INTEGER)), 0)
+    FROM rollup_order_rates WHERE order_id = NEW.id
+    ON CONFLICT (status) DO UPDATE SET
+        order_count = order_count + 1,
+        rated_count = rated_count + excluded.rated_count,
+        spread_cents = spread_cents + excluded.spread_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_orders_del AFTER DELETE ON orders
+BEGIN
+    UPDATE rollup_orders SET
+        order_count = order_count - 1,
+        rated_count = rated_count - (SELECT count(*) FROM rollup_order_rates WHERE order_id = OLD.id),
+        spread_cents = spread_cents - (
+            SELECT COALESCE(sum(CAST(round((max_total - min_total) * 100) AS INTEGER)), 0)
+            FROM rollup_order_rates WHERE order_id = OLD.id)
+    WHERE status = OLD.status;
+    DELETE FROM rollup_orders WHERE status = OLD.status AND order_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_orders_upd AFTER UPDATE OF status ON orders
+WHEN OLD.status IS NOT NEW.status
+BEGIN
+    UPDATE rollup_orders SET
+        order_count = order_count - 1,
+        rated_count = rated_count - (SELECT count(*) FROM rollup_order_rates WHERE order_id = OLD.id),
+        spread_cents = spread_cents - (
+            SELECT COALESCE(sum(CAST(round((max_total - min_total) * 100) AS INTEGER)), 0)
+            FROM rollup_order_rates WHERE order_id = OLD.id)
+    WHERE status = OLD.status;
+    DELETE FROM rollup_orders WHERE status = OLD.status AND order_count = 0;
+    INSERT INTO rollup_orders (status, order_count, rated_count, spread_cents)
+    SELECT NEW.status, 1, count(*),
+           COALESCE(sum(CAST(round((max_total - min_total) * 100) AS INTEGER)), 0)
+    FROM rollup_order_rates WHERE order_id = NEW.id
+    ON CONFLICT (status) DO UPDATE SET
+        order_count = order_count + 1,
+        rated_count = rated_count + excluded.rated_count,
+        spread_cents = spread_cents + excluded.spread_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_labels_ins AFTER INSERT ON labels
+BEGIN
+    INSERT INTO rollup_counts (table_name, row_count) VALUES ('labels', 1)
+    ON CONFLICT (table_name) DO UPDATE SET row_count = row_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_labels_del AFTER DELETE ON labels
+BEGIN
+    UPDATE rollup_counts SET row_count = row_count - 1 WHERE table_name = 'labels';
+END;
+
+
+-- ============================================================
+-- TRIGGERS: Chargeback Defense
+-- ============================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_chargebacks_ins AFTER INSERT ON chargebacks
+BEGIN
+    INSERT INTO rollup_chargebacks (status, retailer_id, violation_code, chargeback_count, amount_cents)
+    VALUES (NEW.status, NEW.retailer_id, NEW.violation_code, 1,
+            CAST(round(NEW.chargeback_amount * 100) AS INTEGER))
+    ON CONFLICT (status, retailer_id, violation_code) DO UPDATE SET
+        chargeback_count = chargeback_count + 1,
+        amount_cents = amount_cents + excluded.amount_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_chargebacks_del AFTER DELETE ON chargebacks
+BEGIN
+    UPDATE rollup_chargebacks SET
+        chargeback_count = chargeback_count - 1,
+        amount_cents = amount_cents - CAST(round(OLD.chargeback_amount * 100) AS INTEGER)
+    WHERE status = OLD.status AND retailer_id = OLD.retailer_id AND violation_code = OLD.violation_code;
+    DELETE FROM rollup_chargebacks
+    WHERE status = OLD.status AND retailer_id = OLD.retailer_id AND violation_code = OLD.violation_code
+      AND chargeback_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_chargebacks_upd
+AFTER UPDATE OF status, retailer_id, violation_code, chargeback_amount ON chargebacks
+BEGIN
+    UPDATE rollup_chargebacks SET
+        chargeback_count = chargeback_count - 1,
+        amount_cents = amount_cents - CAST(round(OLD.chargeback_amount * 100) AS INTEGER)
+    WHERE status = OLD.status AND retailer_id = OLD.retailer_id AND violation_code = OLD.violation_code;
+    DELETE FROM rollup_chargebacks
+    WHERE status = OLD.status AND retailer_id = OLD.retailer_id AND violation_code = OLD.violation_code
+      AND chargeback_count = 0;
+    INSERT INTO rollup_chargebacks (status, retailer_id, violation_code, chargeback_count, amount_cents)
+    VALUES (NEW.status, NEW.retailer_id, NEW.violation_code, 1,
+            CAST(round(NEW.chargeback_amount * 100) AS INTEGER))
+    ON CONFLICT (status, retailer_id, violation_code) DO UPDATE SET
+        chargeback_count = chargeback_count + 1,
+        amount_cents = amount_cents + excluded.amount_cents;
+END;
+
+
+-- ============================================================
+-- TRIGGERS: LTL Automation
+-- ============================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_ltl_quotes_ins AFTER INSERT ON ltl_quotes
+BEGIN
+    INSERT INTO rollup_ltl_carriers (carrier_id, quote_count, cost_cents, cheapest_wins)
+    VALUES (NEW.carrier_id, 1, CAST(round(NEW.total_cost * 100) AS INTEGER), NEW.is_cheapest)
+    ON CONFLICT (carrier_id) DO UPDATE SET
+        quote_count = quote_count + 1,
+        cost_cents = cost_cents + excluded.cost_cents,
+        cheapest_wins = cheapest_wins + excluded.cheapest_wins;
+    DELETE FROM rollup_ltl_lanes
+    WHERE client_id = NEW.client_id AND destination_zip = NEW.destination_zip;
+    INSERT INTO rollup_ltl_lanes (client_id, destination_zip, quote_count, min_cost, max_cost)
+    SELECT client_id, destination_zip, count(*), min(total_cost), max(total_cost)
+    FROM ltl_quotes WHERE client_id = NEW.client_id AND destination_zip = NEW.destination_zip
+    GROUP BY client_id, destination_zip;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_ltl_quotes_del AFTER DELETE ON ltl_quotes
+BEGIN
+    UPDATE rollup_ltl_carriers SET
+        quote_count = quote_count - 1,
+        cost_cents = cost_cents - CAST(round(OLD.total_cost * 100) AS INTEGER),
+        cheapest_wins = cheapest_wins - OLD.is_cheapest
+    WHERE carrier_id = OLD.carrier_id;
+    DELETE FROM rollup_ltl_carriers WHERE carrier_id = OLD.carrier_id AND quote_count = 0;
+    DELETE FROM rollup_ltl_lanes
+    WHERE client_id = OLD.client_id AND destination_zip = OLD.destination_zip;
+    INSERT INTO rollup_ltl_lanes (client_id, destination_zip, quote_count, min_cost, max_cost)
+    SELECT client_id, destination_zip, count(*), min(total_cost), max(total_cost)
+    FROM ltl_quotes WHERE client_id = OLD.client_id AND destination_zip = OLD.destination_zip
+    GROUP BY client_id, destination_zip;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_ltl_quotes_upd
+AFTER UPDATE OF client_id, carrier_id, destination_zip, total_cost, is_cheapest ON ltl_quotes
+BEGIN
+    UPDATE rollup_ltl_carriers SET
+        quote_count = quote_count - 1,
+        cost_cents = cost_cents - CAST(round(OLD.total_cost * 100) AS INTEGER),
+        cheapest_wins = cheapest_wins - OLD.is_cheapest
+    WHERE carrier_id = OLD.carrier_id;
+    DELETE FROM rollup_ltl_carriers WHERE carrier_id = OLD.carrier_id AND quote_count = 0;
+    INSERT INTO rollup_ltl_carriers (carrier_id, quote_count, cost_cents, cheapest_wins)
+    VALUES (NEW.carrier_id, 1, CAST(round(NEW.total_cost * 100) AS INTEGER), NEW.is_cheapest)
+    ON CONFLICT (carrier_id) DO UPDATE SET
+        quote_count = quote_count + 1,
+        cost_cents = cost_cents + excluded.cost_cents,
+        cheapest_wins = cheapest_wins + excluded.cheapest_wins;
+    DELETE FROM rollup_ltl_lanes
+    WHERE (client_id = OLD.client_id AND destination_zip = OLD.destination_zip)
+       OR (client_id = NEW.client_id AND destination_zip = NEW.destination_zip);
+    INSERT INTO rollup_ltl_lanes (client_id, destination_zip, quote_count, min_cost, max_cost)
+    SELECT client_id, destination_zip, count(*), min(total_cost), max(total_cost)
+    FROM ltl_quotes
+    WHERE (client_id = OLD.client_id AND destination_zip = OLD.destination_zip)
+       OR (client_id = NEW.client_id AND destination_zip = NEW.destination_zip)
+    GROUP BY client_id, destination_zip;
+    -- Re-pricing a booked quote changes booked spend
+    UPDATE rollup_ltl_bookings SET
+        spend_cents = spend_cents + (
+            SELECT count(*) FROM ltl_bookings b
+            WHERE b.quote_id = NEW.id AND b.status = rollup_ltl_bookings.status
+        ) * (CAST(round(NEW.total_cost * 100) AS INTEGER) - CAST(round(OLD.total_cost * 100) AS INTEGER))
+    WHERE NEW.total_cost IS NOT OLD.total_cost
+      AND status IN (SELECT status FROM ltl_bookings WHERE quote_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_ltl_bookings_ins AFTER INSERT ON ltl_bookings
+BEGIN
+    INSERT INTO rollup_ltl_bookings (status, booking_count, spend_cents)
+    SELECT NEW.status, 1, COALESCE(
+        (SELECT CAST(round(total_cost * 100) AS INTEGER) FROM ltl_quotes WHERE id = NEW.quote_id), 0)
+    WHERE 1
+    ON CONFLICT (status) DO UPDATE SET
+        booking_count = booking_count + 1,
+        spend_cents = spend_cents + excluded.spend_cents;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_ltl_bookings_del AFTER DELETE ON ltl_bookings
+BEGIN
+    UPDATE rollup_ltl_bookings SET
+        booking_count = booking_count - 1,
+        spend_cents = spend_cents - COALESCE(
+            (SELECT CAST(round(total_cost * 100) AS INTEGER) FROM ltl_quotes WHERE id = OLD.quote_id), 0)
+    WHERE status = OLD.status;
+    DELETE FROM rollup_ltl_bookings WHERE status = OLD.status AND booking_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_ltl_bookings_upd AFTER UPDATE OF status, quote_id ON ltl_bookings
+BEGIN
+    UPDATE rollup_ltl_bookings SET
+        booking_count = booking_count - 1,
+        spend_cents = spend_cents - COALESCE(
+            (SELECT CAST(round(total_cost * 100) AS INTEGER) FROM ltl_quotes WHERE id = OLD.quote_id), 0)
+    WHERE status = OLD.status;
+    DELETE FROM rollup_ltl_bookings WHERE status = OLD.status AND booking_count = 0;
+    INSERT INTO rollup_ltl_bookings (status, booking_count, spend_cents)
+    SELECT NEW.status, 1, COALESCE(
+        (SELECT CAST(round(total_cost * 100) AS INTEGER) FROM ltl_quotes WHERE id = NEW.quote_id), 0)
+    WHERE 1
+    ON CONFLICT (status) DO UPDATE SET
+        booking_count = booking_count + 1,
+        spend_cents = spend_cents + excluded.spend_cents;
+END;
+
+
+-- ============================================================
+-- TRIGGERS: Clients (version bump only)
+-- ============================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_clients_ins AFTER INSERT ON clients
+BEGIN
+    UPDATE rollup_versions SET version = version + 1 WHERE table_name = 'clients';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_clients_del AFTER DELETE ON clients
+BEGIN
+    UPDATE rollup_versions SET version = version + 1 WHERE table_name = 'clients';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_clients_upd AFTER UPDATE OF name, code ON clients
+BEGIN
+    UPDATE rollup_versions SET version = version + 1 WHERE table_name = 'clients';
+END;
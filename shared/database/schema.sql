@@ -492,6 +492,8 @@ CREATE TABLE IF NOT EXISTS ltl_bookings (
 -- ============================================================
 -- INDEXES
 -- ============================================================
+-- Indexes added after this baseline ship as numbered migrations in
+-- shared/database/migrations/ (applied by setup_database.py and on server start).
 
 -- Core table indexes
 CREATE INDEX IF NOT EXISTS idx_contacts_client_id ON contacts(client_id);
@@ -0,0 +1,77 @@
+"""Full-text search over the inbox.
+
+``search.sql`` defines ``emails_fts``, an FTS5 index over each email's
+subject, preview and body text, plus the triggers that keep it current.
+Searches use the index and BM25 ranking instead of ``LIKE '%...%'`` scans
+of ``body_text``.
+
+``match_expression()`` turns free text from the agent (PO numbers, tracking
+numbers, SKUs) into a safe FTS5 query.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+
+from .connection import get_db_path, write_connection
+
+# Column weights for bm25(): a hit in the subject outranks one in the body
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TERM = re.compile(r'[^\s"]+')
+
+
+def get_search_path() -> Path:
+    """Return the path to search.sql."""
+    return Path(__file__).resolve().parent / "search.sql"
+
+
+def is_installed(conn: sqlite3.Connection) -> bool:
+    """True if the emails_fts index exists in the database."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'emails_fts'"
+    ).fetchone() is not None
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Re-index every email from the emails table and commit."""
+    with conn:
+        conn.execute("INSERT INTO emails_fts (emails_fts) VALUES ('rebuild')")
+
+
+def install(conn: sqlite3.Connection) -> None:
+    """Create the index and triggers (idempotent), then build the index."""
+    conn.executescript(get_search_path().read_text())
+    rebuild(conn)
+
+
+def ensure_installed(db_path: str | Path | None = None) -> bool:
+    """Install the search index into an existing database that predates it.
+
+    Returns True if it was installed now, False if already present or the
+    database does not exist yet.
+    """
+    if not Path(db_path or get_db_path()).exists():
+        return False
+    with write_connection(db_path) as conn:
+        if is_installed(conn):
+            return False
+        install(conn)
+    return True
+
+
+def match_expression(text: str) -> str:
+    """Build an FTS5 MATCH expression that requires every term in ``text``.
+
+    Each whitespace-separated term is quoted, so punctuation inside it
+    (``PO-4471``, ``1Z999AA1``) is matched as a phrase rather than parsed as
+    FTS5 syntax. A trailing ``*`` keeps prefix matching (``SKU-12*``).
+    Returns ``""`` if ``text`` has no terms.
+    """
+    terms = []
+    for term in _TERM.findall(text):
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
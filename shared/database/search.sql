@@ -0,0 +1,40 @@
+-- All Points Agents - Full-text search index for the emails table
+-- emails_fts is an external-content FTS5 table: it stores only the index and
+-- reads subject/body text back from emails, so the inbox is not duplicated.
+-- The triggers below keep it in step with every insert/update/delete.
+--
+-- Applied by shared/database/search.py.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS emails_fts USING fts5(
+    subject,
+    body_preview,
+    body_text,
+    content = 'emails',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_emails_fts_insert
+AFTER INSERT ON emails
+BEGIN
+    INSERT INTO emails_fts (rowid, subject, body_preview, body_text)
+    VALUES (new.id, new.subject, new.body_preview, new.body_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_emails_fts_delete
+AFTER DELETE ON emails
+BEGIN
+    INSERT INTO emails_fts (emails_fts, rowid, subject, body_preview, body_text)
+    VALUES ('delete', old.id, old.subject, old.body_preview, old.body_text);
+END;
+
+-- Only text changes touch the index; triage updates (is_read, category, ...) don't
+CREATE TRIGGER IF NOT EXISTS trg_emails_fts_update
+AFTER UPDATE OF subject, body_preview, body_text ON emails
+BEGIN
+    INSERT INTO emails_fts (emails_fts, rowid, subject, body_preview, body_text)
+    VALUES ('delete', old.id, old.subject, old.body_preview, old.body_text);
+    INSERT INTO emails_fts (rowid, subject, body_preview, body_text)
+    VALUES (new.id, new.subject, new.body_preview, new.body_text);
+END;
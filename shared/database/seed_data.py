@@ -2,11 +2,25 @@
 
 Uses Faker + random.seed(42) to produce reproducible data across all 21 tables.
 Dates are relative to today so the data always feels current.
+
+``seed_all(scale=N)`` multiplies the transactional volume for load testing:
+extra shards of rows are generated in parallel worker processes, each from
+its own seed derived from the global one, and written by a single loader,
+so the data does not depend on the worker count. ``bulk_load()`` turns off
+journaling and fsyncs while a fresh database is filled.
 """
 
+import os
+import pickle
 import random
 import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, date
+from itertools import repeat
+from pathlib import Path
 
 from faker import Faker
 
@@ -220,169 +234,127 @@ def _calc_dim_weight(l: float, w: float, h: float) -> float:
     return (l * w * h) / 139.0
 
 
-# ── Seed functions ──────────────────────────────────────────────
-
-def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
-    """Seed every table. Returns a dict of table→record_count."""
-    counts: dict[str, int] = {}
-    cur = conn.cursor()
+# ── Shards ──────────────────────────────────────────────────────
+#
+# ``seed_all(scale=N)`` generates N shards. Shard 0 is the standard demo
+# data set: the reference tables (clients, products, carriers, employees,
+# ...) plus one unit of transactional rows, drawn from ``random.seed(seed)``
+# exactly as the single-process seeder always has. Shards 1..N-1 each add
+# one more unit of transactional rows, drawn from their own seed (derived
+# from ``seed``), and reference shard 0's rows. Shards are generated in
+# worker processes and loaded in shard order by one writer, so the data
+# depends on ``scale`` and ``seed`` but not on the number of workers.
+
+# Rows per shard for each transactional section
+PER_SHARD = {
+    "end_customers": 10,
+    "destinations": 65,
+    "shipments": 220,
+    "emails": 160,
+    "orders": 120,
+    "chargebacks": 35,
+    "ltl_groups": 55,
+    "receiving": 40,
+}
 
-    # ── 1. Clients ──
-    client_ids = {}
-    for name, code, industry in CLIENTS:
-        email = f"info@{code.lower()}brand.com"
-        phone = fake.phone_number()
-        website = f"https://www.{code.lower()}brand.com"
-        cur.execute(
-            "INSERT INTO clients (name, code, industry, contact_email, contact_phone, website) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (name, code, industry, email, phone, website),
-        )
-        client_ids[code] = cur.lastrowid
-    counts["clients"] = len(CLIENTS)
 
-    # ── 2. Contacts ──
-    contact_count = 0
-    contact_ids: list[int] = []
-    # Client contacts (5-6 per client)
-    for code, cid in client_ids.items():
-        for _ in range(random.randint(5, 6)):
-            fn, ln = fake.first_name(), fake.last_name()
-            role = random.choice(["Logistics Manager", "Account Manager", "Shipping Coordinator", "Operations Director", "Warehouse Manager", "VP Supply Chain"])
-            cur.execute(
-                "INSERT INTO contacts (client_id, first_name, last_name, email, phone, role, contact_type) "
-                "VALUES (?, ?, ?, ?, ?, ?, 'client')",
-                (cid, fn, ln, f"{fn.lower()}.{ln.lower()}@{code.lower()}brand.com", fake.phone_number(), role),
-            )
-            contact_ids.append(cur.lastrowid)
-            contact_count += 1
-    # End-customer contacts (~10 extra)
-    for _ in range(10):
-        fn, ln = fake.first_name(), fake.last_name()
-        cur.execute(
-            "INSERT INTO contacts (client_id, first_name, last_name, email, phone, role, contact_type) "
-            "VALUES (?, ?, ?, ?, ?, 'Customer', 'end_customer')",
-            (random.choice(list(client_ids.values())), fn, ln, fake.email(), fake.phone_number()),
-        )
-        contact_ids.append(cur.lastrowid)
-        contact_count += 1
-    counts["contacts"] = contact_count
+@dataclass
+class _Refs:
+    """Ids from shard 0 that every shard draws from, plus the shared clock."""
+    today: datetime
+    client_ids: dict[str, int] = field(default_factory=dict)
+    contact_ids: list[int] = field(default_factory=list)
+    warehouse_addr_ids: list[int] = field(default_factory=list)
+    dest_addr_ids: list[int] = field(default_factory=list)
+    address_zips: dict[int, str] = field(default_factory=dict)
+    product_ids: dict[str, list[int]] = field(default_factory=dict)  # client_code → product IDs
+    products: dict[int, tuple] = field(default_factory=dict)  # product ID → (weight_oz, l, w, h, unit_value)
+    carrier_ids: dict[str, int] = field(default_factory=dict)
+    employee_ids: list[tuple[int, str]] = field(default_factory=list)  # (id, department)
+    retailer_ids: dict[str, int] = field(default_factory=dict)
+    retailer_windows: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def base_date(self) -> datetime:
+        return self.today - timedelta(days=14)  # Data spans last 2 weeks to today
+
+
+class _ShardWriter:
+    """Collects one shard's rows column by column.
+
+    Shard 0 is loaded first into empty tables, so its ids (1, 2, ...) are
+    final. Other shards number their rows -1, -2, ...; the loader turns
+    those into ids after the rows already loaded. References to shard 0
+    rows keep their positive ids.
+    """
+
+    def __init__(self, shard: int):
+        self.shard = shard
+        self.tables: dict[str, tuple[list[str], list[list]]] = {}
+        self.invoices: list[tuple] = []  # priced once every shard's labor is loaded
+        self._next_id: dict[str, int] = {}
+
+    def add(self, table: str, columns: str, *values) -> int:
+        """Append one row to ``table``; returns its (shard-local) id."""
+        if table not in self.tables:
+            names = ["id", *(name.strip() for name in columns.split(","))]
+            self.tables[table] = (names, [[] for _ in names])
+            self._next_id[table] = 1
+        n = self._next_id[table]
+        self._next_id[table] += 1
+        row_id = n if self.shard == 0 else -n
+        for column, value in zip(self.tables[table][1], (row_id, *values)):
+            column.append(value)
+        return row_id
+
+    def dump(self) -> dict:
+        return {"shard": self.shard, "tables": self.tables, "invoices": self.invoices}
+
+
+def _shard_seeds(seed: int, scale: int) -> list[int]:
+    """Seed per shard: shard 0 uses ``seed`` itself, the rest are drawn from it."""
+    rng = random.Random(seed)
+    return [seed] + [rng.getrandbits(64) for _ in range(scale - 1)]
 
-    # ── 3. Addresses ──
-    addr_count = 0
-    warehouse_addr_ids: list[int] = []
-    dest_addr_ids: list[int] = []
 
-    # All Points warehouse (origin)
-    cur.execute(
-        "INSERT INTO addresses (client_id, label, street1, city, state, zip_code, is_residential, address_type) "
-        "VALUES (NULL, 'warehouse', '1000 Logistics Parkway', 'Atlanta', 'GA', '30318', 0, 'warehouse')",
-    )
-    warehouse_addr_ids.append(cur.lastrowid)
-    addr_count += 1
+# ── Seed functions ──────────────────────────────────────────────
 
-    # Second warehouse dock
-    cur.execute(
-        "INSERT INTO addresses (client_id, label, street1, city, state, zip_code, is_residential, address_type) "
-        "VALUES (NULL, 'warehouse', '1002 Logistics Parkway, Dock B', 'Atlanta', 'GA', '30318', 0, 'origin')",
-    )
-    warehouse_addr_ids.append(cur.lastrowid)
-    addr_count += 1
+def _seed_end_customers(rows: _ShardWriter, refs: _Refs) -> None:
+    # End-customer contacts (~10 per shard)
+    for _ in range(PER_SHARD["end_customers"]):
+        fn, ln = fake.first_name(), fake.last_name()
+        refs.contact_ids.append(rows.add(
+            "contacts", "client_id, first_name, last_name, email, phone, role, contact_type",
+            random.choice(list(refs.client_ids.values())), fn, ln, fake.email(), fake.phone_number(), "Customer", "end_customer",
+        ))
 
-    # Client HQ addresses
-    client_addr_ids = {}
-    for code, cid in client_ids.items():
-        city, state, zipcode = fake.city(), fake.state_abbr(), fake.zipcode()
-        cur.execute(
-            "INSERT INTO addresses (client_id, label, street1, city, state, zip_code, is_residential, address_type) "
-            "VALUES (?, 'primary', ?, ?, ?, ?, 0, 'billing')",
-            (cid, fake.street_address(), city, state, zipcode),
-        )
-        client_addr_ids[code] = cur.lastrowid
-        addr_count += 1
 
-    # Customer destination addresses (~65)
-    for _ in range(65):
+def _seed_destinations(rows: _ShardWriter, refs: _Refs) -> None:
+    # Customer destination addresses (~65 per shard)
+    for _ in range(PER_SHARD["destinations"]):
         dest = random.choice(DESTINATIONS)
         is_res = random.choice([0, 0, 1])  # ~33% residential
-        cid = random.choice(list(client_ids.values()))
-        cur.execute(
-            "INSERT INTO addresses (client_id, label, street1, city, state, zip_code, is_residential, address_type) "
-            "VALUES (?, 'shipping', ?, ?, ?, ?, ?, 'destination')",
-            (cid, fake.street_address(), dest[0], dest[1], dest[2], is_res),
-        )
-        dest_addr_ids.append(cur.lastrowid)
-        addr_count += 1
-    counts["addresses"] = addr_count
-
-    # ── 4. Products ──
-    product_ids: dict[str, list[int]] = {}  # client_code → list of product IDs
-    prod_count = 0
-    for code, items in PRODUCT_CATALOG.items():
-        cid = client_ids[code]
-        product_ids[code] = []
-        for sku, name, weight_oz, l, w, h, value, fclass in items:
-            cur.execute(
-                "INSERT INTO products (client_id, sku, name, weight_oz, length_in, width_in, height_in, unit_value, freight_class) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (cid, sku, name, weight_oz, l, w, h, value, fclass),
-            )
-            product_ids[code].append(cur.lastrowid)
-            prod_count += 1
-    counts["products"] = prod_count
-
-    # ── 5. Carriers ──
-    carrier_ids: dict[str, int] = {}
-    for name, code, ctype, acct, tier, factor, days in ALL_CARRIERS:
-        cur.execute(
-            "INSERT INTO carriers (name, code, carrier_type, account_number, contract_tier, pricing_factor, transit_days) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (name, code, ctype, acct, tier, factor, days),
-        )
-        carrier_ids[code] = cur.lastrowid
-    counts["carriers"] = len(ALL_CARRIERS)
-
-    # ── 6. Employees ──
-    employee_ids: list[tuple[int, str]] = []  # (id, department)
-    for role, dept in EMPLOYEE_ROLES:
-        fn, ln = fake.first_name(), fake.last_name()
-        hire = fake.date_between(start_date="-3y", end_date="-3m").isoformat()
-        rate = round(random.uniform(15.0, 28.0), 2)
-        if "Lead" in role or "Manager" in role or "Coordinator" in role:
-            rate = round(random.uniform(22.0, 35.0), 2)
-        cur.execute(
-            "INSERT INTO employees (first_name, last_name, email, role, department, hourly_rate, hire_date) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (fn, ln, f"{fn.lower()}.{ln.lower()}@allpointsatl.com", role, dept, rate, hire),
+        cid = random.choice(list(refs.client_ids.values()))
+        addr_id = rows.add(
+            "addresses", "client_id, label, street1, city, state, zip_code, is_residential, address_type",
+            cid, "shipping", fake.street_address(), dest[0], dest[1], dest[2], is_res, "destination",
         )
-        employee_ids.append((cur.lastrowid, dept))
-    counts["employees"] = len(EMPLOYEE_ROLES)
+        refs.dest_addr_ids.append(addr_id)
+        refs.address_zips[addr_id] = dest[2]
 
-    # ── 7. Retailers ──
-    retailer_ids: dict[str, int] = {}
-    for name, code, portal, window in RETAILERS:
-        cur.execute(
-            "INSERT INTO retailers (name, code, portal_name, dispute_window_days) VALUES (?, ?, ?, ?)",
-            (name, code, portal, window),
-        )
-        retailer_ids[code] = cur.lastrowid
-    counts["retailers"] = len(RETAILERS)
 
-    # ── 8. Shipments + shipment_items + exceptions ──
-    shipment_count = 0
-    shipment_item_count = 0
-    exception_count = 0
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    base_date = today - timedelta(days=14)  # Data spans last 2 weeks to today
+def _seed_shipments(rows: _ShardWriter, refs: _Refs) -> None:
+    """Shipments + shipment_items + exceptions."""
     parcel_carrier_codes = ["UPS", "UPS2", "FEDEX", "USPS"]
+    first = rows.shard * PER_SHARD["shipments"]
 
-    for i in range(220):
-        client_code = random.choice(list(client_ids.keys()))
-        cid = client_ids[client_code]
+    for i in range(first, first + PER_SHARD["shipments"]):
+        client_code = random.choice(list(refs.client_ids.keys()))
+        cid = refs.client_ids[client_code]
         carrier_code = random.choice(parcel_carrier_codes)
-        crid = carrier_ids[carrier_code]
+        crid = refs.carrier_ids[carrier_code]
 
-        ship_date = base_date + timedelta(days=random.randint(0, 14))
+        ship_date = refs.base_date + timedelta(days=random.randint(0, 14))
         transit = random.randint(2, 7)
         expected = ship_date + timedelta(days=transit)
 
@@ -424,54 +396,39 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         order_num = f"{client_code}-2026-{3000 + i}"
 
         # Pick a destination address and contact
-        dest_id = random.choice(dest_addr_ids) if dest_addr_ids else None
-        contact_id = random.choice(contact_ids) if contact_ids else None
-        origin_id = random.choice(warehouse_addr_ids)
+        dest_id = random.choice(refs.dest_addr_ids) if refs.dest_addr_ids else None
+        contact_id = random.choice(refs.contact_ids) if refs.contact_ids else None
+        origin_id = random.choice(refs.warehouse_addr_ids)
 
         # Pick products and calc weight
-        prods = product_ids[client_code]
+        prods = refs.product_ids[client_code]
         n_items = random.randint(1, 3)
         selected_prods = random.choices(prods, k=n_items)
         weight_lbs = 0.0
 
-        # Retrieve product weights
-        prod_weights = {}
-        for pid in set(selected_prods):
-            row = cur.execute("SELECT weight_oz FROM products WHERE id = ?", (pid,)).fetchone()
-            prod_weights[pid] = row[0] if row else 16.0
-
         for pid in selected_prods:
             qty = random.randint(1, 2)
-            weight_lbs += (prod_weights[pid] * qty) / 16.0
+            weight_lbs += (refs.products[pid][0] * qty) / 16.0
 
-        dest_row = cur.execute("SELECT zip_code FROM addresses WHERE id = ?", (dest_id,)).fetchone() if dest_id else None
-        dest_zip = dest_row[0] if dest_row else "10001"
+        dest_zip = refs.address_zips.get(dest_id, "10001")
         zone = next((d[3] for d in DESTINATIONS if d[2] == dest_zip), random.randint(2, 8))
 
-        cur.execute(
-            "INSERT INTO shipments (shipment_number, order_number, client_id, contact_id, carrier_id, "
+        ship_id = rows.add(
+            "shipments",
+            "shipment_number, order_number, client_id, contact_id, carrier_id, "
             "tracking_number, service, status, ship_date, expected_delivery, actual_delivery, "
-            "origin_address_id, dest_address_id, weight_lbs, zone) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                shipment_num, order_num, cid, contact_id, crid,
-                tracking, service, status,
-                ship_date.strftime("%Y-%m-%d"), expected.strftime("%Y-%m-%d"),
-                actual.strftime("%Y-%m-%d") if actual else None,
-                origin_id, dest_id, round(weight_lbs, 2), zone,
-            ),
+            "origin_address_id, dest_address_id, weight_lbs, zone",
+            shipment_num, order_num, cid, contact_id, crid,
+            tracking, service, status,
+            ship_date.strftime("%Y-%m-%d"), expected.strftime("%Y-%m-%d"),
+            actual.strftime("%Y-%m-%d") if actual else None,
+            origin_id, dest_id, round(weight_lbs, 2), zone,
         )
-        ship_id = cur.lastrowid
-        shipment_count += 1
 
         # Shipment items
         for pid in selected_prods:
             qty = random.randint(1, 2)
-            cur.execute(
-                "INSERT INTO shipment_items (shipment_id, product_id, quantity) VALUES (?, ?, ?)",
-                (ship_id, pid, qty),
-            )
-            shipment_item_count += 1
+            rows.add("shipment_items", "shipment_id, product_id, quantity", ship_id, pid, qty)
 
         # Exceptions (~30% of shipments)
         if status in ("delayed", "exception") or (status == "in_transit" and random.random() < 0.1):
@@ -489,56 +446,52 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
                 "delivery_attempted": f"Delivery attempted — no one available at {fake.street_address()}",
                 "held_at_facility": "Customer requested hold at local facility for pickup",
             }
-            cur.execute(
-                "INSERT INTO exceptions (shipment_id, exception_type, exception_message, is_critical, days_overdue) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (ship_id, etype, messages[etype], is_crit, days_over),
+            rows.add(
+                "exceptions", "shipment_id, exception_type, exception_message, is_critical, days_overdue",
+                ship_id, etype, messages[etype], is_crit, days_over,
             )
-            exception_count += 1
-
-    counts["shipments"] = shipment_count
-    counts["shipment_items"] = shipment_item_count
-    counts["exceptions"] = exception_count
-
-    # ── 9. Emails ──
-    email_count = 0
-    email_subjects = {
-        "tracking_request": [
-            "Where is my order?", "Tracking update request", "Order status inquiry",
-            "Haven't received tracking info", "When will my package arrive?",
-        ],
-        "delivery_confirmation": [
-            "Was my order delivered?", "Delivery confirmation needed",
-            "Package shows delivered but not received", "Confirm delivery status",
-        ],
-        "inventory_question": [
-            "Stock availability inquiry", "When will {sku} be back in stock?",
-            "Bulk order availability", "Inventory levels for upcoming order",
-        ],
-        "billing_question": [
-            "Invoice discrepancy", "Question about recent charge",
-            "Payment terms inquiry", "Need updated invoice",
-        ],
-        "shipping_issue": [
-            "Damaged package received", "Wrong items shipped",
-            "Missing items in shipment", "Package arrived open/tampered",
-        ],
-        "complex_issue": [
-            "Ongoing delivery problems with multiple orders",
-            "Escalation: repeated shipping errors",
-            "Request for account review and rate adjustment",
-            "Complaint: service quality degradation",
-        ],
-    }
-
-    for i in range(160):
+
+
+EMAIL_SUBJECTS = {
+    "tracking_request": [
+        "Where is my order?", "Tracking update request", "Order status inquiry",
+        "Haven't received tracking info", "When will my package arrive?",
+    ],
+    "delivery_confirmation": [
+        "Was my order delivered?", "Delivery confirmation needed",
+        "Package shows delivered but not received", "Confirm delivery status",
+    ],
+    "inventory_question": [
+        "Stock availability inquiry", "When will {sku} be back in stock?",
+        "Bulk order availability", "Inventory levels for upcoming order",
+    ],
+    "billing_question": [
+        "Invoice discrepancy", "Question about recent charge",
+        "Payment terms inquiry", "Need updated invoice",
+    ],
+    "shipping_issue": [
+        "Damaged package received", "Wrong items shipped",
+        "Missing items in shipment", "Package arrived open/tampered",
+    ],
+    "complex_issue": [
+        "Ongoing delivery problems with multiple orders",
+        "Escalation: repeated shipping errors",
+        "Request for account review and rate adjustment",
+        "Complaint: service quality degradation",
+    ],
+}
+
+
+def _seed_emails(rows: _ShardWriter, refs: _Refs) -> None:
+    first = rows.shard * PER_SHARD["emails"]
+    for i in range(first, first + PER_SHARD["emails"]):
         cat = random.choice(EMAIL_CATEGORIES)
-        subjects = email_subjects[cat]
+        subjects = EMAIL_SUBJECTS[cat]
         subject = random.choice(subjects)
         sender_name = fake.name()
         sender_email = fake.email()
         body = fake.paragraph(nb_sentences=random.randint(3, 8))
-        received = (base_date + timedelta(
+        received = (refs.base_date + timedelta(
             days=random.randint(0, 14),
             hours=random.randint(6, 20),
             minutes=random.randint(0, 59),
@@ -551,70 +504,48 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         elif confidence:
             action = "escalated"
 
-        cid = random.choice(list(client_ids.values())) if random.random() > 0.3 else None
+        cid = random.choice(list(refs.client_ids.values())) if random.random() > 0.3 else None
         msg_id = f"MSG-{10000 + i}"
 
-        cur.execute(
-            "INSERT INTO emails (message_id, sender_name, sender_email, subject, body_preview, body_text, "
-            "received_at, is_read, category, confidence, action_taken, client_id) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (msg_id, sender_name, sender_email, subject, body[:200], body, received, is_read, cat, confidence, action, cid),
+        rows.add(
+            "emails",
+            "message_id, sender_name, sender_email, subject, body_preview, body_text, "
+            "received_at, is_read, category, confidence, action_taken, client_id",
+            msg_id, sender_name, sender_email, subject, body[:200], body, received, is_read, cat, confidence, action, cid,
         )
-        email_count += 1
-    counts["emails"] = email_count
 
-    # ── 10. Email templates ──
-    templates = [
-        ("tracking_request", "Tracking Auto-Reply", "Re: {subject}",
-         "Hi {sender_name},\n\nThank you for reaching out! Your order {order_number} is currently {status}. "
-         "Track your package here: {tracking_url}\n\nBest,\nAll Points ATL Customer Service"),
-        ("delivery_confirmation", "Delivery Confirmation Reply", "Re: {subject}",
-         "Hi {sender_name},\n\nYour order {order_number} was delivered on {delivery_date}. "
-         "If you have not received it, please reply to this email.\n\nBest,\nAll Points ATL Customer Service"),
-        ("shipping_issue", "Shipping Issue Acknowledgement", "Re: {subject} - We're on it",
-         "Hi {sender_name},\n\nWe're sorry to hear about the issue with your shipment. "
-         "A team member will investigate and follow up within 24 hours.\n\nAll Points ATL Customer Service"),
-        ("billing_question", "Billing Inquiry Received", "Re: {subject}",
-         "Hi {sender_name},\n\nWe've received your billing inquiry and our accounts team will respond within 1-2 business days.\n\nAll Points ATL"),
-        ("inventory_question", "Inventory Inquiry", "Re: {subject}",
-         "Hi {sender_name},\n\nThank you for your interest. We're checking current stock levels and will get back to you shortly.\n\nAll Points ATL"),
-        ("complex_issue", "Escalation Received", "Re: {subject} - Escalated",
-         "Hi {sender_name},\n\nYour request has been escalated to our operations team. "
-         "You'll hear from a dedicated representative within 4 business hours.\n\nAll Points ATL"),
-    ]
-    for cat, tname, subj, body in templates:
-        cur.execute(
-            "INSERT INTO email_templates (category, template_name, subject_template, body_template) VALUES (?, ?, ?, ?)",
-            (cat, tname, subj, body),
-        )
-    counts["email_templates"] = len(templates)
 
-    # ── 11. Labor entries ──
-    labor_count = 0
-    labor_start = today - timedelta(days=59)  # Last ~2 months of labor data
+def _seed_labor(rows: _ShardWriter, refs: _Refs) -> set[tuple[int, str]]:
+    """Labor entries; returns the (client_id, "YYYY-MM") pairs that got hours."""
+    worked = set()
+    labor_start = refs.today - timedelta(days=59)  # Last ~2 months of labor data
     for day_offset in range(59):
         work_date = labor_start + timedelta(days=day_offset)
         if work_date.weekday() >= 5:  # skip weekends (mostly)
             if random.random() > 0.15:
                 continue
         # Each day, ~7-10 employees log hours across various clients
-        day_workers = random.sample(employee_ids, k=min(random.randint(7, 10), len(employee_ids)))
+        day_workers = random.sample(refs.employee_ids, k=min(random.randint(7, 10), len(refs.employee_ids)))
         for emp_id, dept in day_workers:
-            cid = random.choice(list(client_ids.values()))
+            cid = random.choice(list(refs.client_ids.values()))
             svcs = DEPT_SERVICE_MAP.get(dept, ["pick_and_pack"])
             svc = random.choice(svcs)
             hours = round(random.uniform(2.0, 8.0), 1)
-            cur.execute(
-                "INSERT INTO labor_entries (client_id, employee_id, work_date, hours, service_type) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (cid, emp_id, work_date.strftime("%Y-%m-%d"), hours, svc),
+            rows.add(
+                "labor_entries", "client_id, employee_id, work_date, hours, service_type",
+                cid, emp_id, work_date.strftime("%Y-%m-%d"), hours, svc,
             )
-            labor_count += 1
-    counts["labor_entries"] = labor_count
+            worked.add((cid, work_date.strftime("%Y-%m")))
+    return worked
 
-    # ── 12. Invoices + line items ──
-    invoice_count = 0
-    line_item_count = 0
+
+def _plan_invoices(rows: _ShardWriter, refs: _Refs, worked: set[tuple[int, str]]) -> None:
+    """Draw each client/month invoice's margin and status; amounts come later.
+
+    Invoices are priced from every shard's labor, so ``_write_invoices``
+    inserts them after all shards are loaded.
+    """
+    today = refs.today
     inv_num = 1
     # Two invoice periods: last month and current month
     last_month = (today.replace(day=1) - timedelta(days=1))
@@ -623,25 +554,14 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         (today.strftime("%Y-%m"), today - timedelta(days=1)),
     ]
     for month_prefix, inv_date in invoice_months:
-        for code, cid in client_ids.items():
+        for code, cid in refs.client_ids.items():
             due_date = inv_date + timedelta(days=30)
 
-            # Calculate labor cost for this client/month
-            rows = cur.execute(
-                "SELECT SUM(le.hours * e.hourly_rate) as total, SUM(le.hours) as hrs "
-                "FROM labor_entries le JOIN employees e ON le.employee_id = e.id "
-                "WHERE le.client_id = ? AND le.work_date LIKE ?",
-                (cid, f"{month_prefix}%"),
-            ).fetchone()
-            labor_total = rows[0] if rows[0] else 0
-            labor_hrs = rows[1] if rows[1] else 0
-
-            if labor_total == 0:
+            if (cid, month_prefix) not in worked:
                 continue
 
             # Invoice amount = labor cost + margin (15-40%)
             margin = random.uniform(1.15, 1.40)
-            total_amount = round(labor_total * margin, 2)
 
             # Status: older invoices mostly paid, newer ones mostly pending
             is_older = (inv_date < today - timedelta(days=20))
@@ -653,64 +573,37 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
                 payment_date = (inv_date + timedelta(days=random.randint(5, 15))).strftime("%Y-%m-%d") if status == "paid" else None
 
             inv_number = f"INV-2026-{inv_num:03d}"
-            cur.execute(
-                "INSERT INTO invoices (client_id, invoice_number, invoice_date, due_date, total_amount, status, payment_date) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (cid, inv_number, inv_date.strftime("%Y-%m-%d"), due_date.strftime("%Y-%m-%d"), total_amount, status, payment_date),
-            )
-            inv_id = cur.lastrowid
-            invoice_count += 1
+            rows.invoices.append((
+                cid, inv_number, inv_date.strftime("%Y-%m-%d"), due_date.strftime("%Y-%m-%d"),
+                status, payment_date, month_prefix, margin,
+            ))
             inv_num += 1
 
-            # Line items by service type
-            svc_rows = cur.execute(
-                "SELECT le.service_type, SUM(le.hours) as hrs, SUM(le.hours * e.hourly_rate) as cost "
-                "FROM labor_entries le JOIN employees e ON le.employee_id = e.id "
-                "WHERE le.client_id = ? AND le.work_date LIKE ? "
-                "GROUP BY le.service_type",
-                (cid, f"{month_prefix}%"),
-            ).fetchall()
-            for svc_row in svc_rows:
-                svc_type = svc_row[0]
-                svc_hrs = svc_row[1]
-                svc_cost = svc_row[2]
-                line_amount = round(svc_cost * margin, 2)
-                desc = svc_type.replace("_", " ").title()
-                cur.execute(
-                    "INSERT INTO invoice_line_items (invoice_id, description, service_type, quantity, unit_price, amount) "
-                    "VALUES (?, ?, ?, ?, ?, ?)",
-                    (inv_id, f"{desc} Services", svc_type, round(svc_hrs, 1), round(line_amount / svc_hrs, 2) if svc_hrs else 0, line_amount),
-                )
-                line_item_count += 1
-
-    counts["invoices"] = invoice_count
-    counts["invoice_line_items"] = line_item_count
 
-    # ── 13. Orders + order_items + rates + labels ──
-    order_count = 0
-    order_item_count = 0
-    rate_count = 0
-    label_count = 0
-
-    for i in range(120):
-        client_code = random.choice(list(client_ids.keys()))
-        cid = client_ids[client_code]
-        prods = product_ids[client_code]
+def _seed_orders(rows: _ShardWriter, refs: _Refs) -> None:
+    """Orders + order_items + rates + labels."""
+    rate_columns = (
+        "order_id, carrier_id, service_code, service_name, base_rate, "
+        "fuel_surcharge, residential_surcharge, total_amount, billable_weight_lbs, "
+        "delivery_days, delivery_date, zone, is_cheapest"
+    )
+    base_date = refs.base_date
+    first = rows.shard * PER_SHARD["orders"]
+    for i in range(first, first + PER_SHARD["orders"]):
+        client_code = random.choice(list(refs.client_ids.keys()))
+        cid = refs.client_ids[client_code]
+        prods = refs.product_ids[client_code]
         prod_id = random.choice(prods)
         qty = random.choices([1, 1, 1, 2, 3], k=1)[0]
 
-        prod_row = cur.execute(
-            "SELECT weight_oz, length_in, width_in, height_in, unit_value FROM products WHERE id = ?",
-            (prod_id,),
-        ).fetchone()
-        w_oz, p_l, p_w, p_h, p_val = prod_row
+        w_oz, p_l, p_w, p_h, p_val = refs.products[prod_id]
 
         total_weight_oz = w_oz * qty
         height = p_h * qty  # stack vertically
         declared = round(p_val * qty, 2)
 
         dest = random.choice(DESTINATIONS)
-        dest_addr = random.choice(dest_addr_ids) if dest_addr_ids else None
+        dest_addr = random.choice(refs.dest_addr_ids) if refs.dest_addr_ids else None
         is_res = random.choice([0, 0, 1])
         zone = dest[3]
 
@@ -719,21 +612,15 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
 
         status = "awaiting_shipment" if random.random() < 0.7 else "shipped"
 
-        cur.execute(
-            "INSERT INTO orders (order_number, client_id, order_date, status, ship_to_address_id, "
-            "is_residential, declared_value, total_weight_oz, length_in, width_in, height_in, zone, service_requested) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'ground')",
-            (order_num, cid, order_date, status, dest_addr, is_res, declared, total_weight_oz, p_l, p_w, height, zone),
+        ord_id = rows.add(
+            "orders",
+            "order_number, client_id, order_date, status, ship_to_address_id, "
+            "is_residential, declared_value, total_weight_oz, length_in, width_in, height_in, zone, service_requested",
+            order_num, cid, order_date, status, dest_addr, is_res, declared, total_weight_oz, p_l, p_w, height, zone, "ground",
         )
-        ord_id = cur.lastrowid
-        order_count += 1
 
         # Order items
-        cur.execute(
-            "INSERT INTO order_items (order_id, product_id, quantity, unit_price) VALUES (?, ?, ?, ?)",
-            (ord_id, prod_id, qty, p_val),
-        )
-        order_item_count += 1
+        rows.add("order_items", "order_id, product_id, quantity, unit_price", ord_id, prod_id, qty, p_val)
 
         # Generate 4 rates per order (one per parcel carrier)
         weight_lbs = total_weight_oz / 16.0
@@ -743,11 +630,9 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         zone_mult = 1.0 + (zone - 2) * 0.08
         base *= zone_mult
 
-        cheapest_rate_id = None
-        cheapest_total = float("inf")
-
+        order_rates = []
         for carr_name, carr_code, _, _, _, factor, days in PARCEL_CARRIERS:
-            crid = carrier_ids[carr_code]
+            crid = refs.carrier_ids[carr_code]
 
             # Carrier-specific adjustments
             if carr_code == "USPS" and weight_lbs > 15:
@@ -773,61 +658,42 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
             svc_code = f"{carr_code.lower()}_ground"
             svc_name = f"{carr_name} Ground" if "USPS" not in carr_name else "USPS Priority Mail"
 
-            cur.execute(
-                "INSERT INTO rates (order_id, carrier_id, service_code, service_name, base_rate, "
-                "fuel_surcharge, residential_surcharge, total_amount, billable_weight_lbs, "
-                "delivery_days, delivery_date, zone, is_cheapest) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
-                (ord_id, crid, svc_code, svc_name, rate, fuel, res_surcharge, total, round(billable, 2), transit, del_date, zone),
-            )
-            if total < cheapest_total:
-                cheapest_total = total
-                cheapest_rate_id = cur.lastrowid
-            rate_count += 1
+            order_rates.append([ord_id, crid, svc_code, svc_name, rate, fuel, res_surcharge, total, round(billable, 2), transit, del_date, zone, 0])
 
-        # Mark cheapest
-        if cheapest_rate_id:
-            cur.execute("UPDATE rates SET is_cheapest = 1 WHERE id = ?", (cheapest_rate_id,))
+        # Mark cheapest (the first of equal totals)
+        cheapest = min(order_rates, key=lambda r: r[7])
+        cheapest[12] = 1
+        for rate_row in order_rates:
+            rate_id = rows.add("rates", rate_columns, *rate_row)
+            if rate_row is cheapest:
+                cheapest_rate_id = rate_id
 
         # Create label for shipped orders
-        if status == "shipped" and cheapest_rate_id:
-            rate_row = cur.execute(
-                "SELECT carrier_id, service_name, total_amount FROM rates WHERE id = ?",
-                (cheapest_rate_id,),
-            ).fetchone()
+        if status == "shipped":
             tracking = _ups_tracking()  # simplified
-            cur.execute(
-                "INSERT INTO labels (order_id, rate_id, tracking_number, carrier_id, service_name, cost) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (ord_id, cheapest_rate_id, tracking, rate_row[0], rate_row[1], rate_row[2]),
+            rows.add(
+                "labels", "order_id, rate_id, tracking_number, carrier_id, service_name, cost",
+                ord_id, cheapest_rate_id, tracking, cheapest[1], cheapest[3], cheapest[7],
             )
-            label_count += 1
-
-    counts["orders"] = order_count
-    counts["order_items"] = order_item_count
-    counts["rates"] = rate_count
-    counts["labels"] = label_count
 
-    # ── 14. Chargebacks + evidence_files + disputes ──
-    cb_count = 0
-    ev_count = 0
-    disp_count = 0
 
-    for i in range(35):
+def _seed_chargebacks(rows: _ShardWriter, refs: _Refs) -> None:
+    """Chargebacks + evidence_files + disputes."""
+    first = rows.shard * PER_SHARD["chargebacks"]
+    for i in range(first, first + PER_SHARD["chargebacks"]):
         ret_code = random.choice(list(RETAILER_VIOLATIONS.keys()))
-        ret_id = retailer_ids[ret_code]
-        ret_row = cur.execute("SELECT dispute_window_days FROM retailers WHERE id = ?", (ret_id,)).fetchone()
-        window = ret_row[0]
+        ret_id = refs.retailer_ids[ret_code]
+        window = refs.retailer_windows[ret_id]
 
-        client_code = random.choice(list(client_ids.keys()))
-        cid = client_ids[client_code]
+        client_code = random.choice(list(refs.client_ids.keys()))
+        cid = refs.client_ids[client_code]
         violation = random.choice(RETAILER_VIOLATIONS[ret_code])
 
         carrier_code = random.choice(["UPS", "FEDEX", "XPO", "ESTES", "ODFL"])
-        crid = carrier_ids[carrier_code]
+        crid = refs.carrier_ids[carrier_code]
 
         amount = round(random.uniform(200, 15000), 2)
-        cb_date = base_date + timedelta(days=random.randint(-10, 10))
+        cb_date = refs.base_date + timedelta(days=random.randint(-10, 10))
         deadline = cb_date + timedelta(days=window)
         ship_date = cb_date - timedelta(days=random.randint(5, 15))
         del_date = ship_date + timedelta(days=random.randint(3, 8))
@@ -859,21 +725,17 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         else:
             tracking = f"PRO-{random.randint(100000, 999999)}"
 
-        cur.execute(
-            "INSERT INTO chargebacks (chargeback_number, retailer_id, client_id, carrier_id, po_number, "
+        cb_id = rows.add(
+            "chargebacks",
+            "chargeback_number, retailer_id, client_id, carrier_id, po_number, "
             "shipment_id, bol_number, violation_code, chargeback_amount, chargeback_date, dispute_deadline, "
-            "ship_date, delivery_date, tracking_number, units_shipped, cartons, pallets, status) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                cb_num, ret_id, cid, crid, po_num, sh_num, bol_num, violation,
-                amount, cb_date.strftime("%Y-%m-%d"), deadline.strftime("%Y-%m-%d"),
-                ship_date.strftime("%Y-%m-%d"), del_date.strftime("%Y-%m-%d"),
-                tracking, random.randint(24, 5000), random.randint(2, 120), random.randint(1, 12),
-                cb_status,
-            ),
+            "ship_date, delivery_date, tracking_number, units_shipped, cartons, pallets, status",
+            cb_num, ret_id, cid, crid, po_num, sh_num, bol_num, violation,
+            amount, cb_date.strftime("%Y-%m-%d"), deadline.strftime("%Y-%m-%d"),
+            ship_date.strftime("%Y-%m-%d"), del_date.strftime("%Y-%m-%d"),
+            tracking, random.randint(24, 5000), random.randint(2, 120), random.randint(1, 12),
+            cb_status,
         )
-        cb_id = cur.lastrowid
-        cb_count += 1
 
         # Evidence files (2-4 per chargeback)
         evidence_types = [
@@ -890,12 +752,10 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         selected_evidence = random.sample(evidence_types, k=min(n_evidence, len(evidence_types)))
         for etype, fname, desc, source in selected_evidence:
             auto = 1 if random.random() > 0.2 else 0
-            cur.execute(
-                "INSERT INTO evidence_files (chargeback_id, evidence_type, file_name, description, source, url, is_auto_compiled) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (cb_id, etype, fname, desc, source, f"https://files.allpointsatl.com/evidence/{fname}", auto),
+            rows.add(
+                "evidence_files", "chargeback_id, evidence_type, file_name, description, source, url, is_auto_compiled",
+                cb_id, etype, fname, desc, source, f"https://files.allpointsatl.com/evidence/{fname}", auto,
             )
-            ev_count += 1
 
         # Disputes (for disputed/won/lost chargebacks)
         if cb_status in ("disputed", "won", "lost"):
@@ -911,25 +771,25 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
                 f"We have attached supporting evidence demonstrating compliance with the stated requirements.\n\n"
                 f"Regards,\nAll Points ATL Compliance Department"
             )
-            cur.execute(
-                "INSERT INTO disputes (chargeback_id, dispute_reference, letter_subject, letter_body, "
-                "evidence_count, submitted_at, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (cb_id, d_ref, subject, body, n_evidence, submitted, d_status),
+            rows.add(
+                "disputes",
+                "chargeback_id, dispute_reference, letter_subject, letter_body, evidence_count, submitted_at, status",
+                cb_id, d_ref, subject, body, n_evidence, submitted, d_status,
             )
-            disp_count += 1
 
-    counts["chargebacks"] = cb_count
-    counts["evidence_files"] = ev_count
-    counts["disputes"] = disp_count
 
-    # ── 15. LTL quotes + bookings ──
-    ltl_quote_count = 0
-    ltl_booking_count = 0
-    ltl_carrier_codes = ["XPO", "ESTES", "ODFL", "ABF", "YRC"]
-
-    for i in range(55):
-        client_code = random.choice(list(client_ids.keys()))
-        cid = client_ids[client_code]
+def _seed_ltl(rows: _ShardWriter, refs: _Refs) -> None:
+    """LTL quotes + bookings."""
+    quote_columns = (
+        "quote_number, client_id, carrier_id, origin_zip, destination_zip, "
+        "weight_lbs, freight_class, pieces, base_rate, fuel_surcharge, accessorials, total_cost, "
+        "transit_days, estimated_delivery, valid_until, is_cheapest"
+    )
+    base_date = refs.base_date
+    first = rows.shard * PER_SHARD["ltl_groups"]
+    for i in range(first, first + PER_SHARD["ltl_groups"]):
+        client_code = random.choice(list(refs.client_ids.keys()))
+        cid = refs.client_ids[client_code]
         dest = random.choice(DESTINATIONS)
         weight = random.randint(300, 12000)
         fclass = random.choice(["50", "65", "70", "85", "100", "125", "150"])
@@ -940,12 +800,9 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         class_mult = FREIGHT_CLASS_MULTIPLIERS.get(fclass, 1.0)
 
         # Generate a quote from each LTL carrier
-        cheapest_qid = None
-        cheapest_cost = float("inf")
         group_quotes = []
-
         for carr_name, carr_code, _, _, _, factor, days in LTL_CARRIERS:
-            crid = carrier_ids[carr_code]
+            crid = refs.carrier_ids[carr_code]
             base = weight * 0.35 * class_mult * factor
             base *= random.uniform(0.96, 1.04)
             fuel = base * 0.22
@@ -957,28 +814,19 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
             valid = (base_date + timedelta(days=7)).strftime("%Y-%m-%d")
             q_num = f"QT-{carr_code}-{20260200 + i:08d}{random.randint(100,999)}"
 
-            cur.execute(
-                "INSERT INTO ltl_quotes (quote_number, client_id, carrier_id, origin_zip, destination_zip, "
-                "weight_lbs, freight_class, pieces, base_rate, fuel_surcharge, accessorials, total_cost, "
-                "transit_days, estimated_delivery, valid_until, is_cheapest) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
-                (q_num, cid, crid, origin_zip, dest_zip, weight, fclass, pieces,
-                 round(base, 2), round(fuel, 2), accessorials, total, transit, est_del, valid),
-            )
-            qid = cur.lastrowid
-            group_quotes.append(qid)
-            ltl_quote_count += 1
+            group_quotes.append([q_num, cid, crid, origin_zip, dest_zip, weight, fclass, pieces,
+                                 round(base, 2), round(fuel, 2), accessorials, total, transit, est_del, valid, 0])
 
-            if total < cheapest_cost:
-                cheapest_cost = total
+        # Mark cheapest (the first of equal totals)
+        cheapest = min(group_quotes, key=lambda q: q[11])
+        cheapest[15] = 1
+        for quote in group_quotes:
+            qid = rows.add("ltl_quotes", quote_columns, *quote)
+            if quote is cheapest:
                 cheapest_qid = qid
 
-        # Mark cheapest
-        if cheapest_qid:
-            cur.execute("UPDATE ltl_quotes SET is_cheapest = 1 WHERE id = ?", (cheapest_qid,))
-
         # Book ~40% of quote groups
-        if random.random() < 0.40 and cheapest_qid:
+        if random.random() < 0.40:
             pickup = (base_date + timedelta(days=random.randint(1, 5))).strftime("%Y-%m-%d")
             bol = f"BOL-{20260200 + i}{random.randint(10,99)}"
             pro = f"PRO-{100000 + i}"
@@ -989,68 +837,40 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
 
             bk_status = random.choice(["confirmed", "confirmed", "picked_up", "in_transit", "delivered"])
 
-            cur.execute(
-                "INSERT INTO ltl_bookings (quote_id, bol_number, pro_number, confirmation_number, "
+            rows.add(
+                "ltl_bookings",
+                "quote_id, bol_number, pro_number, confirmation_number, "
                 "pickup_date, shipper_name, shipper_phone, shipper_email, shipper_address, "
-                "consignee_name, consignee_phone, consignee_email, consignee_address, status) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    cheapest_qid, bol, pro, conf, pickup,
-                    shipper_name, "(404) 555-0100", "shipping@allpointsatl.com",
-                    "1000 Logistics Parkway, Atlanta, GA 30318",
-                    consignee, fake.phone_number(), fake.company_email(),
-                    f"{fake.street_address()}, {dest[0]}, {dest[1]} {dest[2]}",
-                    bk_status,
-                ),
+                "consignee_name, consignee_phone, consignee_email, consignee_address, status",
+                cheapest_qid, bol, pro, conf, pickup,
+                shipper_name, "(404) 555-0100", "shipping@allpointsatl.com",
+                "1000 Logistics Parkway, Atlanta, GA 30318",
+                consignee, fake.phone_number(), fake.company_email(),
+                f"{fake.street_address()}, {dest[0]}, {dest[1]} {dest[2]}",
+                bk_status,
             )
-            ltl_booking_count += 1
 
-    counts["ltl_quotes"] = ltl_quote_count
-    counts["ltl_bookings"] = ltl_booking_count
 
-    # ── 16. Inventory + receiving records ──
-    inv_count = 0
-    recv_count = 0
-    recv_item_count = 0
+# Receiving records — some with discrepancies (Michael's go-to example)
+DISCREPANCY_NOTES = [
+    "2 units crushed in transit",
+    "Outer carton damaged, contents intact — count verified short",
+    "Pallet wrap torn, 5 units missing from top layer",
+    "Vendor confirmed short-ship — replacement PO issued",
+    "Water damage to bottom carton — 3 units unsalvageable",
+    "Miscount by vendor — actual quantity verified by receiving team",
+    None,  # No issue
+    None,
+    None,
+]
 
-    # Inventory levels for every product
-    bin_aisles = ["A", "B", "C", "D", "E"]
-    for code, pids in product_ids.items():
-        cid = client_ids[code]
-        for idx, pid in enumerate(pids):
-            on_hand = random.randint(20, 800)
-            allocated = random.randint(0, min(on_hand, on_hand // 3))
-            aisle = random.choice(bin_aisles)
-            rack = random.randint(1, 12)
-            shelf = random.randint(1, 4)
-            bin_loc = f"{aisle}-{rack:02d}-{shelf:02d}"
-            last_counted = (today - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d")
-            last_recv = (today - timedelta(days=random.randint(1, 21))).strftime("%Y-%m-%d")
-            cur.execute(
-                "INSERT INTO inventory (product_id, client_id, quantity_on_hand, quantity_allocated, "
-                "bin_location, last_counted, last_received) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (pid, cid, on_hand, allocated, bin_loc, last_counted, last_recv),
-            )
-            inv_count += 1
-    counts["inventory"] = inv_count
-
-    # Receiving records — some with discrepancies (Michael's go-to example)
-    DISCREPANCY_NOTES = [
-        "2 units crushed in transit",
-        "Outer carton damaged, contents intact — count verified short",
-        "Pallet wrap torn, 5 units missing from top layer",
-        "Vendor confirmed short-ship — replacement PO issued",
-        "Water damage to bottom carton — 3 units unsalvageable",
-        "Miscount by vendor — actual quantity verified by receiving team",
-        None,  # No issue
-        None,
-        None,
-    ]
 
-    for i in range(40):
-        client_code = random.choice(list(client_ids.keys()))
-        cid = client_ids[client_code]
-        recv_date = (today - timedelta(days=random.randint(0, 28))).strftime("%Y-%m-%d")
+def _seed_receiving(rows: _ShardWriter, refs: _Refs) -> None:
+    first = rows.shard * PER_SHARD["receiving"]
+    for i in range(first, first + PER_SHARD["receiving"]):
+        client_code = random.choice(list(refs.client_ids.keys()))
+        cid = refs.client_ids[client_code]
+        recv_date = (refs.today - timedelta(days=random.randint(0, 28))).strftime("%Y-%m-%d")
         po = f"IPO-{600000 + i}"
         carrier = random.choice(["UPS Freight", "FedEx Freight", "XPO Logistics", "Estes Express", "FedEx Ground"])
         tracking = _ups_tracking() if "UPS" in carrier else _fedex_tracking()
@@ -1059,16 +879,13 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
         has_disc = random.random() < 0.30
         rec_status = "discrepancy" if has_disc else "completed"
 
-        cur.execute(
-            "INSERT INTO receiving_records (client_id, po_number, received_date, carrier, tracking_number, status) "
-            "VALUES (?, ?, ?, ?, ?, ?)",
-            (cid, po, recv_date, carrier, tracking, rec_status),
+        recv_id = rows.add(
+            "receiving_records", "client_id, po_number, received_date, carrier, tracking_number, status",
+            cid, po, recv_date, carrier, tracking, rec_status,
         )
-        recv_id = cur.lastrowid
-        recv_count += 1
 
         # 1-4 line items per receiving record
-        prods = product_ids[client_code]
+        prods = refs.product_ids[client_code]
         n_items = random.randint(1, 4)
         for _ in range(n_items):
             pid = random.choice(prods)
@@ -1083,15 +900,341 @@ def seed_all(conn: sqlite3.Connection) -> dict[str, int]:
                 received = expected
                 damaged = 0
                 note = None
-            cur.execute(
-                "INSERT INTO receiving_items (receiving_id, product_id, quantity_expected, "
-                "quantity_received, quantity_damaged, notes) VALUES (?, ?, ?, ?, ?, ?)",
-                (recv_id, pid, expected, received, damaged, note),
+            rows.add(
+                "receiving_items",
+                "receiving_id, product_id, quantity_expected, quantity_received, quantity_damaged, notes",
+                recv_id, pid, expected, received, damaged, note,
+            )
+
+
+def _seed_base(seed: int, today: datetime) -> tuple[dict, _Refs]:
+    """Shard 0: reference data interleaved with the first unit of transactional rows."""
+    random.seed(seed)
+    Faker.seed(seed)
+    rows = _ShardWriter(0)
+    refs = _Refs(today=today)
+
+    # ── 1. Clients ──
+    for name, code, industry in CLIENTS:
+        email = f"info@{code.lower()}brand.com"
+        phone = fake.phone_number()
+        website = f"https://www.{code.lower()}brand.com"
+        refs.client_ids[code] = rows.add(
+            "clients", "name, code, industry, contact_email, contact_phone, website",
+            name, code, industry, email, phone, website,
+        )
+
+    # ── 2. Contacts ──
+    # Client contacts (5-6 per client)
+    for code, cid in refs.client_ids.items():
+        for _ in range(random.randint(5, 6)):
+            fn, ln = fake.first_name(), fake.last_name()
+            role = random.choice(["Logistics Manager", "Account Manager", "Shipping Coordinator", "Operations Director", "Warehouse Manager", "VP Supply Chain"])
+            refs.contact_ids.append(rows.add(
+                "contacts", "client_id, first_name, last_name, email, phone, role, contact_type",
+                cid, fn, ln, f"{fn.lower()}.{ln.lower()}@{code.lower()}brand.com", fake.phone_number(), role, "client",
+            ))
+    _seed_end_customers(rows, refs)
+
+    # ── 3. Addresses ──
+    address_columns = "client_id, label, street1, city, state, zip_code, is_residential, address_type"
+    # All Points warehouse (origin)
+    refs.warehouse_addr_ids.append(rows.add(
+        "addresses", address_columns,
+        None, "warehouse", "1000 Logistics Parkway", "Atlanta", "GA", "30318", 0, "warehouse",
+    ))
+    # Second warehouse dock
+    refs.warehouse_addr_ids.append(rows.add(
+        "addresses", address_columns,
+        None, "warehouse", "1002 Logistics Parkway, Dock B", "Atlanta", "GA", "30318", 0, "origin",
+    ))
+    # Client HQ addresses
+    for code, cid in refs.client_ids.items():
+        city, state, zipcode = fake.city(), fake.state_abbr(), fake.zipcode()
+        rows.add(
+            "addresses", address_columns,
+            cid, "primary", fake.street_address(), city, state, zipcode, 0, "billing",
+        )
+    _seed_destinations(rows, refs)
+
+    # ── 4. Products ──
+    for code, items in PRODUCT_CATALOG.items():
+        cid = refs.client_ids[code]
+        refs.product_ids[code] = []
+        for sku, name, weight_oz, l, w, h, value, fclass in items:
+            pid = rows.add(
+                "products", "client_id, sku, name, weight_oz, length_in, width_in, height_in, unit_value, freight_class",
+                cid, sku, name, weight_oz, l, w, h, value, fclass,
             )
-            recv_item_count += 1
+            refs.product_ids[code].append(pid)
+            refs.products[pid] = (weight_oz, l, w, h, value)
+
+    # ── 5. Carriers ──
+    for name, code, ctype, acct, tier, factor, days in ALL_CARRIERS:
+        refs.carrier_ids[code] = rows.add(
+            "carriers", "name, code, carrier_type, account_number, contract_tier, pricing_factor, transit_days",
+            name, code, ctype, acct, tier, factor, days,
+        )
+
+    # ── 6. Employees ──
+    for role, dept in EMPLOYEE_ROLES:
+        fn, ln = fake.first_name(), fake.last_name()
+        hire = fake.date_between(start_date="-3y", end_date="-3m").isoformat()
+        rate = round(random.uniform(15.0, 28.0), 2)
+        if "Lead" in role or "Manager" in role or "Coordinator" in role:
+            rate = round(random.uniform(22.0, 35.0), 2)
+        emp_id = rows.add(
+            "employees", "first_name, last_name, email, role, department, hourly_rate, hire_date",
+            fn, ln, f"{fn.lower()}.{ln.lower()}@allpointsatl.com", role, dept, rate, hire,
+        )
+        refs.employee_ids.append((emp_id, dept))
+
+    # ── 7. Retailers ──
+    for name, code, portal, window in RETAILERS:
+        refs.retailer_ids[code] = rows.add(
+            "retailers", "name, code, portal_name, dispute_window_days", name, code, portal, window,
+        )
+        refs.retailer_windows[refs.retailer_ids[code]] = window
 
-    counts["receiving_records"] = recv_count
-    counts["receiving_items"] = recv_item_count
+    # ── 8-9. Shipments, emails ──
+    _seed_shipments(rows, refs)
+    _seed_emails(rows, refs)
 
+    # ── 10. Email templates ──
+    templates = [
+        ("tracking_request", "Tracking Auto-Reply", "Re: {subject}",
+         "Hi {sender_name},\n\nThank you for reaching out! Your order {order_number} is currently {status}. "
+         "Track your package here: {tracking_url}\n\nBest,\nAll Points ATL Customer Service"),
+        ("delivery_confirmation", "Delivery Confirmation Reply", "Re: {subject}",
+         "Hi {sender_name},\n\nYour order {order_number} was delivered on {delivery_date}. "
+         "If you have not received it, please reply to this email.\n\nBest,\nAll Points ATL Customer Service"),
+        ("shipping_issue", "Shipping Issue Acknowledgement", "Re: {subject} - We're on it",
+         "Hi {sender_name},\n\nWe're sorry to hear about the issue with your shipment. "
+         "A team member will investigate and follow up within 24 hours.\n\nAll Points ATL Customer Service"),
+        ("billing_question", "Billing Inquiry Received", "Re: {subject}",
+         "Hi {sender_name},\n\nWe've received your billing inquiry and our accounts team will respond within 1-2 business days.\n\nAll Points ATL"),
+        ("inventory_question", "Inventory Inquiry", "Re: {subject}",
+         "Hi {sender_name},\n\nThank you for your interest. We're checking current stock levels and will get back to you shortly.\n\nAll Points ATL"),
+        ("complex_issue", "Escalation Received", "Re: {subject} - Escalated",
+         "Hi {sender_name},\n\nYour request has been escalated to our operations team. "
+         "You'll hear from a dedicated representative within 4 business hours.\n\nAll Points ATL"),
+    ]
+    for cat, tname, subj, body in templates:
+        rows.add("email_templates", "category, template_name, subject_template, body_template", cat, tname, subj, body)
+
+    # ── 11-12. Labor entries, invoices ──
+    _plan_invoices(rows, refs, _seed_labor(rows, refs))
+
+    # ── 13-15. Orders, chargebacks, LTL ──
+    _seed_orders(rows, refs)
+    _seed_chargebacks(rows, refs)
+    _seed_ltl(rows, refs)
+
+    # ── 16. Inventory + receiving records ──
+    # Inventory levels for every product
+    bin_aisles = ["A", "B", "C", "D", "E"]
+    for code, pids in refs.product_ids.items():
+        cid = refs.client_ids[code]
+        for idx, pid in enumerate(pids):
+            on_hand = random.randint(20, 800)
+            allocated = random.randint(0, min(on_hand, on_hand // 3))
+            aisle = random.choice(bin_aisles)
+            rack = random.randint(1, 12)
+            shelf = random.randint(1, 4)
+            bin_loc = f"{aisle}-{rack:02d}-{shelf:02d}"
+            last_counted = (today - timedelta(days=random.randint(1, 30))).strftime("%Y-%m-%d")
+            last_recv = (today - timedelta(days=random.randint(1, 21))).strftime("%Y-%m-%d")
+            rows.add(
+                "inventory",
+                "product_id, client_id, quantity_on_hand, quantity_allocated, bin_location, last_counted, last_received",
+                pid, cid, on_hand, allocated, bin_loc, last_counted, last_recv,
+            )
+    _seed_receiving(rows, refs)
+
+    return rows.dump(), refs
+
+
+def _seed_shard(shard: int, seed: int, refs: _Refs) -> dict:
+    """Shards 1..N-1: one more unit of transactional rows on top of shard 0."""
+    random.seed(seed)
+    Faker.seed(seed)
+    rows = _ShardWriter(shard)
+    # This shard's customers and destinations join shard 0's in the pools it draws from
+    refs = replace(
+        refs,
+        contact_ids=list(refs.contact_ids),
+        dest_addr_ids=list(refs.dest_addr_ids),
+        address_zips=dict(refs.address_zips),
+    )
+    _seed_end_customers(rows, refs)
+    _seed_destinations(rows, refs)
+    _seed_shipments(rows, refs)
+    _seed_emails(rows, refs)
+    _seed_labor(rows, refs)
+    _seed_orders(rows, refs)
+    _seed_chargebacks(rows, refs)
+    _seed_ltl(rows, refs)
+    _seed_receiving(rows, refs)
+    return rows.dump()
+
+
+def _write_shard(shard: int, seed: int, refs: _Refs, out_dir: str) -> Path:
+    """Worker entry point: generate a shard and save it as a column-major pickle."""
+    path = Path(out_dir) / f"shard-{shard:06d}.pickle"
+    with open(path, "wb") as f:
+        pickle.dump(_seed_shard(shard, seed, refs), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_shard(path: Path) -> dict:
+    with open(path, "rb") as f:
+        shard = pickle.load(f)
+    path.unlink()
+    return shard
+
+
+# ── Loading ─────────────────────────────────────────────────────
+
+class _ShardLoader:
+    """Writes shards in order, turning shard-local ids into final ones."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.counts: dict[str, int] = {}
+        self._foreign_keys: dict[str, dict[str, str]] = {}
+        self._base: dict[str, int] = {}  # table → id offset of the shard being loaded
+
+    def load(self, shard: dict) -> None:
+        for table, (names, columns) in shard["tables"].items():
+            self._base[table] = self.counts.get(table, 0)
+            if shard["shard"] > 0:
+                refs = self._references(table)
+                columns = [
+                    self._resolve(column, table if name == "id" else refs.get(name))
+                    for name, column in zip(names, columns)
+                ]
+            placeholders = ", ".join("?" * len(names))
+            self.conn.executemany(
+                f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})", zip(*columns),
+            )
+            self.counts[table] = self._base[table] + len(columns[0])
+
+    def _references(self, table: str) -> dict[str, str]:
+        if table not in self._foreign_keys:
+            self._foreign_keys[table] = {
+                row[3]: row[2] for row in self.conn.execute(f"PRAGMA foreign_key_list({table})")
+            }
+        return self._foreign_keys[table]
+
+    def _resolve(self, column: list, table: str | None) -> list:
+        """Negative ids are rows of ``table`` in the current shard."""
+        if table is None:
+            return column
+        base = self._base[table]
+        return [base - value if value is not None and value < 0 else value for value in column]
+
+
+def _write_invoices(conn: sqlite3.Connection, invoices: list[tuple], counts: dict[str, int]) -> None:
+    """Invoices + line items, priced from every shard's labor."""
+    invoice_count = 0
+    line_item_count = 0
+    for cid, inv_number, inv_date, due_date, status, payment_date, month_prefix, margin in invoices:
+        # Calculate labor cost for this client/month
+        labor = conn.execute(
+            "SELECT SUM(le.hours * e.hourly_rate) as total, SUM(le.hours) as hrs "
+            "FROM labor_entries le JOIN employees e ON le.employee_id = e.id "
+            "WHERE le.client_id = ? AND le.work_date LIKE ?",
+            (cid, f"{month_prefix}%"),
+        ).fetchone()
+        labor_total = labor[0] if labor[0] else 0
+        total_amount = round(labor_total * margin, 2)
+
+        inv_id = conn.execute(
+            "INSERT INTO invoices (client_id, invoice_number, invoice_date, due_date, total_amount, status, payment_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (cid, inv_number, inv_date, due_date, total_amount, status, payment_date),
+        ).lastrowid
+        invoice_count += 1
+
+        # Line items by service type
+        svc_rows = conn.execute(
+            "SELECT le.service_type, SUM(le.hours) as hrs, SUM(le.hours * e.hourly_rate) as cost "
+            "FROM labor_entries le JOIN employees e ON le.employee_id = e.id "
+            "WHERE le.client_id = ? AND le.work_date LIKE ? "
+            "GROUP BY le.service_type",
+            (cid, f"{month_prefix}%"),
+        ).fetchall()
+        line_items = []
+        for svc_type, svc_hrs, svc_cost in svc_rows:
+            line_amount = round(svc_cost * margin, 2)
+            desc = svc_type.replace("_", " ").title()
+            line_items.append((
+                inv_id, f"{desc} Services", svc_type, round(svc_hrs, 1),
+                round(line_amount / svc_hrs, 2) if svc_hrs else 0, line_amount,
+            ))
+        conn.executemany(
+            "INSERT INTO invoice_line_items (invoice_id, description, service_type, quantity, unit_price, amount) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            line_items,
+        )
+        line_item_count += len(line_items)
+    counts["invoices"] = invoice_count
+    counts["invoice_line_items"] = line_item_count
+
+
+@contextmanager
+def bulk_load(conn: sqlite3.Connection):
+    """Turn off the journal and fsyncs for a one-shot load into a fresh database.
+
+    A crash mid-load leaves a corrupt file, which is fine when the database
+    is being built from scratch anyway. The previous settings are restored
+    on exit.
+    """
+    synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = OFF")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+        conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {synchronous}")
+
+
+def seed_all(
+    conn: sqlite3.Connection,
+    scale: int = 1,
+    seed: int = 42,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Seed every table of a fresh database. Returns a dict of table→record_count.
+
+    ``scale`` is the number of shards: scale 1 is the standard demo data
+    set, and each extra shard adds another unit of shipments, emails,
+    orders, chargebacks, LTL quotes, receiving and labor. Shards 1..N-1
+    are generated by ``workers`` processes (default: one per CPU); the
+    rows depend only on ``scale`` and ``seed``.
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    base, refs = _seed_base(seed, today)
+    loader = _ShardLoader(conn)
+    loader.load(base)
+
+    shards = range(1, scale)
+    seeds = _shard_seeds(seed, scale)[1:]
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    if workers > 1:
+        with tempfile.TemporaryDirectory(prefix="allpoints-seed-") as tmp, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            paths = pool.map(_write_shard, shards, seeds, repeat(refs), repeat(tmp))
+            for path in paths:
+                loader.load(_read_shard(path))
+    else:
+        for shard, shard_seed in zip(shards, seeds):
+            loader.load(_seed_shard(shard, shard_seed, refs))
+
+    counts = dict(loader.counts)
+    _write_invoices(conn, base["invoices"], counts)
     conn.commit()
     return counts
@@ -0,0 +1,175 @@
+"""Compressed snapshots of seeded databases, so setup can skip reseeding.
+
+A snapshot is a ``VACUUM INTO`` copy of a freshly built database,
+gzip-compressed, plus a small JSON manifest. It is keyed on everything
+that determines the database's contents:
+
+- the schema hash: every ``.sql`` file under ``shared/database`` (schema,
+  rollups, search index, migrations), the Python that generates and builds
+  the data (the seed generator, ``shared/constants.py`` it draws from, the
+  rollup, search, version and migration modules, and ``setup_database.py``,
+  which orders the build steps) and the Faker version
+- the seed parameters, ``scale`` and ``seed``
+- the day it was seeded, because the generated dates are relative to today
+
+``setup_database.py`` restores a matching snapshot instead of seeding, and
+saves one after every fresh seed. Snapshots live in
+``shared/database/snapshots/`` unless ``ALLPOINTS_SNAPSHOT_DIR`` is set.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from datetime import date, datetime
+from importlib.metadata import version
+from pathlib import Path
+
+# Bumped when the snapshot file layout changes; older snapshots are ignored
+SNAPSHOT_FORMAT = 1
+
+SNAPSHOT_DIR = Path(os.environ.get("ALLPOINTS_SNAPSHOT_DIR") or Path(__file__).resolve().parent / "snapshots")
+
+# gzip level 1 shrinks a seeded database about 3x and decompresses at disk speed
+COMPRESS_LEVEL = 1
+
+_DATABASE_DIR = Path(__file__).resolve().parent
+_PROJECT_DIR = _DATABASE_DIR.parents[1]
+
+# Modules whose code decides what a freshly built database contains
+_BUILD_MODULES = [
+    _DATABASE_DIR / "seed_data.py",
+    _DATABASE_DIR.parent / "constants.py",
+    _DATABASE_DIR / "rollups.py",
+    _DATABASE_DIR / "search.py",
+    _DATABASE_DIR / "versions.py",
+    _DATABASE_DIR / "migrations" / "__init__.py",
+    _PROJECT_DIR / "setup_database.py",
+]
+_COPY_BUFFER = 1024 * 1024
+
+
+def schema_hash() -> str:
+    """SHA-256 of the SQL files, build modules and Faker version that make a database."""
+    sources = sorted(_DATABASE_DIR.rglob("*.sql")) + _BUILD_MODULES
+    digest = hashlib.sha256()
+    for path in sources:
+        digest.update(path.relative_to(_PROJECT_DIR).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    # The same seed yields different names and addresses across Faker releases
+    digest.update(f"faker=={version('faker')}".encode())
+    return digest.hexdigest()
+
+
+def snapshot_path(scale: int, seed: int, day: date | None = None) -> Path:
+    """Where the snapshot for these seed parameters is (or would be) stored."""
+    day = day or date.today()
+    return SNAPSHOT_DIR / (
+        f"allpoints-v{SNAPSHOT_FORMAT}-{day.isoformat()}-x{scale}-s{seed}-{schema_hash()[:16]}.db.gz"
+    )
+
+
+def _manifest_path(path: Path) -> Path:
+    return path.with_name(path.name.removesuffix(".db.gz") + ".json")
+
+
+def find(scale: int, seed: int) -> Path | None:
+    """Today's snapshot for ``scale``/``seed`` under the current schema, if there is one."""
+    path = snapshot_path(scale, seed)
+    manifest = _manifest_path(path)
+    if not path.exists() or not manifest.exists():
+        return None
+    meta = json.loads(manifest.read_text())
+    expected = {
+        "format": SNAPSHOT_FORMAT,
+        "schema_hash": schema_hash(),
+        "scale": scale,
+        "seed": seed,
+        "seeded_on": date.today().isoformat(),
+    }
+    if any(meta.get(key) != value for key, value in expected.items()):
+        return None
+    return path
+
+
+def save(db_path: str | Path, scale: int, seed: int) -> Path:
+    """Snapshot the database at ``db_path`` as seeded with ``scale``/``seed``."""
+    db_path = Path(db_path)
+    path = snapshot_path(scale, seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    copy = path.with_name(path.name + ".tmp.db")
+    copy.unlink(missing_ok=True)
+
+    # VACUUM INTO writes a compact, self-contained copy (no WAL) of the
+    # last committed state, without blocking readers of the original
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("VACUUM INTO ?", (str(copy),))
+        user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+    partial = path.with_name(path.name + ".tmp")
+    try:
+        with open(copy, "rb") as src, gzip.open(partial, "wb", compresslevel=COMPRESS_LEVEL) as dst:
+            shutil.copyfileobj(src, dst, _COPY_BUFFER)
+        db_bytes = copy.stat().st_size
+    finally:
+        copy.unlink(missing_ok=True)
+    os.replace(partial, path)
+
+    _manifest_path(path).write_text(json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "schema_hash": schema_hash(),
+        "scale": scale,
+        "seed": seed,
+        "seeded_on": date.today().isoformat(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "user_version": user_version,
+        "db_bytes": db_bytes,
+        "snapshot_bytes": path.stat().st_size,
+    }, indent=2) + "\n")
+    return path
+
+
+def restore(path: str | Path, db_path: str | Path) -> None:
+    """Replace the database at ``db_path`` with the snapshot at ``path``.
+
+    The snapshot is decompressed next to the database and renamed over it,
+    so a failed restore leaves the old file in place. Close every
+    connection to ``db_path`` first.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = db_path.with_name(db_path.name + ".restore")
+    try:
+        with gzip.open(path, "rb") as src, open(partial, "wb") as dst:
+            shutil.copyfileobj(src, dst, _COPY_BUFFER)
+        for suffix in ("-wal", "-shm"):
+            db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+        os.replace(partial, db_path)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def prune(keep: Path | None = None) -> list[Path]:
+    """Delete snapshots that can no longer match (older days, schemas or formats).
+
+    ``keep`` is never deleted. Returns the snapshot files removed.
+    """
+    if not SNAPSHOT_DIR.exists():
+        return []
+    current = f"-{schema_hash()[:16]}.db.gz"
+    today = f"allpoints-v{SNAPSHOT_FORMAT}-{date.today().isoformat()}-"
+    removed = []
+    for path in SNAPSHOT_DIR.glob("allpoints-*.db.gz"):
+        if path == keep or (path.name.startswith(today) and path.name.endswith(current)):
+            continue
+        path.unlink()
+        _manifest_path(path).unlink(missing_ok=True)
+        removed.append(path)
+    return removed
@@ -0,0 +1,83 @@
+"""Change counters for every base table.
+
+Each base table gets a row in ``rollup_versions`` and three triggers that
+bump it on insert, delete and update, in the same transaction as the write.
+Anything that caches query results in process (``shared/result_cache.py``,
+``clients.py``) compares the counters of the tables it read against the
+ones it saw when it cached, instead of polling the data itself.
+
+``rollups.rebuild()`` bumps every counter, which covers bulk loads that
+bypassed the triggers.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from .connection import get_db_path, write_connection
+
+VERSIONS_SQL = "SELECT table_name, version FROM rollup_versions"
+
+_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{suffix} AFTER {event} ON {table}
+BEGIN
+    UPDATE rollup_versions SET version = version + 1 WHERE table_name = '{table}';
+END;
+"""
+_EVENTS = (("ins", "INSERT"), ("del", "DELETE"), ("upd", "UPDATE"))
+
+
+def base_tables(conn: sqlite3.Connection) -> list[str]:
+    """Tables that hold data: not rollups, FTS shadow tables or SQLite internals."""
+    return [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'rollup_%' AND name NOT LIKE 'sqlite_%' "
+            "AND name NOT LIKE 'emails_fts%' ORDER BY name"
+        )
+    ]
+
+
+def is_installed(conn: sqlite3.Connection) -> bool:
+    """True if every base table has its version row and triggers."""
+    try:
+        versioned = {row[0] for row in conn.execute(VERSIONS_SQL)}
+    except sqlite3.OperationalError:
+        return False
+    triggers = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_version_%'"
+        )
+    }
+    return all(
+        table in versioned and f"trg_version_{table}_upd" in triggers
+        for table in base_tables(conn)
+    )
+
+
+def install(conn: sqlite3.Connection) -> None:
+    """Add version rows and triggers for every base table (idempotent) and commit.
+
+    Needs ``rollup_versions``, which ``rollups.install()`` creates.
+    """
+    with conn:
+        for table in base_tables(conn):
+            conn.execute(
+                "INSERT OR IGNORE INTO rollup_versions (table_name, version) VALUES (?, 0)", (table,)
+            )
+            for suffix, event in _EVENTS:
+                conn.execute(_TRIGGER.format(table=table, suffix=suffix, event=event))
+
+
+def ensure_installed(db_path: str | Path | None = None) -> bool:
+    """Install version counters into an existing database that predates them.
+
+    Returns True if they were installed now, False if already present or the
+    database does not exist yet.
+    """
+    if not Path(db_path or get_db_path()).exists():
+        return False
+    with write_connection(db_path) as conn:
+        if is_installed(conn):
+            return False
+        install(conn)
+    return True
@@ -1,62 +1,215 @@
-"""Output formatters for MCP tool responses: JSON, CSV, and Markdown."""
+"""Output formatters for MCP tool responses: JSON, NDJSON, CSV, and Markdown.
+
+``iter_output()`` is the streaming core: it takes any iterable of rows (a
+list of dicts, a generator, or an executed ``sqlite3.Cursor``) and yields
+the formatted text in chunks, holding one row at a time. ``format_output()``
+joins those chunks into the string an MCP tool returns; ``write_output()``
+writes them to a file for exports that should run in constant memory.
+JSON text comes from ``shared.serialization``, compact unless configured.
+"""
 
 import csv
 import io
-import json
-from typing import Any
+import sqlite3
+from itertools import chain
+from typing import Any, Iterable, Iterator, Mapping, TextIO
+
+from shared import metrics, serialization
+
+# Rows per yielded chunk: large enough to amortize the per-chunk overhead,
+# small enough that a chunk stays a few tens of KB
+CHUNK_ROWS = 100
 
 
 def format_output(
-    rows: list[dict[str, Any]],
+    rows: Iterable[Mapping[str, Any]],
     columns: list[str] | None = None,
     fmt: str = "json",
 ) -> str:
-    """Format query results as JSON, CSV, or Markdown table.
+    """Format query results as JSON, NDJSON, CSV, or Markdown table.
 
     Args:
-        rows: List of dictionaries (each dict is one row).
+        rows: Rows as dicts or ``sqlite3.Row`` (a list, iterator, or cursor).
         columns: Column names to include (default: all keys from first row).
-        fmt: Output format — "json", "csv", or "markdown".
+        fmt: Output format — "json", "ndjson", "csv", or "markdown".
 
     Returns:
         Formatted string.
     """
-    if not rows:
-        if fmt == "json":
-            return json.dumps({"results": [], "count": 0}, indent=2)
-        if fmt == "csv":
-            return ""
-        return "_No results._"
+    with metrics.phase("format"):
+        if fmt == "json" and isinstance(rows, list) and rows and isinstance(rows[0], dict):
+            # Already materialized: one dumps call beats dumping row by row
+            if columns is not None:
+                rows = [_project(row, columns) for row in rows]
+            return serialization.dumps({"results": rows, "count": len(rows)})
+        return "".join(iter_output(rows, columns, fmt))
 
-    if columns is None:
-        columns = list(rows[0].keys())
 
-    filtered = [{col: row.get(col) for col in columns} for row in rows]
+def write_output(
+    rows: Iterable[Mapping[str, Any]],
+    fp: TextIO,
+    columns: list[str] | None = None,
+    fmt: str = "json",
+) -> int:
+    """Stream formatted rows to ``fp``; returns the number of characters written."""
+    written = 0
+    for chunk in iter_output(rows, columns, fmt):
+        written += fp.write(chunk)
+    return written
+
+
+def iter_output(
+    rows: Iterable[Mapping[str, Any]],
+    columns: list[str] | None = None,
+    fmt: str = "json",
+) -> Iterator[str]:
+    """Yield the formatted output in chunks, consuming ``rows`` lazily.
+
+    Produces exactly the text ``format_output`` returns. A cursor without a
+    row factory yields tuples; they are named from ``cursor.description``.
+    """
+    rows = _mappings(rows)
+    first = next(rows, None)
+    if first is None:
+        yield _EMPTY[fmt] if fmt in _EMPTY else serialization.dumps({"results": [], "count": 0})
+        return
+    if columns is None:
+        columns = list(first.keys())
+    rows = chain([first], rows)
 
     if fmt == "csv":
-        return _to_csv(filtered, columns)
-    if fmt == "markdown":
-        return _to_markdown(filtered, columns)
-    return _to_json(filtered)
+        yield from _iter_csv(rows, columns)
+    elif fmt == "markdown":
+        yield from _iter_markdown(rows, columns)
+    elif fmt == "ndjson":
+        yield from _iter_ndjson(rows, columns)
+    else:
+        yield from _iter_json(rows, columns)
+
+
+def format_page(
+    rows: list[dict[str, Any]],
+    next_cursor: str | None,
+    fmt: str = "json",
+    columns: list[str] | None = None,
+) -> str:
+    """Format one page of a paginated tool, with its continuation token.
+
+    JSON gets a ``next_cursor`` key (null on the last page); CSV and
+    Markdown get a trailing ``next_cursor:`` line when there are more rows.
+    """
+    with metrics.phase("format"):
+        if fmt == "json":
+            if rows and columns is not None:
+                rows = [{col: row.get(col) for col in columns} for row in rows]
+            return serialization.dumps({"results": rows, "count": len(rows), "next_cursor": next_cursor})
+        text = format_output(rows, columns, fmt)
+        if next_cursor:
+            text += f"\n\nnext_cursor: {next_cursor}"
+        return text
+
+
+# Output for no rows; JSON (the fallback for unknown formats) is built by dumps()
+_EMPTY = {
+    "ndjson": "",
+    "csv": "",
+    "markdown": "_No results._",
+}
+
+
+def _mappings(rows: Iterable) -> Iterator[Mapping[str, Any]]:
+    """Rows as mappings; plain tuples from a cursor are keyed by its description."""
+    if isinstance(rows, sqlite3.Cursor) and rows.row_factory is None:
+        names = [d[0] for d in rows.description or ()]
+        return (dict(zip(names, row)) for row in rows)
+    return (row if isinstance(row, Mapping) else _RowMapping(row) for row in rows)
+
+
+class _RowMapping(Mapping):
+    """Read-only mapping view of a ``sqlite3.Row`` (which is not a Mapping)."""
+
+    __slots__ = ("_row",)
+
+    def __init__(self, row: sqlite3.Row):
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._row[key]
+        except IndexError:
+            # sqlite3.Row raises IndexError for a missing name; Mapping.get wants KeyError
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._row.keys())
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+
+def _project(row: Mapping[str, Any], columns: list[str]) -> dict[str, Any]:
+    return {col: row.get(col) for col in columns}
+
+
+def _chunked(pieces: Iterable[str]) -> Iterator[str]:
+    batch: list[str] = []
+    for piece in pieces:
+        batch.append(piece)
+        if len(batch) >= CHUNK_ROWS:
+            yield "".join(batch)
+            batch.clear()
+    if batch:
+        yield "".join(batch)
+
+
+def _iter_json(rows: Iterable[Mapping[str, Any]], columns: list[str]) -> Iterator[str]:
+    # Same text as dumps({"results": rows, "count": n}), one row at a time:
+    # in the indented layout each row sits two levels deep.
+    pretty = serialization.PRETTY
+    if pretty:
+        head, first, sep, tail = '{\n  "results": [', "\n    ", ",\n    ", '\n  ],\n  "count": {}\n}}'
+    else:
+        head, first, sep, tail = '{"results":[', "", ",", '],"count":{}}}'
+    count = 0
+
+    def pieces() -> Iterator[str]:
+        nonlocal count
+        for row in rows:
+            text = serialization.dumps(_project(row, columns), pretty)
+            if pretty:
+                text = text.replace("\n", "\n    ")
+            yield (sep if count else first) + text
+            count += 1
+
+    yield head
+    yield from _chunked(pieces())
+    yield tail.format(count)
 
 
-def _to_json(rows: list[dict]) -> str:
-    return json.dumps({"results": rows, "count": len(rows)}, indent=2, default=str)
+def _iter_ndjson(rows: Iterable[Mapping[str, Any]], columns: list[str]) -> Iterator[str]:
+    yield from _chunked(
+        serialization.dumps(_project(row, columns), pretty=False) + "\n" for row in rows
+    )
 
 
-def _to_csv(rows: list[dict], columns: list[str]) -> str:
+def _iter_csv(rows: Iterable[Mapping[str, Any]], columns: list[str]) -> Iterator[str]:
     buf = io.StringIO()
     writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore")
     writer.writeheader()
-    writer.writerows(rows)
-    return buf.getvalue()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(_project(row, columns))
+        if i % CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
 
 
-def _to_markdown(rows: list[dict], columns: list[str]) -> str:
+def _iter_markdown(rows: Iterable[Mapping[str, Any]], columns: list[str]) -> Iterator[str]:
     header = "| " + " | ".join(columns) + " |"
     separator = "| " + " | ".join("---" for _ in columns) + " |"
-    lines = [header, separator]
-    for row in rows:
-        vals = [str(row.get(col, "")) for col in columns]
-        lines.append("| " + " | ".join(vals) + " |")
-    return "\n".join(lines)
+    yield header + "\n" + separator
+    yield from _chunked(
+        "\n| " + " | ".join(str(row.get(col, "")) for col in columns) + " |" for row in rows
+    )
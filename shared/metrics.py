@@ -0,0 +1,368 @@
+"""Per-tool latency, phase, row and size metrics for the MCP server.
+
+``@metered`` goes between ``@app.tool()`` and the rest of the tool's
+decorators, so cache hits are measured too. Each call records:
+
+- wall time
+- time in three phases: ``db`` (statements running on the DB executor),
+  ``convert`` (``sqlite3.Row`` to dict) and ``format`` (``format_output``,
+  ``format_page``, ``dumps``)
+- rows returned and response bytes (UTF-8)
+
+The shared code marks its phases with ``with phase("db"):`` and friends;
+outside a metered call that is a no-op. Phase times are exclusive: a
+format inside a DB job (a cursor streamed straight into ``format_output``)
+counts as format, not DB. Queries a tool runs concurrently each add their
+own time, so ``db`` can exceed the wall time.
+
+Every value goes into a log-linear histogram in the HDR style (exact below
+128, then 64 buckets per power of two, so quantiles are within ~1.6%).
+``snapshot()`` summarizes them per tool; ``prometheus_text()`` renders
+them as Prometheus summaries, which are also written to
+``ALLPOINTS_METRICS_FILE`` every ``ALLPOINTS_METRICS_INTERVAL`` seconds and
+at exit when that variable is set. The periodic write runs on a background
+thread, so disk time never lands in a tool's latency.
+``ALLPOINTS_METRICS=0`` turns it all off.
+"""
+
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+ENABLED = os.environ.get("ALLPOINTS_METRICS", "1") == "1"
+METRICS_FILE = os.environ.get("ALLPOINTS_METRICS_FILE") or None
+DUMP_INTERVAL_SECONDS = float(os.environ.get("ALLPOINTS_METRICS_INTERVAL", "15"))
+
+PHASES = ("db", "convert", "format")
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Values below 2**SUB_BITS get their own bucket; above, each power of two
+# is split into 2**(SUB_BITS - 1) buckets
+SUB_BITS = 7
+_HALF = 1 << (SUB_BITS - 1)
+
+
+def _bucket(value: int) -> int:
+    shift = value.bit_length() - SUB_BITS
+    if shift <= 0:
+        return value
+    return (shift << (SUB_BITS - 1)) + (value >> shift)
+
+
+def _bucket_max(index: int) -> int:
+    """Largest value that lands in bucket ``index``."""
+    if index < 1 << SUB_BITS:
+        return index
+    shift = (index >> (SUB_BITS - 1)) - 1
+    return (((index & (_HALF - 1)) + _HALF + 1) << shift) - 1
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integers. Not thread-safe."""
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        value = max(int(value), 0)
+        index = _bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def quantiles(self, qs: Iterable[float] = QUANTILES) -> dict[float, int]:
+        """Value at each quantile (the largest value its bucket can hold, capped at max)."""
+        qs = sorted(qs)
+        result = dict.fromkeys(qs, 0)
+        if not self.count:
+            return result
+        pending = iter(qs)
+        q = next(pending, None)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while q is not None and seen >= max(1, q * self.count):
+                result[q] = min(_bucket_max(index), self.max)
+                q = next(pending, None)
+            if q is None:
+                break
+        return result
+
+    def summary(self, scale: float = 1.0, digits: int = 3) -> dict[str, float]:
+        """min/mean/quantiles/max, each multiplied by ``scale``."""
+        summary = {"min": round(self.min * scale, digits)}
+        summary["mean"] = round(self.total / self.count * scale, digits) if self.count else 0
+        for q, value in self.quantiles().items():
+            summary[f"p{q * 100:g}"] = round(value * scale, digits)
+        summary["max"] = round(self.max * scale, digits)
+        return summary
+
+
+# ── Per-call accounting ─────────────────────────────────────────
+
+class _Call:
+    """Counters for one tool call, shared by every task and DB job it starts."""
+
+    __slots__ = ("seconds", "rows", "lock")
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.rows = 0
+        self.lock = threading.Lock()
+
+
+class _Frame:
+    __slots__ = ("name", "child_seconds")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child_seconds = 0.0
+
+
+_call: ContextVar[_Call | None] = ContextVar("allpoints_metrics_call", default=None)
+_frame: ContextVar[_Frame | None] = ContextVar("allpoints_metrics_frame", default=None)
+
+
+class phase:
+    """``with phase("db"):`` adds the block's time to that phase of the current call."""
+
+    __slots__ = ("name", "call", "parent", "frame", "token", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.call = _call.get()
+        if self.call is None:
+            return
+        self.parent = _frame.get()
+        if self.parent is not None and self.parent.name == self.name:
+            self.call = None  # nested in the same phase: the outer block counts it
+            return
+        self.frame = _Frame(self.name)
+        self.token = _frame.set(self.frame)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        if self.call is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        _frame.reset(self.token)
+        with self.call.lock:
+            self.call.seconds[self.name] += elapsed - self.frame.child_seconds
+            if self.parent is not None:
+                self.parent.child_seconds += elapsed
+
+
+def add_rows(n: int) -> None:
+    """Count ``n`` rows returned by the current call."""
+    call = _call.get()
+    if call is not None:
+        with call.lock:
+            call.rows += n
+
+
+def counted(rows: Iterable[T]) -> Iterator[T]:
+    """Yield ``rows``, counting them for the current call as they stream."""
+    n = 0
+    try:
+        for row in rows:
+            n += 1
+            yield row
+    finally:
+        add_rows(n)
+
+
+# ── Registry ────────────────────────────────────────────────────
+
+class ToolMetrics:
+    """Histograms for one tool. Durations are in microseconds."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_us = Histogram()
+        self.phase_us = {name: Histogram() for name in PHASES}
+        self.rows = Histogram()
+        self.response_bytes = Histogram()
+
+    def record(self, seconds: float, call: _Call, response_bytes: int, error: bool) -> None:
+        self.calls += 1
+        self.errors += error
+        self.latency_us.record(seconds * 1e6)
+        for name, phase_seconds in call.seconds.items():
+            self.phase_us[name].record(phase_seconds * 1e6)
+        self.rows.record(call.rows)
+        self.response_bytes.record(response_bytes)
+
+    def summary(self) -> dict[str, Any]:
+        summary = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_ms": self.latency_us.summary(1e-3),
+        }
+        for name, histogram in self.phase_us.items():
+            summary[f"{name}_ms"] = histogram.summary(1e-3)
+        summary["rows"] = self.rows.summary(digits=1)
+        summary["response_bytes"] = self.response_bytes.summary(digits=1)
+        return summary
+
+
+class MetricsRegistry:
+    """Per-tool metrics. Thread-safe: tools may run on several event loops."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._tools: dict[str, ToolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, seconds: float, call: _Call, response_bytes: int, error: bool) -> None:
+        with self._lock:
+            metrics = self._tools.get(tool)
+            if metrics is None:
+                metrics = self._tools[tool] = ToolMetrics()
+            metrics.record(seconds, call, response_bytes, error)
+
+    def snapshot(self, tool: str = "") -> dict[str, Any]:
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "tools": {
+                    name: metrics.summary()
+                    for name, metrics in sorted(self._tools.items())
+                    if not tool or name == tool
+                },
+            }
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            tools = sorted(self._tools.items())
+            return _render_prometheus(tools)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self.started = time.time()
+
+
+def _render_prometheus(tools: list[tuple[str, ToolMetrics]]) -> str:
+    lines: list[str] = []
+
+    def header(name: str, kind: str, text: str) -> None:
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def summary(name: str, labels: str, histogram: Histogram, scale: float) -> None:
+        for q, value in histogram.quantiles().items():
+            lines.append(f'{name}{{{labels},quantile="{q:g}"}} {value * scale:.9g}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.total * scale:.9g}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    header("allpoints_tool_calls_total", "counter", "Tool calls, including failed ones.")
+    for tool, m in tools:
+        lines.append(f'allpoints_tool_calls_total{{tool="{tool}"}} {m.calls}')
+    header("allpoints_tool_errors_total", "counter", "Tool calls that raised.")
+    for tool, m in tools:
+        lines.append(f'allpoints_tool_errors_total{{tool="{tool}"}} {m.errors}')
+    header("allpoints_tool_latency_seconds", "summary", "Tool wall time.")
+    for tool, m in tools:
+        summary("allpoints_tool_latency_seconds", f'tool="{tool}"', m.latency_us, 1e-6)
+    header("allpoints_tool_phase_seconds", "summary", "Tool time per phase (db, convert, format).")
+    for tool, m in tools:
+        for name, histogram in m.phase_us.items():
+            summary("allpoints_tool_phase_seconds", f'tool="{tool}",phase="{name}"', histogram, 1e-6)
+    header("allpoints_tool_rows", "summary", "Rows returned per call.")
+    for tool, m in tools:
+        summary("allpoints_tool_rows", f'tool="{tool}"', m.rows, 1)
+    header("allpoints_tool_response_bytes", "summary", "Response size per call, UTF-8 bytes.")
+    for tool, m in tools:
+        summary("allpoints_tool_response_bytes", f'tool="{tool}"', m.response_bytes, 1)
+    return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def snapshot(tool: str = "") -> dict[str, Any]:
+    """Summaries (ms, rows, bytes) per tool, optionally just ``tool``."""
+    return _registry.snapshot(tool)
+
+
+def prometheus_text() -> str:
+    """Every tool's metrics in the Prometheus text exposition format."""
+    return _registry.prometheus_text()
+
+
+def write_prometheus(path: str | Path) -> None:
+    """Write ``prometheus_text()`` to ``path``, replacing it atomically."""
+    path = Path(path)
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(prometheus_text())
+    os.replace(partial, path)
+
+
+def reset() -> None:
+    """Drop every recorded value."""
+    _registry.reset()
+
+
+def _dump_periodically(path: str, stop: threading.Event) -> None:
+    while not stop.wait(DUMP_INTERVAL_SECONDS):
+        try:
+            write_prometheus(path)
+        except OSError as e:
+            print(f"Could not write metrics to {path}: {e}", file=sys.stderr)
+
+
+if ENABLED and METRICS_FILE is not None:
+    _stop_dumping = threading.Event()
+    threading.Thread(
+        target=_dump_periodically, args=(METRICS_FILE, _stop_dumping),
+        name="allpoints-metrics-dump", daemon=True,
+    ).start()
+    atexit.register(write_prometheus, METRICS_FILE)
+    atexit.register(_stop_dumping.set)
+
+
+def metered(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Record latency, phases, rows and response size for every call of an async tool."""
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs) -> str:
+        if not ENABLED:
+            return await fn(*args, **kwargs)
+        call = _Call()
+        token = _call.set(call)
+        start = time.perf_counter()
+        result = None
+        error = True
+        try:
+            result = await fn(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            _call.reset(token)
+            size = len(result.encode()) if isinstance(result, str) else 0
+            _registry.record(tool, seconds, call, size, error)
+
+    return wrapper
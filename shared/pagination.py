@@ -0,0 +1,64 @@
+"""Opaque continuation tokens for keyset pagination.
+
+A token encodes the sort key of the last row a page returned. The next
+query resumes with ``(key columns) > (?, ...)``, so every page costs the
+same regardless of how deep into the result set it is.
+
+Key columns that are not part of a tool's output (row ids) are selected
+with a leading underscore; ``paginate()`` reads them for the token and
+then drops them.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Raised when a continuation token is malformed or missing fields."""
+
+
+def encode_cursor(**key: Any) -> str:
+    """Encode the last row's sort key as a URL-safe token."""
+    raw = json.dumps(key, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *fields: str) -> tuple[Any, ...]:
+    """Decode a token and return its values in ``fields`` order."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return tuple(key[f] for f in fields)
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from None
+
+
+def page_size(limit: int | None, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Clamp a requested page size to ``1..MAX_PAGE_SIZE``."""
+    if not limit or limit < 1:
+        return default
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def paginate(rows: list[dict[str, Any]], limit: int, *fields: str) -> tuple[list[dict[str, Any]], str | None]:
+    """Split a ``limit + 1`` look-ahead fetch into one page and its next token.
+
+    ``fields`` are the sort key columns, in cursor order. Returns the page
+    with underscore-prefixed key columns removed, and ``None`` as the token
+    on the last page.
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(**{f: rows[-1][f] for f in fields})
+    hidden = [f for f in fields if f.startswith("_")]
+    if hidden:
+        for row in rows:
+            for f in hidden:
+                row.pop(f, None)
+    return rows, next_cursor
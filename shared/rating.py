@@ -0,0 +1,164 @@
+"""Vectorized parcel rating engine.
+
+Rates whole arrays of orders against each parcel carrier account in one
+pass with NumPy, using the same rules the seeded rates were generated with:
+
+- Billable weight is the greater of actual and dimensional weight.
+- Base rate comes from the weight tiers in ``PARCEL_RATE_TIERS``, scaled by
+  zone (``ZONE_MULTIPLIER_BASE`` per zone above 2).
+- Each service is priced by its carrier's ``pricing_factor`` plus the
+  carrier adjustments below.
+- Fuel is a percentage of the rate; residential deliveries add a flat fee.
+
+Results are ``(orders, services)`` matrices. A service that cannot ship an
+order (residential-only services, missing zone) has a NaN total.
+"""
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from shared.constants import (
+    DIM_WEIGHT_DIVISOR,
+    FUEL_SURCHARGE_PCT,
+    PARCEL_RATE_TIERS,
+    PARCEL_SERVICE_CARRIERS,
+    RATED_PARCEL_SERVICES,
+    RESIDENTIAL_ONLY_SERVICES,
+    RESIDENTIAL_SURCHARGE,
+    ZONE_MULTIPLIER_BASE,
+)
+
+_TIER_UPPER = np.array([t[0] for t in PARCEL_RATE_TIERS], dtype=float)
+_TIER_LOWER = np.concatenate(([0.0], _TIER_UPPER[:-1]))
+_TIER_BASE = np.array([t[1] for t in PARCEL_RATE_TIERS], dtype=float)
+_TIER_PER_LB = np.array([t[2] for t in PARCEL_RATE_TIERS], dtype=float)
+
+
+def _usps_adjustment(weight_lbs: np.ndarray, zone: np.ndarray) -> np.ndarray:
+    return np.where(weight_lbs > 15, 1.12, np.where(weight_lbs <= 4, 0.82, 1.0))
+
+
+def _fedex_adjustment(weight_lbs: np.ndarray, zone: np.ndarray) -> np.ndarray:
+    return np.where(zone > 4, 1.06, 0.93)
+
+
+# Carrier code -> per-order multiplier on top of the contract pricing factor
+CARRIER_ADJUSTMENTS = {
+    "USPS": _usps_adjustment,
+    "FEDEX": _fedex_adjustment,
+}
+
+
+def base_rate(billable_lbs: np.ndarray) -> np.ndarray:
+    """Tiered base rate for an array of billable weights (lbs)."""
+    tier = np.searchsorted(_TIER_UPPER, billable_lbs, side="left")
+    tier = np.minimum(tier, len(_TIER_UPPER) - 1)
+    return _TIER_BASE[tier] + (billable_lbs - _TIER_LOWER[tier]) * _TIER_PER_LB[tier]
+
+
+def billable_weight(
+    weight_oz: np.ndarray,
+    length_in: np.ndarray,
+    width_in: np.ndarray,
+    height_in: np.ndarray,
+) -> np.ndarray:
+    """Greater of actual and dimensional weight in lbs; missing dims count as 0."""
+    dim_weight = (length_in * width_in * height_in) / DIM_WEIGHT_DIVISOR
+    return np.fmax(weight_oz / 16.0, dim_weight)
+
+
+@dataclass
+class ParcelRates:
+    """Rates for ``n`` orders x ``s`` services."""
+    service_codes: list[str]
+    carrier_codes: list[str]
+    billable_weight_lbs: np.ndarray     # (n,)
+    delivery_days: np.ndarray           # (n,)
+    base_rate: np.ndarray               # (n, s)
+    fuel_surcharge: np.ndarray          # (n, s)
+    residential_surcharge: np.ndarray   # (n, s)
+    total_amount: np.ndarray            # (n, s), NaN where the service can't ship
+
+    def _ranked_totals(self) -> np.ndarray:
+        return np.where(np.isnan(self.total_amount), np.inf, self.total_amount)
+
+    @property
+    def has_rates(self) -> np.ndarray:
+        """(n,) bool: order has at least one eligible service."""
+        return ~np.all(np.isnan(self.total_amount), axis=1)
+
+    def cheapest(self) -> np.ndarray:
+        """(n,) index of the cheapest service per order (first wins ties)."""
+        return np.argmin(self._ranked_totals(), axis=1)
+
+    def most_expensive(self) -> np.ndarray:
+        """(n,) index of the most expensive eligible service per order."""
+        return np.argmax(np.where(np.isnan(self.total_amount), -np.inf, self.total_amount), axis=1)
+
+
+def rate_parcels(
+    weight_oz: Sequence[float] | np.ndarray,
+    length_in: Sequence[float | None] | np.ndarray,
+    width_in: Sequence[float | None] | np.ndarray,
+    height_in: Sequence[float | None] | np.ndarray,
+    zone: Sequence[int | None] | np.ndarray,
+    is_residential: Sequence[int] | np.ndarray,
+    pricing_factors: Mapping[str, float],
+    services: Sequence[str] | None = None,
+) -> ParcelRates:
+    """Rate every order against every service in ``services`` (default: ``RATED_PARCEL_SERVICES``).
+
+    ``pricing_factors`` maps carrier code to its contract multiplier (the
+    ``carriers.pricing_factor`` column). Services whose carrier has no
+    factor are skipped. ``None`` inputs are treated as missing.
+    """
+    services = [
+        code for code in (services or RATED_PARCEL_SERVICES)
+        if PARCEL_SERVICE_CARRIERS.get(code) in pricing_factors
+    ]
+    carriers = [PARCEL_SERVICE_CARRIERS[code] for code in services]
+
+    weight_oz = np.asarray(weight_oz, dtype=float)
+    zone = np.asarray(zone, dtype=float)
+    residential = np.asarray(is_residential, dtype=float) > 0
+    weight_lbs = weight_oz / 16.0
+
+    billable = billable_weight(
+        weight_oz,
+        np.asarray(length_in, dtype=float),
+        np.asarray(width_in, dtype=float),
+        np.asarray(height_in, dtype=float),
+    )
+    base = base_rate(billable) * (1.0 + (zone - 2) * ZONE_MULTIPLIER_BASE)
+
+    n, s = len(weight_oz), len(services)
+    factors = np.array([pricing_factors[c] for c in carriers], dtype=float)
+    adjust = np.ones((n, s))
+    for j, carrier in enumerate(carriers):
+        rule = CARRIER_ADJUSTMENTS.get(carrier)
+        if rule is not None:
+            adjust[:, j] = rule(weight_lbs, zone)
+
+    rate = np.round(base[:, None] * factors[None, :] * adjust, 2)
+    fuel = np.round(rate * FUEL_SURCHARGE_PCT, 2)
+    res_fee = np.broadcast_to(np.where(residential, RESIDENTIAL_SURCHARGE, 0.0)[:, None], (n, s))
+    total = np.round(rate + fuel + res_fee, 2)
+
+    residential_only = np.array([code in RESIDENTIAL_ONLY_SERVICES for code in services], dtype=bool)
+    total[~residential[:, None] & residential_only[None, :]] = np.nan
+
+    zone_int = np.nan_to_num(zone, nan=2).astype(int)
+    delivery_days = np.maximum(2, 1 + zone_int // 2)
+
+    return ParcelRates(
+        service_codes=services,
+        carrier_codes=carriers,
+        billable_weight_lbs=billable,
+        delivery_days=delivery_days,
+        base_rate=rate,
+        fuel_surcharge=fuel,
+        residential_surcharge=np.array(res_fee),
+        total_amount=total,
+    )
@@ -0,0 +1,161 @@
+"""Read-through cache for read-only MCP tool results.
+
+``@cached(*tables, ttl=...)`` goes between ``@app.tool()`` and the tool
+function. A call is keyed on the tool name plus its arguments (defaults
+filled in, so ``f()`` and ``f(limit=50)`` share an entry). An entry is
+served while it is younger than ``ttl`` seconds and every table it was
+built from still has the same ``rollup_versions`` counter (see
+``shared/database/versions.py``); a write to any of those tables
+invalidates it on the next call.
+
+Entries live in one LRU bounded by the total size of the cached strings.
+``stats()`` reports hits, misses and evictions per tool.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+from shared.database import fetch_all
+from shared.database.versions import VERSIONS_SQL
+
+ENABLED = os.environ.get("ALLPOINTS_RESULT_CACHE", "1") == "1"
+DEFAULT_TTL_SECONDS = float(os.environ.get("ALLPOINTS_RESULT_CACHE_TTL", "30"))
+MAX_BYTES = int(os.environ.get("ALLPOINTS_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+@dataclass
+class ToolCacheStats:
+    """Counters for one tool."""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0        # misses caused by a table write since the entry was cached
+    expired: int = 0      # misses caused by the TTL
+    evictions: int = 0    # entries dropped to stay under MAX_BYTES
+
+
+@dataclass
+class _Entry:
+    value: str
+    size: int
+    expires_at: float
+    versions: tuple[int, ...]
+
+
+class ResultCache:
+    """Byte-bounded LRU of tool results. Thread-safe: tools may run on several event loops."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._stats: dict[str, ToolCacheStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tool: str, key: str, versions: tuple[int, ...]) -> str | None:
+        with self._lock:
+            stats = self._stats.setdefault(tool, ToolCacheStats())
+            entry = self._entries.get((tool, key))
+            if entry is None:
+                stats.misses += 1
+                return None
+            if entry.versions != versions or entry.expires_at <= time.monotonic():
+                if entry.versions != versions:
+                    stats.stale += 1
+                else:
+                    stats.expired += 1
+                stats.misses += 1
+                self._remove((tool, key))
+                return None
+            self._entries.move_to_end((tool, key))
+            stats.hits += 1
+            return entry.value
+
+    def put(self, tool: str, key: str, versions: tuple[int, ...], value: str, ttl: float) -> None:
+        size = len(value.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if (tool, key) in self._entries:
+                self._remove((tool, key))
+            self._entries[(tool, key)] = _Entry(value, size, time.monotonic() + ttl, versions)
+            self.size += size
+            while self.size > self.max_bytes:
+                evicted, _ = next(iter(self._entries.items()))
+                self._remove(evicted)
+                self._stats.setdefault(evicted[0], ToolCacheStats()).evictions += 1
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        self.size -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Per-tool counters plus the cache's current size."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "tools": {tool: asdict(s) for tool, s in sorted(self._stats.items())},
+            }
+
+
+_cache = ResultCache()
+
+
+def stats() -> dict[str, Any]:
+    """Hit/miss/eviction counters per tool for the process-wide cache."""
+    return _cache.stats()
+
+
+def clear() -> None:
+    """Drop every cached result."""
+    _cache.clear()
+
+
+async def _table_versions(tables: tuple[str, ...]) -> tuple[int, ...] | None:
+    """Current counters for ``tables``, or None if any table is not versioned."""
+    versions = {row["table_name"]: row["version"] for row in await fetch_all(VERSIONS_SQL)}
+    if not all(table in versions for table in tables):
+        return None
+    return tuple(versions[table] for table in tables)
+
+
+def cached(*tables: str, ttl: float = DEFAULT_TTL_SECONDS):
+    """Cache a read-only async tool's string results; ``tables`` are the tables it reads."""
+
+    def decorator(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        signature = inspect.signature(fn)
+        tool = fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> str:
+            if not ENABLED:
+                return await fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = json.dumps(bound.arguments, sort_keys=True, default=str)
+
+            versions = await _table_versions(tables)
+            if versions is None:
+                return await fn(*args, **kwargs)
+            result = _cache.get(tool, key, versions)
+            if result is None:
+                result = await fn(*args, **kwargs)
+                if isinstance(result, str):
+                    _cache.put(tool, key, versions, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,94 @@
+"""JSON serialization for tool responses.
+
+Every tool response that is JSON goes through ``dumps()``: ``format_output``,
+``format_page`` and the tools that build a dict themselves. Two backends
+produce the same bytes:
+
+- ``orjson``: used when installed; several times faster, mostly on large
+  result sets where ``default=str`` is hit for dates and the like
+- ``json``: the standard library, always available
+
+``ALLPOINTS_JSON_BACKEND`` picks one (``auto``, ``orjson`` or ``json``).
+Output is compact by default, which is roughly half the size of the
+``indent=2`` layout; ``ALLPOINTS_JSON_PRETTY=1`` restores the indented one.
+
+The backends differ on a few inputs, and ``dumps`` hides them. Floats
+below 1e-4 or from 1e16 up are written with a different exponent layout,
+and dicts with non-str keys and ints beyond 64 bits are rejected by
+orjson. The orjson output is checked for such floats, and in those cases
+the stdlib encoder writes the payload instead. The one divergence left
+is NaN/Infinity, which are not JSON: orjson writes null.
+"""
+
+import json
+import os
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib backend covers everything
+    orjson = None
+
+from shared import metrics
+
+PRETTY = os.environ.get("ALLPOINTS_JSON_PRETTY", "0") == "1"
+
+# Every digit as 0, so one substring search finds any exponent
+_ZERO_DIGITS = bytes.maketrans(b"123456789", b"000000000")
+
+
+def _float_mismatch(raw: bytes) -> bool:
+    """True if orjson may have laid out a float differently from float.__repr__.
+
+    That is an exponent ("1e16" vs "1e+16") or a fixed-point value below
+    1e-4 ("0.00001" vs "1e-05"). A match inside a string only costs a
+    fallback. bytes.translate and ``in`` are several times faster than a regex.
+    """
+    if b"0.0000" in raw:
+        return True
+    zeroed = raw.translate(_ZERO_DIGITS)
+    return b"0e0" in zeroed or b"0e-0" in zeroed
+
+
+def _json_dumps(obj: Any, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _orjson_dumps(obj: Any, pretty: bool) -> str:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if pretty else _ORJSON_OPTIONS
+        try:
+            raw = orjson.dumps(obj, default=str, option=option)
+        except TypeError:  # non-str dict keys, ints beyond 64 bits
+            return _json_dumps(obj, pretty)
+        if _float_mismatch(raw):
+            return _json_dumps(obj, pretty)
+        return raw.decode()
+
+
+# Backend name -> dumps(obj, pretty) for every backend installed here
+BACKENDS: dict[str, Callable[[Any, bool], str]] = {"json": _json_dumps}
+if orjson is not None:
+    BACKENDS["orjson"] = _orjson_dumps
+
+
+def _select_backend(name: str) -> str:
+    if name == "auto":
+        return "orjson" if "orjson" in BACKENDS else "json"
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not available (have: {', '.join(BACKENDS)})")
+    return name
+
+
+BACKEND = _select_backend(os.environ.get("ALLPOINTS_JSON_BACKEND", "auto"))
+_dumps = BACKENDS[BACKEND]
+
+
+def dumps(obj: Any, pretty: bool | None = None) -> str:
+    """Serialize a tool response; compact unless ``pretty`` (default: ``PRETTY``)."""
+    with metrics.phase("format"):
+        return _dumps(obj, PRETTY if pretty is None else pretty)